@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Headless HTTP/JSON-Schnittstelle für Kartonangebote
+
+Läuft neben der Streamlit-Oberfläche und nutzt denselben Berechnungskern.
+
+    GET  /health        Statusprüfung
+    GET  /metrics       Laufzeitmetriken im Prometheus-Textformat
+    POST /quote         Einzelangebot, Antwort als JSON
+    POST /quote/lookup  Einzelangebot aus vorberechneten Kostentabellen (--lookup)
+    POST /quotes/bulk   Sammelangebot {"defaults": {...}, "items": [{...}, ...]},
+                        Antwort als NDJSON-Stream (eine Zeile je Position)
+
+Große Sammelangebote werden in Blöcke geteilt, in einem Prozesspool
+vektorisiert berechnet und blockweise zurückgestreamt.
+
+Start: python api.py --port 8502 --workers 4
+"""
+
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from carton_cost import DEFAULT_INPUTS, TAPE_PATTERNS, QuoteInputs, calculate_quote, is_h_pattern, normalize_inputs
+from carton_cost.metrics import METRICS
+from carton_cost.store import QuoteStore
+
+logger = logging.getLogger("carton_api")
+
+INPUT_FIELDS = QuoteInputs._fields
+# Positionen je Block im Prozesspool; kleinere Sammelangebote werden direkt berechnet
+BULK_CHUNK_ROWS = 5000
+MAX_BODY_BYTES = 100 * 1024 * 1024
+ROUTES = ('/health', '/metrics', '/quote', '/quote/lookup', '/quotes/bulk')
+
+
+def _is_finite(value):
+    try:
+        return math.isfinite(value)
+    except OverflowError:  # ganze Zahl jenseits des float-Bereichs
+        return False
+
+
+def validate_inputs(payload):
+    """Prüft ein Objekt mit (ggf. unvollständigen) Eingabeparametern"""
+    if not isinstance(payload, dict):
+        raise ValueError("Eingabeparameter müssen ein JSON-Objekt sein")
+    unknown = sorted(set(payload) - set(INPUT_FIELDS))
+    if unknown:
+        raise ValueError(f"Unbekannte Parameter: {', '.join(unknown)}")
+    for name, value in payload.items():
+        if name == 'tape_pattern':
+            if not isinstance(value, (str, bool)):
+                raise ValueError("tape_pattern muss Text oder bool sein")
+            if isinstance(value, str) and value not in TAPE_PATTERNS:
+                raise ValueError(f"tape_pattern muss {' oder '.join(map(repr, TAPE_PATTERNS))} sein")
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{name} muss eine Zahl sein")
+        elif value <= 0 or not _is_finite(value):
+            # json.loads akzeptiert NaN und Infinity; nan <= 0 ist False
+            raise ValueError(f"{name} muss eine endliche Zahl größer als 0 sein")
+
+
+def parse_defaults(payload):
+    """Prüft Eingabeparameter und ergänzt fehlende Werte aus DEFAULT_INPUTS"""
+    if payload is None:
+        return dict(DEFAULT_INPUTS)
+    validate_inputs(payload)
+    return {**DEFAULT_INPUTS, **payload}
+
+
+@lru_cache(maxsize=4096)
+def quote_response(inputs, store=None):
+    """Einzelangebot als JSON-Bytes, zwischengespeichert je normalisierter Eingabe (dahinter optional SQLite)"""
+    quote = store.get_or_compute(inputs) if store else calculate_quote(*inputs)
+    return json.dumps({'inputs': inputs._asdict(), **quote}).encode('utf-8')
+
+
+def quote_chunk(items, defaults):
+    """
+    Berechnet einen Block von Sammelpositionen vektorisiert (läuft im Prozesspool)
+    Gibt die NDJSON-Zeilen des Blocks als Bytes zurück.
+    """
+    import numpy as np
+
+    from carton_cost.batch import calculate_batch
+
+    columns = {name: np.asarray([item.get(name, defaults[name]) for item in items]) for name in INPUT_FIELDS}
+    # Text und bool können gemischt vorkommen; je Position in bool umwandeln
+    columns['tape_pattern'] = np.array([is_h_pattern(item.get('tape_pattern', defaults['tape_pattern']))
+                                        for item in items], dtype=bool)
+    results = calculate_batch(**columns)
+    names = list(results)
+    rows = zip(*(results[name].tolist() for name in names))
+    lines = [json.dumps({**item, **dict(zip(names, row))}) for item, row in zip(items, rows)]
+    return ('\n'.join(lines) + '\n').encode('utf-8') if lines else b''
+
+
+class QuoteRequestHandler(BaseHTTPRequestHandler):
+    """Request-Handler für Einzel- und Sammelangebote"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'KartonKostenAPI/1.0'
+    # Header und Body gehen getrennt raus; ohne TCP_NODELAY bremst das Delayed-ACK jede Antwort
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status, body):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Anfrage zu groß")
+        try:
+            return json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Ungültiges JSON: {exc.msg}") from None
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def _observe(self, route, start):
+        # Unbekannte Pfade zusammenfassen, damit die Label-Anzahl begrenzt bleibt
+        route = route if route in ROUTES else 'other'
+        METRICS.inc('api_requests_total', help_text="HTTP-Anfragen je Route und Status",
+                    route=route, status=getattr(self, '_status', 0))
+        METRICS.observe('api_request_seconds', time.perf_counter() - start,
+                        help_text="Antwortzeit je Route", route=route)
+
+    def do_GET(self):
+        start = time.perf_counter()
+        try:
+            if self.path == '/health':
+                self._send_json(200, {'status': 'ok'})
+            elif self.path == '/metrics':
+                self._send_metrics()
+            else:
+                self._send_json(404, {'error': 'Nicht gefunden'})
+        finally:
+            self._observe(self.path, start)
+
+    def do_POST(self):
+        start = time.perf_counter()
+        routes = {'/quote': self._handle_quote, '/quote/lookup': self._handle_lookup,
+                  '/quotes/bulk': self._handle_bulk}
+        handler = routes.get(self.path)
+        try:
+            if handler is None:
+                self._send_json(404, {'error': 'Nicht gefunden'})
+                return
+            try:
+                payload = self._read_json()
+                handler(payload)
+            except ValueError as exc:
+                self._send_json(400, {'error': str(exc)})
+        finally:
+            self._observe(self.path, start)
+
+    def _send_metrics(self):
+        info = quote_response.cache_info()
+        METRICS.set('api_quote_cache_hits', info.hits, help_text="Treffer im Einzelangebots-Cache")
+        METRICS.set('api_quote_cache_misses', info.misses, help_text="Fehlschläge im Einzelangebots-Cache")
+        METRICS.set('api_quote_cache_size', info.currsize, help_text="Einträge im Einzelangebots-Cache")
+        if self.server.store is not None:
+            METRICS.set('api_quote_store_size', len(self.server.store), help_text="Einträge im Angebotsspeicher")
+        body = METRICS.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle_quote(self, payload):
+        inputs = normalize_inputs(**parse_defaults(payload))
+        self._send_json(200, quote_response(inputs, self.server.store))
+
+    def _handle_lookup(self, payload):
+        lookup = self.server.lookup
+        if lookup is None:
+            self._send_json(404, {'error': 'Kostentabellen nicht aktiviert (--lookup)'})
+            return
+        inputs = normalize_inputs(**parse_defaults(payload))
+        self._send_json(200, {'inputs': inputs._asdict(), **lookup.lookup(inputs), 'error_bound': lookup.error_bound})
+
+    def _handle_bulk(self, payload):
+        if not isinstance(payload, dict) or not isinstance(payload.get('items'), list):
+            raise ValueError("Sammelangebot erwartet {\"items\": [...]}")
+        defaults = parse_defaults(payload.get('defaults'))
+        items = payload['items']
+        for item in items:
+            validate_inputs(item)
+        METRICS.inc('api_bulk_items_total', len(items), help_text="Positionen in Sammelangeboten")
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        chunks = [items[i:i + BULK_CHUNK_ROWS] for i in range(0, len(items), BULK_CHUNK_ROWS)]
+        if len(chunks) <= 1:
+            parts = (quote_chunk(chunk, defaults) for chunk in chunks)
+        else:
+            parts = self.server.executor.map(quote_chunk, chunks, [defaults] * len(chunks))
+        for part in parts:
+            self._write_chunk(part)
+        self._write_chunk(b'')
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+
+
+class QuoteServer(ThreadingHTTPServer):
+    """Threading-HTTP-Server mit Prozesspool für rechenintensive Sammelangebote"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, workers=None, store=None, lookup=None):
+        super().__init__(address, QuoteRequestHandler)
+        self.store = store
+        self.lookup = lookup
+        self.executor = ProcessPoolExecutor(max_workers=workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.store is not None:
+            self.store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/JSON-Schnittstelle des Karton-Kostenrechners")
+    parser.add_argument('--host', default=os.environ.get('CARTON_API_HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('CARTON_API_PORT', 8502)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('CARTON_API_WORKERS', 0)) or None,
+                        help="Prozesse für Sammelangebote (Standard: Anzahl CPU-Kerne)")
+    parser.add_argument('--db', default=os.environ.get('CARTON_QUOTE_DB', ''),
+                        help="SQLite-Angebotsspeicher für Einzelangebote (Standard: keiner)")
+    parser.add_argument('--lookup', default=os.environ.get('CARTON_LOOKUP_DIR', ''),
+                        help="Verzeichnis der Kostentabellen für /quote/lookup (Standard: aus)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    lookup = None
+    if args.lookup:
+        from carton_cost.lookup import CostLookup
+        lookup = CostLookup(args.lookup)
+    server = QuoteServer((args.host, args.port), workers=args.workers,
+                         store=QuoteStore(args.db) if args.db else None, lookup=lookup)
+    logger.info("Karton-Kosten-API läuft auf http://%s:%d", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
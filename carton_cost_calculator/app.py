@@ -1,9 +1,26 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
+from functools import partial
 from io import BytesIO
-import base64
+import os
+import time
+
+from carton_cost import (
+    BEAD_OPTIONS,
+    FLUTE_OPTIONS,
+    INPUT_LIMITS,
+    PRODUCTION_VOLUMES,
+    TAPE_PATTERNS,
+    calculate_quote,
+    flute_label,
+    normalize_inputs,
+)
+from carton_cost.logistics import PALLET_TYPES, LoadSpec, plan_load
+from carton_cost.metrics import METRICS, start_metrics_server
+from carton_cost.pricing import read_price_matrix
+from carton_cost.scenarios import ScenarioWorkspace
+from carton_cost.store import QuoteStore
+from carton_cost.styles import rank_styles
 
 # Seitenkonfiguration
 st.set_page_config(
@@ -12,6 +29,12 @@ st.set_page_config(
     layout="wide"
 )
 
+# Laufzeitmessung dieses Durchlaufs (Stufenzeiten landen in stage_timings)
+rerun_start = time.perf_counter()
+stage_timings = METRICS.start_collecting()
+METRICS.inc('reruns_total', help_text="Skriptdurchläufe (Reruns)")
+st.session_state['reruns'] = st.session_state.get('reruns', 0) + 1
+
 # Titel und Beschreibung
 st.title("📦 Karton-Kostenvergleich: RSC vs. Wrap-Around")
 st.markdown("""
@@ -19,51 +42,66 @@ Diese Anwendung berechnet automatisch die Kostenunterschiede zwischen **RSC-Kart
 und **Wrap-Around-Kartons (FEFCO 0409)** basierend auf Ihren spezifischen Abmessungen und Kostenparametern.
 """)
 
+def input_limits(name):
+    """Wertebereich eines Sidebar-Eingabefelds als number_input-Argumente"""
+    min_value, max_value, value, step = INPUT_LIMITS[name]
+    return dict(min_value=min_value, max_value=max_value, value=value, step=step)
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def load_price_matrix(source):
+    """Preismatrix einmal je Datei bzw. Upload einlesen und indizieren"""
+    return read_price_matrix(source)
+
 # Sidebar für Eingaben
 st.sidebar.header("Eingabeparameter")
 
 # Kartonabmessungen
 st.sidebar.subheader("📏 Kartonabmessungen")
-length = st.sidebar.number_input("Länge (mm)", min_value=50, max_value=2000, value=400, step=10)
-width = st.sidebar.number_input("Breite (mm)", min_value=50, max_value=2000, value=300, step=10)
-height = st.sidebar.number_input("Höhe (mm)", min_value=20, max_value=1000, value=200, step=10)
+length = st.sidebar.number_input("Länge (mm)", **input_limits('length'))
+width = st.sidebar.number_input("Breite (mm)", **input_limits('width'))
+height = st.sidebar.number_input("Höhe (mm)", **input_limits('height'))
 
 # Materialstärke
 st.sidebar.subheader("🔧 Material-Spezifikationen")
 material_thickness = st.sidebar.selectbox(
     "Wellpappe-Typ",
-    options=[
-        ("B-Welle (2.5mm)", 2.5),
-        ("C-Welle (3.5mm)", 3.5),
-        ("E-Welle (1.5mm)", 1.5),
-        ("BC-Welle (6.0mm)", 6.0)
-    ],
+    options=FLUTE_OPTIONS,
     format_func=lambda x: x[0],
     index=1
 )[1]
 
 # Kostenparameter
 st.sidebar.subheader("💰 Kostenparameter")
-col1, col2 = st.sidebar.columns(2)
-rsc_price_per_1000 = col1.number_input("RSC Preis/1000 (€)", min_value=100.0, max_value=2000.0, value=610.0, step=10.0)
-wa_price_per_1000 = col2.number_input("WA Preis/1000 (€)", min_value=100.0, max_value=2000.0, value=555.0, step=10.0)
+PRICING_MODES = ["Preis je 1000 Stück", "Preismatrix (€/m²)"]
+EXAMPLE_PRICE_MATRIX = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'board_prices.example.csv')
+pricing_mode = st.sidebar.radio("Materialpreis", PRICING_MODES, horizontal=True)
+if pricing_mode == PRICING_MODES[0]:
+    col1, col2 = st.sidebar.columns(2)
+    rsc_price_per_1000 = col1.number_input("RSC Preis/1000 (€)", **input_limits('rsc_price_per_1000'))
+    wa_price_per_1000 = col2.number_input("WA Preis/1000 (€)", **input_limits('wa_price_per_1000'))
+else:
+    matrix_file = st.sidebar.file_uploader("Lieferanten-Preismatrix (CSV)", type=['csv'],
+                                           help="Spalten: grade, flute, min_m2, price_per_m2 – ohne Upload "
+                                                "gilt die Beispielmatrix")
+    try:
+        price_matrix = load_price_matrix(matrix_file.getvalue() if matrix_file else EXAMPLE_PRICE_MATRIX)
+    except ValueError as exc:
+        st.sidebar.error(str(exc))
+        st.stop()
+    board_grade = st.sidebar.selectbox("Papierqualität", price_matrix.grades())
 
 # Klebekosten RSC
 st.sidebar.subheader("🔹 RSC Klebekosten (Tape)")
-tape_price_per_roll = st.sidebar.number_input("Preis pro Rolle (€)", min_value=0.5, max_value=20.0, value=2.5, step=0.1)
-tape_length_per_roll = st.sidebar.number_input("Meter pro Rolle", min_value=10, max_value=200, value=66, step=1)
-tape_pattern = st.sidebar.selectbox("Verschlussmuster", ["H-Muster (empfohlen)", "Einfach"])
+tape_price_per_roll = st.sidebar.number_input("Preis pro Rolle (€)", **input_limits('tape_price_per_roll'))
+tape_length_per_roll = st.sidebar.number_input("Meter pro Rolle", **input_limits('tape_length_per_roll'))
+tape_pattern = st.sidebar.selectbox("Verschlussmuster", TAPE_PATTERNS)
 
 # Klebekosten Wrap-Around
 st.sidebar.subheader("🔸 Wrap-Around Klebekosten (Hotmelt)")
-hotmelt_price_per_kg = st.sidebar.number_input("Preis pro kg (€)", min_value=1.0, max_value=30.0, value=3.0, step=0.5)
+hotmelt_price_per_kg = st.sidebar.number_input("Preis pro kg (€)", **input_limits('hotmelt_price_per_kg'))
 hotmelt_bead_width = st.sidebar.selectbox(
     "Raupenbreite",
-    options=[
-        ("1.5mm (0.50 g/m)", 1.5, 0.50),
-        ("3mm (2.0 g/m)", 3.0, 2.0),
-        ("5mm (6.67 g/m)", 5.0, 6.67)
-    ],
+    options=BEAD_OPTIONS,
     format_func=lambda x: x[0],
     index=1
 )
@@ -73,148 +111,564 @@ hotmelt_usage = hotmelt_bead_width[2]  # g/m
 st.sidebar.subheader("📊 Produktionsvolumen")
 production_volume = st.sidebar.selectbox(
     "Auflage",
-    options=[1000, 10000, 100000, 1000000],
+    options=PRODUCTION_VOLUMES,
     format_func=lambda x: f"{x:,}".replace(",", ".")
 )
 
-# Berechnungsfunktionen
-def calculate_rsc_blank_dimensions(L, B, H, t):
+# Flächenbasierte Materialpreise: Zuschnittsfläche × Staffelpreis bei Auflage × Fläche
+if pricing_mode == PRICING_MODES[1]:
+    try:
+        board_prices = price_matrix.box_prices_per_1000(board_grade, length, width, height,
+                                                        material_thickness, production_volume)
+    except ValueError as exc:
+        st.sidebar.error(str(exc))
+        st.stop()
+    rsc_price_per_1000 = board_prices['rsc_price_per_1000']
+    wa_price_per_1000 = board_prices['wa_price_per_1000']
+    st.sidebar.caption(f"Materialpreis je 1000: RSC {rsc_price_per_1000:.2f} € · WA {wa_price_per_1000:.2f} €")
+
+# Zwischenspeicher über Reruns hinweg: Schlüssel ist das normalisierte Eingabe-Tupel,
+# begrenzt auf max_entries Einträge mit TTL-Verdrängung
+CACHE_OPTIONS = dict(max_entries=512, ttl=3600, show_spinner=False)
+
+def cached_stage(stage):
+    """st.cache_data mit Metriken: Aufrufe, Cache-Misses und Rechenzeit je Stufe"""
+    return METRICS.cached(stage, st.cache_data(**CACHE_OPTIONS))
+
+@st.cache_resource
+def metrics_server():
+    """Prometheus-Endpunkt /metrics, einmal je Prozess (Port aus CARTON_METRICS_PORT)"""
+    port = os.environ.get('CARTON_METRICS_PORT')
+    return start_metrics_server(int(port)) if port else None
+
+def serve_export(fmt, export, *args):
+    """Export erzeugen bzw. aus dem Cache holen und ausgelieferte Bytes zählen"""
+    data = export(*args)
+    METRICS.inc('exports_total', help_text="Ausgelieferte Exporte", format=fmt)
+    METRICS.inc('export_bytes_total', len(data), help_text="Ausgelieferte Export-Bytes", format=fmt)
+    return data
+
+@st.cache_resource
+def quote_store():
+    """Persistenter Angebotsspeicher, einmal je Prozess (Pfad aus CARTON_QUOTE_DB, leer = aus)"""
+    path = os.environ.get('CARTON_QUOTE_DB', '')
+    return QuoteStore(path) if path else None
+
+metrics_server()
+
+# Beschriftung der Parameter in der Sensitivitätsanalyse
+PARAMETER_LABELS = {
+    'length': "Länge (mm)",
+    'width': "Breite (mm)",
+    'height': "Höhe (mm)",
+    'material_thickness': "Wellpappe-Typ",
+    'rsc_price_per_1000': "RSC Preis/1000 (€)",
+    'wa_price_per_1000': "WA Preis/1000 (€)",
+    'tape_price_per_roll': "Tape-Preis/Rolle (€)",
+    'tape_length_per_roll': "Meter pro Rolle",
+    'tape_pattern': "Verschlussmuster",
+    'hotmelt_price_per_kg': "Hotmelt-Preis/kg (€)",
+    'hotmelt_usage': "Raupenbreite",
+}
+NUMERIC_PARAMETERS = [name for name in PARAMETER_LABELS
+                      if name not in ('material_thickness', 'tape_pattern', 'hotmelt_usage')]
+
+def style_de(data, formats, rows=None):
     """
-    Berechnet die RSC-Zuschnittmaße
-    L = Länge (innen), B = Breite (innen), H = Höhe
-    t = Materialstärke
-    """
-    manufacturer_flap = 25  # mm
-    trim_allowance = 20  # mm
-
-    # Bogenlänge = 2L + 2B + 4t + Klebelasche + Verschnitt
-    blank_length = 2 * L + 2 * B + 4 * t + manufacturer_flap + trim_allowance
-
-    # Bogenbreite = B + 2H + 4t + Verschnitt
-    blank_width = B + 2 * H + 4 * t + trim_allowance
-
-    # Fläche in m²
-    area_m2 = (blank_length / 1000) * (blank_width / 1000)
+    Deutsches Zahlenformat (Tausenderpunkt, Dezimalkomma) erst beim Rendern
 
-    return {
-        'blank_length': blank_length,
-        'blank_width': blank_width,
-        'area_m2': area_m2
-    }
-
-def calculate_wraparound_blank_dimensions(L, B, H, t):
-    """
-    Berechnet die Wrap-Around-Zuschnittmaße
+    Die Tabellen selbst bleiben numerisch: Sortierung, Arrow-Übertragung und
+    CSV/Excel-Export sehen Zahlen, st.dataframe zeigt die formatierten Werte.
+    formats: Spalte -> Nachkommastellen oder (Nachkommastellen, Suffix);
+    rows beschränkt das Format auf einzelne Zeilen. data darf ein bereits
+    formatierter Styler sein, sodass sich Formate verketten lassen.
     """
-    overlap = 75  # mm Standard-Überlappung
-
-    # Bogenlänge = 2L + 2B + Überlappung
-    blank_length = 2 * L + 2 * B + overlap
-
-    # Bogenbreite = B + 2H
-    blank_width = B + 2 * H
+    styler = data.style if isinstance(data, pd.DataFrame) else data
+    for column, fmt in formats.items():
+        digits, suffix = fmt if isinstance(fmt, tuple) else (fmt, '')
+        subset = pd.IndexSlice[rows, [column]] if rows is not None else [column]
+        styler = styler.format(f'{{:,.{digits}f}}{suffix}', subset=subset, decimal=',', thousands='.', na_rep='–')
+    return styler
+
+# Anzeigeformate der Ergebnistabellen (Beträge je 1000 und Gesamtsummen mit 2, Stückwerte mit 4 Stellen)
+COMPARISON_FORMATS = {'RSC': 4, 'Wrap-Around': 4, 'Differenz': 4, 'Differenz %': (2, ' %')}
+COMPARISON_TOTAL_ROWS = [0, 5]
+VOLUME_FORMATS = {'Volumen': 0, 'RSC Gesamtkosten (€)': 2, 'WA Gesamtkosten (€)': 2, 'Ersparnis (€)': 2,
+                  'Ersparnis (%)': (2, ' %')}
+
+@cached_stage('quote')
+def cached_quote(inputs):
+    """Angebotsberechnung, zwischengespeichert je Eingabe-Tupel und dauerhaft im Angebotsspeicher"""
+    store = quote_store()
+    return store.get_or_compute(inputs) if store else calculate_quote(*inputs)
+
+@cached_stage('tables')
+def build_tables(inputs, production_volume):
+    """Vergleichstabelle und Volumenhochrechnung (Tab Kostenvergleich)"""
+    quote = cached_quote(inputs)
+    rsc_price_per_1000 = inputs.rsc_price_per_1000
+    wa_price_per_1000 = inputs.wa_price_per_1000
+    rsc_blank = quote['rsc_blank']
+    wa_blank = quote['wa_blank']
+    rsc_tape_cost = quote['rsc_tape_cost']
+    wa_hotmelt_cost = quote['wa_hotmelt_cost']
+    rsc_material_cost = quote['rsc_material_cost']
+    wa_material_cost = quote['wa_material_cost']
+    rsc_total_cost_tape = quote['rsc_total_cost_tape']
+    wa_total_cost = quote['wa_total_cost']
+    cost_diff_per_box = quote['cost_diff_per_box']
+    cost_diff_pct = quote['cost_diff_pct']
+
+    rsc_values = [rsc_price_per_1000, rsc_material_cost, rsc_blank['area_m2'], rsc_tape_cost['cost_per_box'],
+                  rsc_total_cost_tape, rsc_total_cost_tape * production_volume]
+    wa_values = [wa_price_per_1000, wa_material_cost, wa_blank['area_m2'], wa_hotmelt_cost['cost_per_box'],
+                 wa_total_cost, wa_total_cost * production_volume]
+    df_comparison = pd.DataFrame({
+        'Parameter': [
+            'Materialkosten/1000',
+            'Materialkosten/Box',
+            'Zuschnittsläche',
+            'Klebekosten/Box',
+            'Gesamtkosten/Box',
+            f'Gesamtkosten/{production_volume:,}'.replace(",", ".")
+        ],
+        'Einheit': ['€', '€', 'm²', '€', '€', '€'],
+        'RSC': rsc_values,
+        'Wrap-Around': wa_values,
+    })
+    df_comparison['Differenz'] = df_comparison['RSC'] - df_comparison['Wrap-Around']
+    df_comparison['Differenz %'] = df_comparison['Differenz'] / df_comparison['RSC'] * 100
+
+    volumes = pd.Series(PRODUCTION_VOLUMES, dtype='int64')
+    df_volumes = pd.DataFrame({
+        'Volumen': volumes,
+        'RSC Gesamtkosten (€)': rsc_total_cost_tape * volumes,
+        'WA Gesamtkosten (€)': wa_total_cost * volumes,
+        'Ersparnis (€)': cost_diff_per_box * volumes,
+        'Ersparnis (%)': cost_diff_pct,
+    })
+
+    return df_comparison, df_volumes
+
+@cached_stage('figures')
+def build_figures(inputs, production_volume):
+    """Diagramme des Tabs Visualisierung als plotly-Figurenspezifikation (dict)"""
+    import plotly.graph_objects as go
+
+    quote = cached_quote(inputs)
+    rsc_blank = quote['rsc_blank']
+    wa_blank = quote['wa_blank']
+    rsc_tape_cost = quote['rsc_tape_cost']
+    wa_hotmelt_cost = quote['wa_hotmelt_cost']
+    rsc_material_cost = quote['rsc_material_cost']
+    wa_material_cost = quote['wa_material_cost']
+    cost_diff_per_box = quote['cost_diff_per_box']
 
-    # Fläche in m²
-    area_m2 = (blank_length / 1000) * (blank_width / 1000)
+    fig_cost = go.Figure(data=[
+        go.Bar(name='Materialkosten', x=['RSC', 'Wrap-Around'],
+               y=[rsc_material_cost, wa_material_cost],
+               marker_color='lightblue'),
+        go.Bar(name='Klebekosten', x=['RSC', 'Wrap-Around'],
+               y=[rsc_tape_cost['cost_per_box'], wa_hotmelt_cost['cost_per_box']],
+               marker_color='lightcoral')
+    ])
 
-    return {
-        'blank_length': blank_length,
-        'blank_width': blank_width,
-        'area_m2': area_m2
-    }
+    fig_cost.update_layout(
+        barmode='stack',
+        title='Kostenaufschlüsselung pro Box',
+        xaxis_title='Karton-Typ',
+        yaxis_title='Kosten (€)',
+        height=400
+    )
 
-def calculate_tape_cost_rsc(L, B, H, tape_price, tape_length_roll, pattern):
-    """
-    Berechnet Klebeband-Kosten für RSC
-    """
-    if pattern == "H-Muster (empfohlen)":
-        # H-Muster: L + 2B + Überstand pro Seite
-        tape_per_box = (L + 2 * B + 150) / 1000  # in Meter
-        tape_per_box *= 2  # Oben und unten
-    else:
-        # Einfaches Muster
-        tape_per_box = (B + 100) / 1000  # in Meter
-        tape_per_box *= 2  # Oben und unten
+    volumes_chart = list(range(0, production_volume + 1, max(1, production_volume // 10)))
+    savings_chart = [cost_diff_per_box * v for v in volumes_chart]
 
-    cost_per_meter = tape_price / tape_length_roll
-    cost_per_box = tape_per_box * cost_per_meter
+    fig_savings = go.Figure()
+    fig_savings.add_trace(go.Scatter(
+        x=volumes_chart,
+        y=savings_chart,
+        mode='lines',
+        fill='tozeroy',
+        name='Ersparnis',
+        line=dict(color='green', width=3)
+    ))
 
-    return {
-        'tape_length_m': tape_per_box,
-        'cost_per_box': cost_per_box
-    }
+    fig_savings.update_layout(
+        title=f'Kumulierte Ersparnis bis {production_volume:,} Kartons'.replace(",", "."),
+        xaxis_title='Anzahl Kartons',
+        yaxis_title='Ersparnis (€)',
+        height=400
+    )
 
-def calculate_hotmelt_cost_wa(L, B, H, hotmelt_price_kg, hotmelt_usage_g_per_m):
-    """
-    Berechnet Hotmelt-Kosten für Wrap-Around
-    3 Klebestellen: beide Enden + Längsnaht
-    """
-    # Längsnaht entlang der Höhe
-    seam_length_1 = H / 1000  # m
+    fig_area = go.Figure(data=[
+        go.Bar(
+            x=['RSC', 'Wrap-Around'],
+            y=[rsc_blank['area_m2'], wa_blank['area_m2']],
+            marker_color=['#FF6B6B', '#4ECDC4'],
+            text=[f"{rsc_blank['area_m2']:.4f} m²", f"{wa_blank['area_m2']:.4f} m²"],
+            textposition='auto',
+        )
+    ])
 
-    # Beide Enden
-    seam_length_2 = (2 * (L + B)) / 1000  # m
+    fig_area.update_layout(
+        title='Zuschnittsläche im Vergleich',
+        xaxis_title='Karton-Typ',
+        yaxis_title='Fläche (m²)',
+        height=400
+    )
 
-    total_seam_length = seam_length_1 + seam_length_2
+    fig_pie_rsc = go.Figure(data=[go.Pie(
+        labels=['Material', 'Klebeband'],
+        values=[rsc_material_cost, rsc_tape_cost['cost_per_box']],
+        hole=.3
+    )])
+    fig_pie_rsc.update_layout(height=300)
+
+    fig_pie_wa = go.Figure(data=[go.Pie(
+        labels=['Material', 'Hotmelt'],
+        values=[wa_material_cost, wa_hotmelt_cost['cost_per_box']],
+        hole=.3
+    )])
+    fig_pie_wa.update_layout(height=300)
+
+    figures = dict(fig_cost=fig_cost, fig_savings=fig_savings, fig_area=fig_area,
+                   fig_pie_rsc=fig_pie_rsc, fig_pie_wa=fig_pie_wa)
+    return {name: fig.to_dict() for name, fig in figures.items()}
+
+@cached_stage('export_xlsx')
+def create_excel_export(inputs, production_volume):
+    """Excel-Export mit vier Arbeitsblättern als Bytes"""
+    quote = cached_quote(inputs)
+    df_comparison, df_volumes = build_tables(inputs, production_volume)
+    length, width, height, material_thickness = inputs[:4]
+    rsc_price_per_1000 = inputs.rsc_price_per_1000
+    wa_price_per_1000 = inputs.wa_price_per_1000
+    rsc_blank = quote['rsc_blank']
+    wa_blank = quote['wa_blank']
+    rsc_tape_cost = quote['rsc_tape_cost']
+    rsc_hotmelt_cost = quote['rsc_hotmelt_cost']
+    wa_hotmelt_cost = quote['wa_hotmelt_cost']
+    area_savings_pct = quote['area_savings_pct']
+
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        # Übersicht
+        df_overview = pd.DataFrame({
+            'Parameter': ['Länge (mm)', 'Breite (mm)', 'Höhe (mm)', 'Materialstärke (mm)',
+                         'RSC Preis/1000 (€)', 'WA Preis/1000 (€)', 'Produktionsvolumen'],
+            'Wert': [length, width, height, material_thickness,
+                    rsc_price_per_1000, wa_price_per_1000, production_volume]
+        })
+        df_overview.to_excel(writer, sheet_name='Parameter', index=False)
+
+        # Vergleichstabelle
+        df_comparison.to_excel(writer, sheet_name='Kostenvergleich', index=False)
+
+        # Volumenhochrechnung
+        df_volumes.to_excel(writer, sheet_name='Volumenhochrechnung', index=False)
+
+        # Technische Details
+        tech_data = {
+            'Parameter': [
+                'RSC Bogenlänge (mm)', 'RSC Bogenbreite (mm)', 'RSC Fläche (m²)',
+                'RSC Tape-Länge (m)', 'RSC Hotmelt Nahtlänge (m)',
+                'WA Bogenlänge (mm)', 'WA Bogenbreite (mm)', 'WA Fläche (m²)',
+                'WA Hotmelt Nahtlänge (m)', 'Flächenersparnis (%)'
+            ],
+            'Wert': [
+                rsc_blank['blank_length'], rsc_blank['blank_width'], rsc_blank['area_m2'],
+                rsc_tape_cost['tape_length_m'], rsc_hotmelt_cost['seam_length_m'],
+                wa_blank['blank_length'], wa_blank['blank_width'], wa_blank['area_m2'],
+                wa_hotmelt_cost['seam_length_m'], area_savings_pct
+            ]
+        }
+        df_tech = pd.DataFrame(tech_data)
+        df_tech.to_excel(writer, sheet_name='Technische Details', index=False)
+
+    return output.getvalue()
+
+@cached_stage('export_csv')
+def create_csv_export(inputs, production_volume):
+    """CSV-Export der Vergleichstabelle als Bytes"""
+    df_comparison, _ = build_tables(inputs, production_volume)
+    return df_comparison.to_csv(index=False).encode('utf-8')
+
+@cached_stage('summary')
+def build_summary(inputs, production_volume):
+    """Markdown-Zusammenfassung für den Report"""
+    quote = cached_quote(inputs)
+    length, width, height, material_thickness = inputs[:4]
+    rsc_blank = quote['rsc_blank']
+    wa_blank = quote['wa_blank']
+    rsc_tape_cost = quote['rsc_tape_cost']
+    wa_hotmelt_cost = quote['wa_hotmelt_cost']
+    rsc_material_cost = quote['rsc_material_cost']
+    wa_material_cost = quote['wa_material_cost']
+    rsc_total_cost_tape = quote['rsc_total_cost_tape']
+    wa_total_cost = quote['wa_total_cost']
+    area_savings_pct = quote['area_savings_pct']
+    cost_diff_per_box = quote['cost_diff_per_box']
+    cost_diff_pct = quote['cost_diff_pct']
 
-    # Hotmelt-Verbrauch in kg
-    hotmelt_kg = (total_seam_length * hotmelt_usage_g_per_m) / 1000
+    summary = f"""
+    # Karton-Kostenvergleich Report
 
-    cost_per_box = hotmelt_kg * hotmelt_price_kg
+    ## Eingabeparameter
+    - **Abmessungen**: {length:g} × {width:g} × {height:g} mm
+    - **Material**: {flute_label(material_thickness)}
+    - **Produktionsvolumen**: {production_volume:,} Stück
 
-    return {
-        'seam_length_m': total_seam_length,
-        'hotmelt_kg': hotmelt_kg,
-        'cost_per_box': cost_per_box
-    }
+    ## Ergebnisse
 
-def calculate_hotmelt_cost_rsc(L, B, H, hotmelt_price_kg, hotmelt_usage_g_per_m):
-    """
-    Berechnet Hotmelt-Kosten für RSC (alternative zu Tape)
-    Herstellernaht + Klappenverschluss
-    """
-    # Herstellernaht
-    manufacturer_seam = H / 1000  # m
+    ### RSC-Karton (FEFCO 0201)
+    - Zuschnittsläche: {rsc_blank['area_m2']:.4f} m²
+    - Materialkosten: {rsc_material_cost:.4f} €/Box
+    - Klebekosten (Tape): {rsc_tape_cost['cost_per_box']:.4f} €/Box
+    - **Gesamtkosten: {rsc_total_cost_tape:.4f} €/Box**
 
-    # Klappenverschluss (H-Muster)
-    flap_seams = 2 * (B + B) / 1000  # m (oben und unten)
+    ### Wrap-Around-Karton (FEFCO 0409)
+    - Zuschnittsläche: {wa_blank['area_m2']:.4f} m²
+    - Materialkosten: {wa_material_cost:.4f} €/Box
+    - Klebekosten (Hotmelt): {wa_hotmelt_cost['cost_per_box']:.4f} €/Box
+    - **Gesamtkosten: {wa_total_cost:.4f} €/Box**
 
-    total_seam_length = manufacturer_seam + flap_seams
+    ## Einsparungen durch Wrap-Around
+    - **Flächenersparnis**: {area_savings_pct:.2f}%
+    - **Kostenersparnis pro Box**: {cost_diff_per_box:.4f} € ({cost_diff_pct:.2f}%)
+    - **Gesamtersparnis bei {production_volume:,} Stück**: {cost_diff_per_box * production_volume:.2f} €
 
-    # Hotmelt-Verbrauch in kg
-    hotmelt_kg = (total_seam_length * hotmelt_usage_g_per_m) / 1000
+    ## Empfehlung
+    {"✅ Wrap-Around ist wirtschaftlicher für diese Anwendung!" if cost_diff_per_box > 0 else "⚠️ RSC ist in diesem Fall günstiger."}
 
-    cost_per_box = hotmelt_kg * hotmelt_price_kg
+    ---
+    *Erstellt mit Karton-Kostenrechner*
+    """
 
-    return {
-        'seam_length_m': total_seam_length,
-        'hotmelt_kg': hotmelt_kg,
-        'cost_per_box': cost_per_box
-    }
+    return summary
+
+@cached_stage('export_md')
+def create_markdown_export(inputs, production_volume):
+    """Markdown-Report als Bytes"""
+    return build_summary(inputs, production_volume).encode('utf-8')
+
+@cached_stage('optimizer')
+def run_optimizer(product, clearance_min, clearance_max, target_volume_l, step, style, allow_rotation, inputs):
+    """Pareto-Front der Maßoptimierung als DataFrame plus Rasterstatistik"""
+    from carton_cost.optimizer import OBJECTIVES, optimize_dimensions
+
+    params = inputs._asdict()
+    for name in ('length', 'width', 'height'):
+        params.pop(name)
+    result = optimize_dimensions(*product, clearance_min=clearance_min, clearance_max=clearance_max,
+                                 target_volume_l=target_volume_l or None, step=step, style=style,
+                                 allow_rotation=allow_rotation, **params)
+    area, cost, adhesive = OBJECTIVES[style]
+    df_front = pd.DataFrame({
+        'Länge (mm)': result.front['length'],
+        'Breite (mm)': result.front['width'],
+        'Höhe (mm)': result.front['height'],
+        'Volumen (l)': result.front['volume_l'],
+        'Zuschnittsfläche (m²)': result.front[area],
+        'Kosten/Box (€)': result.front[cost],
+        'Kleberlänge (m)': result.front[adhesive],
+    })
+    return df_front, result.candidates, result.evaluated
+
+@cached_stage('nesting')
+def plan_board_usage(inputs, production_volume, deckle_width, edge_trim, allow_rotation):
+    """Bahnbelegung auf der Wellpappenanlage für RSC- und Wrap-Around-Zuschnitt"""
+    from carton_cost.nesting import plan_corrugator_run
+
+    quote = cached_quote(inputs)
+    rows = []
+    for label, blank in (("RSC", quote['rsc_blank']), ("Wrap-Around", quote['wa_blank'])):
+        try:
+            plan = plan_corrugator_run([blank['blank_length']], [blank['blank_width']], [production_volume],
+                                       deckle_width=deckle_width, edge_trim=edge_trim,
+                                       allow_rotation=allow_rotation)
+        except ValueError:
+            rows.append({'Bauart': label, 'Nutzen quer': 0, 'Beschnitt (%)': None,
+                         'Zuschnittsfläche/Box (m²)': blank['area_m2'], 'Bahnfläche/Box (m²)': None})
+            continue
+        rows.append({
+            'Bauart': label,
+            'Nutzen quer': plan.patterns[0]['lanes'][0]['ups'],
+            'Beschnitt (%)': plan.waste_pct,
+            'Zuschnittsfläche/Box (m²)': blank['area_m2'],
+            'Bahnfläche/Box (m²)': plan.board_m2 / production_volume,
+        })
+    return pd.DataFrame(rows)
+
+@cached_stage('simulation')
+def run_price_simulation(inputs, volatility, board_correlation, draws):
+    """Monte-Carlo-Kennzahlen und Histogramm (nur Klassen, keine Einzelziehungen)"""
+    import numpy as np
+    import plotly.graph_objects as go
+    from carton_cost.simulation import simulate_cost_diff
+
+    result = simulate_cost_diff(inputs, draws=draws, volatility=dict(volatility),
+                                board_correlation=board_correlation, seed=0)
+    counts, edges = np.histogram(result.cost_diff_per_box, bins=80)
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts / draws * 100,
+                           marker_color=np.where(edges[1:] > 0, 'lightgreen', 'salmon').tolist()))
+    fig.add_vline(x=0, line_dash='dash', line_color='gray')
+    fig.update_layout(title='Verteilung der Ersparnis pro Box (RSC − Wrap-Around)',
+                      xaxis_title='Ersparnis pro Box (€)', yaxis_title='Anteil der Ziehungen (%)',
+                      bargap=0, height=400)
+    break_even = np.percentile(result.break_even_wa_price, [5, 50, 95]).tolist()
+    return result._replace(cost_diff_per_box=None, break_even_wa_price=break_even), fig.to_dict()
+
+def format_level(name, level):
+    """Stufe eines Parameters wie in der Sidebar beschriften"""
+    if name == 'material_thickness':
+        return flute_label(level)
+    if name == 'hotmelt_usage':
+        return next(label for label, _, usage in BEAD_OPTIONS if usage == level)
+    if name == 'tape_pattern':
+        return TAPE_PATTERNS[0] if level else TAPE_PATTERNS[1]
+    return f"{level:g}"
+
+@cached_stage('sensitivity')
+def build_sensitivity(inputs, metric, x, y, points):
+    """Tornado, Heatmap und vollfaktorielle Haupteffekte als Figuren bzw. DataFrame"""
+    import plotly.graph_objects as go
+    from carton_cost.sensitivity import full_factorial, heatmap, tornado
+
+    unit = '€/Box' if metric == 'cost_diff_per_box' else '%'
+    bars = tornado(inputs, metric)[::-1]
+    base = bars[0]['base']
+    fig_tornado = go.Figure([
+        go.Bar(name='Minimum', orientation='h', y=[PARAMETER_LABELS[b['parameter']] for b in bars],
+               x=[b['low'] - base for b in bars], base=base, marker_color='salmon',
+               text=[format_level(b['parameter'], b['level_low']) for b in bars]),
+        go.Bar(name='Maximum', orientation='h', y=[PARAMETER_LABELS[b['parameter']] for b in bars],
+               x=[b['high'] - base for b in bars], base=base, marker_color='lightgreen',
+               text=[format_level(b['parameter'], b['level_high']) for b in bars]),
+    ])
+    fig_tornado.update_layout(barmode='overlay', title=f'Tornado: Ersparnis je Parameter ({unit})',
+                              xaxis_title=f'Ersparnis ({unit})', height=450)
+
+    x_levels, y_levels, values = heatmap(inputs, x, y, metric)
+    fig_heatmap = go.Figure(go.Heatmap(x=x_levels, y=y_levels, z=values, colorscale='RdYlGn', zmid=0,
+                                       colorbar=dict(title=unit)))
+    fig_heatmap.update_layout(title=f'Ersparnis über {PARAMETER_LABELS[x]} × {PARAMETER_LABELS[y]}',
+                              xaxis_title=PARAMETER_LABELS[x], yaxis_title=PARAMETER_LABELS[y], height=500)
+
+    factorial = full_factorial(inputs, metric=metric, points=points)
+    df_effects = pd.DataFrame([
+        {'Parameter': PARAMETER_LABELS[name], 'Stufe': format_level(name, level), f'Mittlere Ersparnis ({unit})': effect}
+        for name, levels in factorial.levels.items()
+        for level, effect in zip(levels.tolist(), factorial.main_effects[name].tolist())
+    ])
+    return fig_tornado.to_dict(), fig_heatmap.to_dict(), df_effects, factorial.values.size, factorial.positive_share
+
+@cached_stage('breakeven')
+def build_break_even(inputs, costs, x, y):
+    """Break-even-Kennzahlen, Verlauf der Nettoersparnis und Amortisations-Heatmap"""
+    import numpy as np
+    import plotly.graph_objects as go
+    from carton_cost.breakeven import break_even, break_even_grid, net_savings
+
+    cost_diff_per_box = cached_quote(inputs)['cost_diff_per_box']
+    result = {name: float(value) for name, value in break_even(cost_diff_per_box, costs).items()}
+    volume = result['break_even_volume']
+    horizon = 2 * volume if 0 < volume < np.inf else 5 * costs.annual_volume
+    volumes = np.linspace(0, horizon, 101)
+    fig_curve = go.Figure(go.Scatter(x=volumes, y=net_savings(cost_diff_per_box, volumes, costs),
+                                     mode='lines', line=dict(color='green', width=3)))
+    fig_curve.add_hline(y=0, line_dash='dash', line_color='gray')
+    if 0 < volume < np.inf:
+        fig_curve.add_vline(x=volume, line_dash='dot', line_color='red')
+    fig_curve.update_layout(title='Kumulierte Nettoersparnis nach Investition und Rüstkosten',
+                            xaxis_title='Anzahl Kartons', yaxis_title='Nettoersparnis (€)', height=400)
+
+    x_levels, y_levels, grid = break_even_grid(inputs, costs, x, y, points=81)
+    months = np.where(np.isfinite(grid['payback_months']), grid['payback_months'], np.nan)
+    fig_heatmap = go.Figure(go.Heatmap(x=x_levels, y=y_levels, z=months, colorscale='RdYlGn_r', zmin=0,
+                                       colorbar=dict(title='Monate')))
+    fig_heatmap.update_layout(title=f'Amortisation über {PARAMETER_LABELS[x]} × {PARAMETER_LABELS[y]} '
+                                    '(leer = keine Amortisation)',
+                              xaxis_title=PARAMETER_LABELS[x], yaxis_title=PARAMETER_LABELS[y], height=500)
+    return result, fig_curve.to_dict(), fig_heatmap.to_dict()
+
+@st.cache_resource(max_entries=4, show_spinner="Katalog wird berechnet …")
+def load_catalog(file_id, filename, inputs, pricing_key, _data, _pricing):
+    """Hochgeladenen Katalog einmal je Datei und Eingaben berechnen; das Ergebnis bleibt auf dem Server"""
+    from carton_cost.catalog import ResultGrid, cost_catalog, read_catalog
+
+    return ResultGrid(cost_catalog(read_catalog(_data, filename), inputs._asdict(), _pricing))
+
+def create_catalog_export(fmt, grid, filters, sort_by, descending):
+    """Gefilterte und sortierte Katalogansicht blockweise als Datei (Bytes)"""
+    from carton_cost.export import write_frames
+
+    output = BytesIO()
+    write_frames(grid.frames(filters, sort_by, descending), output, fmt, grid.columns)
+    return output.getvalue()
+
+@cached_stage('styles')
+def build_style_ranking(inputs, board_price_per_m2):
+    """Rangliste aller registrierten FEFCO-Bauarten als Tabelle und gestapeltes Balkendiagramm"""
+    import plotly.graph_objects as go
+
+    df = pd.DataFrame([{
+        'Rang': rank,
+        'FEFCO': row['code'],
+        'Bauart': row['name'],
+        'Zuschnitt (mm)': f"{row['blank_length']:.0f} × {row['blank_width']:.0f}",
+        'Fläche (m²)': row['area_m2'],
+        'Material (€/Box)': row['material_cost'],
+        'Verschluss (€/Box)': row['closure_cost'],
+        'Gesamt (€/Box)': row['total_cost'],
+    } for rank, row in enumerate(rank_styles(inputs, board_price_per_m2), start=1)])
+    fig = go.Figure([
+        go.Bar(name='Material', x=df['FEFCO'], y=df['Material (€/Box)'], marker_color='#4ECDC4'),
+        go.Bar(name='Verschluss', x=df['FEFCO'], y=df['Verschluss (€/Box)'], marker_color='#FF6B6B'),
+    ])
+    fig.update_layout(barmode='stack', title='Stückkosten je Bauart', yaxis_title='€/Box', height=400)
+    return df, fig.to_dict()
+
+@cached_stage('logistics')
+def plan_logistics(inputs, production_volume, pallet_type, truck_cost):
+    """Ladeplanung für RSC (gefaltet) und Wrap-Around (flach)"""
+    pallet_length, pallet_width = PALLET_TYPES[pallet_type]
+    spec = LoadSpec(pallet_length=pallet_length, pallet_width=pallet_width, truck_cost=truck_cost)
+    quote = cached_quote(inputs)
+    return tuple(plan_load(blank['blank_length'], blank['blank_width'], inputs.material_thickness,
+                           production_volume, style, spec)
+                 for style, blank in (('rsc', quote['rsc_blank']), ('wa', quote['wa_blank'])))
 
 # Berechnungen durchführen
-rsc_blank = calculate_rsc_blank_dimensions(length, width, height, material_thickness)
-wa_blank = calculate_wraparound_blank_dimensions(length, width, height, material_thickness)
-
-rsc_tape_cost = calculate_tape_cost_rsc(length, width, height, tape_price_per_roll, tape_length_per_roll, tape_pattern)
-rsc_hotmelt_cost = calculate_hotmelt_cost_rsc(length, width, height, hotmelt_price_per_kg, hotmelt_usage)
-wa_hotmelt_cost = calculate_hotmelt_cost_wa(length, width, height, hotmelt_price_per_kg, hotmelt_usage)
-
-# Materialkosten pro Box
-rsc_material_cost = rsc_price_per_1000 / 1000
-wa_material_cost = wa_price_per_1000 / 1000
-
-# Gesamtkosten pro Box (RSC mit Tape)
-rsc_total_cost_tape = rsc_material_cost + rsc_tape_cost['cost_per_box']
-# Gesamtkosten pro Box (RSC mit Hotmelt)
-rsc_total_cost_hotmelt = rsc_material_cost + rsc_hotmelt_cost['cost_per_box']
-# Gesamtkosten pro Box (Wrap-Around mit Hotmelt)
-wa_total_cost = wa_material_cost + wa_hotmelt_cost['cost_per_box']
-
-# Hauptbereich mit Tabs
-tab1, tab2, tab3, tab4 = st.tabs(["📊 Kostenvergleich", "📐 Technische Details", "📈 Visualisierung", "💾 Export"])
-
-with tab1:
+inputs = normalize_inputs(length, width, height, material_thickness,
+                          rsc_price_per_1000, wa_price_per_1000,
+                          tape_price_per_roll, tape_length_per_roll, tape_pattern,
+                          hotmelt_price_per_kg, hotmelt_usage)
+quote = cached_quote(inputs)
+
+rsc_blank = quote['rsc_blank']
+wa_blank = quote['wa_blank']
+rsc_tape_cost = quote['rsc_tape_cost']
+rsc_hotmelt_cost = quote['rsc_hotmelt_cost']
+wa_hotmelt_cost = quote['wa_hotmelt_cost']
+
+rsc_material_cost = quote['rsc_material_cost']
+wa_material_cost = quote['wa_material_cost']
+rsc_total_cost_tape = quote['rsc_total_cost_tape']
+rsc_total_cost_hotmelt = quote['rsc_total_cost_hotmelt']
+wa_total_cost = quote['wa_total_cost']
+
+area_savings_pct = quote['area_savings_pct']
+cost_diff_per_box = quote['cost_diff_per_box']
+cost_diff_pct = quote['cost_diff_pct']
+
+# Hauptbereich: Anders als st.tabs (führt alle Tabs aus) wird nur die gewählte Ansicht berechnet und übertragen
+VIEWS = ["📊 Kostenvergleich", "📐 Technische Details", "📈 Visualisierung", "💾 Export",
+         "🎯 Maßoptimierung", "🔬 Sensitivität", "📚 Szenarien", "⚖️ Break-even", "📦 Katalog"]
+view = st.segmented_control("Ansicht", VIEWS, default=VIEWS[0], key='view',
+                            label_visibility='collapsed') or VIEWS[0]
+
+if view == VIEWS[0]:
     st.header("Kostenvergleich")
 
     # Zwei Spalten für RSC und Wrap-Around
@@ -239,11 +693,6 @@ with tab1:
     # Einsparungen
     st.header("💰 Einsparungen")
 
-    # Flächenersparnis
-    area_savings_pct = ((rsc_blank['area_m2'] - wa_blank['area_m2']) / rsc_blank['area_m2']) * 100
-    cost_diff_per_box = rsc_total_cost_tape - wa_total_cost
-    cost_diff_pct = (cost_diff_per_box / rsc_total_cost_tape) * 100
-
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("Flächenersparnis", f"{area_savings_pct:.2f} %",
@@ -258,69 +707,28 @@ with tab1:
     # Detaillierte Vergleichstabelle
     st.subheader("📋 Detaillierter Vergleich")
 
-    comparison_data = {
-        'Parameter': [
-            'Materialkosten/1000',
-            'Materialkosten/Box',
-            'Zuschnittsläche',
-            'Klebekosten/Box',
-            'Gesamtkosten/Box',
-            f'Gesamtkosten/{production_volume:,}'.replace(",", ".")
-        ],
-        'Einheit': ['€', '€', 'm²', '€', '€', '€'],
-        'RSC': [
-            f"{rsc_price_per_1000:.2f}",
-            f"{rsc_material_cost:.4f}",
-            f"{rsc_blank['area_m2']:.4f}",
-            f"{rsc_tape_cost['cost_per_box']:.4f}",
-            f"{rsc_total_cost_tape:.4f}",
-            f"{rsc_total_cost_tape * production_volume:.2f}"
-        ],
-        'Wrap-Around': [
-            f"{wa_price_per_1000:.2f}",
-            f"{wa_material_cost:.4f}",
-            f"{wa_blank['area_m2']:.4f}",
-            f"{wa_hotmelt_cost['cost_per_box']:.4f}",
-            f"{wa_total_cost:.4f}",
-            f"{wa_total_cost * production_volume:.2f}"
-        ],
-        'Differenz €': [
-            f"{rsc_price_per_1000 - wa_price_per_1000:.2f}",
-            f"{rsc_material_cost - wa_material_cost:.4f}",
-            f"{(rsc_blank['area_m2'] - wa_blank['area_m2'])*10000:.2f} cm²",
-            f"{rsc_tape_cost['cost_per_box'] - wa_hotmelt_cost['cost_per_box']:.4f}",
-            f"{cost_diff_per_box:.4f}",
-            f"{cost_diff_per_box * production_volume:.2f}"
-        ],
-        'Differenz %': [
-            f"{((rsc_price_per_1000 - wa_price_per_1000) / rsc_price_per_1000 * 100):.1f}%",
-            f"{((rsc_material_cost - wa_material_cost) / rsc_material_cost * 100):.1f}%",
-            f"{area_savings_pct:.2f}%",
-            f"{((rsc_tape_cost['cost_per_box'] - wa_hotmelt_cost['cost_per_box']) / rsc_tape_cost['cost_per_box'] * 100):.1f}%",
-            f"{cost_diff_pct:.2f}%",
-            f"{cost_diff_pct:.2f}%"
-        ]
-    }
-
-    df_comparison = pd.DataFrame(comparison_data)
-    st.dataframe(df_comparison, use_container_width=True, hide_index=True)
+    df_comparison, df_volumes = build_tables(inputs, production_volume)
+    totals = {column: 2 for column in ('RSC', 'Wrap-Around', 'Differenz')}
+    st.dataframe(style_de(style_de(df_comparison, COMPARISON_FORMATS), totals, rows=COMPARISON_TOTAL_ROWS),
+                 use_container_width=True, hide_index=True)
 
     # Hochrechnung verschiedener Volumina
     st.subheader("📊 Hochrechnung bei verschiedenen Produktionsvolumina")
 
-    volumes = [1000, 10000, 100000, 1000000]
-    volume_data = {
-        'Volumen': [f"{v:,}".replace(",", ".") for v in volumes],
-        'RSC Gesamtkosten (€)': [f"{rsc_total_cost_tape * v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for v in volumes],
-        'WA Gesamtkosten (€)': [f"{wa_total_cost * v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for v in volumes],
-        'Ersparnis (€)': [f"{cost_diff_per_box * v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for v in volumes],
-        'Ersparnis (%)': [f"{cost_diff_pct:.2f}%" for _ in volumes]
-    }
+    st.dataframe(style_de(df_volumes, VOLUME_FORMATS), use_container_width=True, hide_index=True)
 
-    df_volumes = pd.DataFrame(volume_data)
-    st.dataframe(df_volumes, use_container_width=True, hide_index=True)
+    # Alle registrierten Bauarten, je Bauart auf ihrer Preisbasis oder mit einheitlichem Bogenpreis
+    st.subheader("🏆 Rangliste aller FEFCO-Bauarten")
+    board_price_per_m2 = st.number_input(
+        "Einheitlicher Bogenpreis (€/m²)", min_value=0.01, step=0.01, format="%.3f", value=None,
+        placeholder="aus RSC- bzw. WA-Preis je 1000",
+        help="Leer: Bogenpreis je Bauart aus dem RSC-Preis je 1000 (Wrap-Around: WA-Preis je 1000) und der "
+             "jeweiligen Zuschnittsfläche, RSC und Wrap-Around kosten dann wie oben")
+    df_styles, fig_styles = build_style_ranking(inputs, board_price_per_m2)
+    st.dataframe(df_styles, use_container_width=True, hide_index=True)
+    st.plotly_chart(fig_styles, use_container_width=True)
 
-with tab2:
+if view == VIEWS[1]:
     st.header("Technische Details")
 
     col1, col2 = st.columns(2)
@@ -384,22 +792,43 @@ Bogenbreite = B + 2H
     # Material-Effizienz
     st.subheader("📊 Material-Effizienz")
 
+    col1, col2 = st.columns(2)
+    pallet_type = col1.selectbox("Palettentyp", list(PALLET_TYPES))
+    truck_cost = col2.number_input("Frachtkosten je LKW-Komplettladung (€)", min_value=0.0, value=1200.0, step=50.0)
+    try:
+        rsc_load, wa_load = plan_logistics(inputs, production_volume, pallet_type, truck_cost)
+    except ValueError as exc:
+        rsc_load = wa_load = None
+        st.warning(f"Ladeplanung nicht möglich: {exc}")
+
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("Flächenersparnis",
                   f"{area_savings_pct:.2f} %",
                   help="Wrap-Around benötigt weniger Material")
-    with col2:
-        # Logistik-Vorteil (komplett flach vs. einfach gefaltet)
-        pallet_efficiency = 40  # typisch 40% mehr Zuschnitte pro Palette
-        st.metric("Paletten-Effizienz",
-                  f"+{pallet_efficiency} %",
-                  help="Mehr Zuschnitte pro Palette bei Wrap-Around")
-    with col3:
-        # Magazin-Kapazität
-        st.metric("Magazin-Kapazität",
-                  "≈ 2×",
-                  help="Doppelte Kapazität bei Wrap-Around-Maschinen")
+    if rsc_load is not None:
+        with col2:
+            # Logistik-Vorteil (komplett flach vs. einfach gefaltet) aus dem Lagenbild
+            pallet_efficiency = (wa_load.per_pallet / rsc_load.per_pallet - 1) * 100
+            st.metric("Paletten-Effizienz",
+                      f"{pallet_efficiency:+.0f} %",
+                      help="Mehr Zuschnitte pro Palette bei Wrap-Around")
+        with col3:
+            # Magazin-Kapazität: Stapelhöhe je Zuschnitt (flach vs. gefaltet)
+            st.metric("Magazin-Kapazität",
+                      f"{rsc_load.piece_thickness / wa_load.piece_thickness:.1f}×",
+                      help="Zuschnitte pro Magazinlänge bei Wrap-Around im Verhältnis zu RSC")
+
+        df_logistics = pd.DataFrame([
+            {'Bauart': label, 'Anlieferung (mm)': f"{plan.piece_length:.0f} × {plan.piece_width:.0f} × {plan.piece_thickness:g}",
+             'Stück/Lage': plan.per_layer, 'Lagen': plan.layers, 'Stück/Palette': plan.per_pallet,
+             'Sonderpalette': "ja" if plan.custom_pallet else "nein", 'Paletten/Auftrag': plan.pallets,
+             'Paletten/LKW': plan.pallets_per_truck, 'Fracht/Box (€)': plan.freight_per_box}
+            for label, plan in (("RSC (gefaltet)", rsc_load), ("Wrap-Around (flach)", wa_load))
+        ])
+        st.dataframe(df_logistics, use_container_width=True, hide_index=True)
+        st.caption(f"Paletten für {production_volume:,} Stück; Fracht anteilig je Palettenstellplatz. ".replace(",", ".")
+                   + "Passt ein Zuschnitt nicht auf die Palette, wird eine Sonderpalette nach Zuschnittmaß angesetzt.")
 
     st.info("""
     **Zusätzliche Vorteile von Wrap-Around:**
@@ -410,165 +839,94 @@ Bogenbreite = B + 2H
     - Enganliegende Verpackung minimiert Füllmaterial
     """)
 
-with tab3:
+    # Bahnbelegung: tatsächlicher Papierverbrauch inkl. Randbeschnitt
+    st.subheader("🏭 Bahnbelegung Wellpappenanlage")
+    col1, col2, col3 = st.columns(3)
+    deckle_width = col1.number_input("Arbeitsbreite (mm)", min_value=500, max_value=3500, value=2500, step=50)
+    edge_trim = col2.number_input("Randbeschnitt gesamt (mm)", min_value=0, max_value=200, value=30, step=5)
+    allow_blank_rotation = col3.checkbox("Zuschnitt drehen erlaubt",
+                                         help="Wellenrichtung quer zur Bahn ist Standard")
+    df_board = plan_board_usage(inputs, production_volume, deckle_width, edge_trim, allow_blank_rotation)
+    st.dataframe(df_board, use_container_width=True, hide_index=True)
+    st.caption(f"Bahnfläche/Box = Arbeitsbreite × Lauflänge für {production_volume:,} Stück, ".replace(",", ".")
+               + "inklusive Randbeschnitt und ungenutzter Restbreite.")
+
+if view == VIEWS[2]:
     st.header("Visualisierung")
+    figures = build_figures(inputs, production_volume)
 
     # Kostenvergleich Balkendiagramm
     st.subheader("Kostenvergleich pro Box")
-
-    fig_cost = go.Figure(data=[
-        go.Bar(name='Materialkosten', x=['RSC', 'Wrap-Around'],
-               y=[rsc_material_cost, wa_material_cost],
-               marker_color='lightblue'),
-        go.Bar(name='Klebekosten', x=['RSC', 'Wrap-Around'],
-               y=[rsc_tape_cost['cost_per_box'], wa_hotmelt_cost['cost_per_box']],
-               marker_color='lightcoral')
-    ])
-
-    fig_cost.update_layout(
-        barmode='stack',
-        title='Kostenaufschlüsselung pro Box',
-        xaxis_title='Karton-Typ',
-        yaxis_title='Kosten (€)',
-        height=400
-    )
-
-    st.plotly_chart(fig_cost, use_container_width=True)
+    st.plotly_chart(figures['fig_cost'], use_container_width=True)
 
     # Einsparungen bei verschiedenen Volumina
     st.subheader("Kumulierte Ersparnis nach Produktionsvolumen")
-
-    volumes_chart = list(range(0, production_volume + 1, max(1, production_volume // 10)))
-    savings_chart = [cost_diff_per_box * v for v in volumes_chart]
-
-    fig_savings = go.Figure()
-    fig_savings.add_trace(go.Scatter(
-        x=volumes_chart,
-        y=savings_chart,
-        mode='lines',
-        fill='tozeroy',
-        name='Ersparnis',
-        line=dict(color='green', width=3)
-    ))
-
-    fig_savings.update_layout(
-        title=f'Kumulierte Ersparnis bis {production_volume:,} Kartons'.replace(",", "."),
-        xaxis_title='Anzahl Kartons',
-        yaxis_title='Ersparnis (€)',
-        height=400
-    )
-
-    st.plotly_chart(fig_savings, use_container_width=True)
+    st.plotly_chart(figures['fig_savings'], use_container_width=True)
 
     # Flächenvergleich
     st.subheader("Flächenvergleich der Zuschnitte")
-
-    fig_area = go.Figure(data=[
-        go.Bar(
-            x=['RSC', 'Wrap-Around'],
-            y=[rsc_blank['area_m2'], wa_blank['area_m2']],
-            marker_color=['#FF6B6B', '#4ECDC4'],
-            text=[f"{rsc_blank['area_m2']:.4f} m²", f"{wa_blank['area_m2']:.4f} m²"],
-            textposition='auto',
-        )
-    ])
-
-    fig_area.update_layout(
-        title='Zuschnittsläche im Vergleich',
-        xaxis_title='Karton-Typ',
-        yaxis_title='Fläche (m²)',
-        height=400
-    )
-
-    st.plotly_chart(fig_area, use_container_width=True)
+    st.plotly_chart(figures['fig_area'], use_container_width=True)
 
     # Kosten-Breakdown Pie Chart
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("RSC Kostenverteilung")
-        fig_pie_rsc = go.Figure(data=[go.Pie(
-            labels=['Material', 'Klebeband'],
-            values=[rsc_material_cost, rsc_tape_cost['cost_per_box']],
-            hole=.3
-        )])
-        fig_pie_rsc.update_layout(height=300)
-        st.plotly_chart(fig_pie_rsc, use_container_width=True)
+        st.plotly_chart(figures['fig_pie_rsc'], use_container_width=True)
 
     with col2:
         st.subheader("Wrap-Around Kostenverteilung")
-        fig_pie_wa = go.Figure(data=[go.Pie(
-            labels=['Material', 'Hotmelt'],
-            values=[wa_material_cost, wa_hotmelt_cost['cost_per_box']],
-            hole=.3
-        )])
-        fig_pie_wa.update_layout(height=300)
-        st.plotly_chart(fig_pie_wa, use_container_width=True)
-
-with tab4:
+        st.plotly_chart(figures['fig_pie_wa'], use_container_width=True)
+
+    # Preisunsicherheit
+    st.subheader("🎲 Preisschwankungen (Monte Carlo)")
+    st.write("Zieht Karton-, Tape- und Hotmelt-Preise zufällig um die eingegebenen Werte "
+             "(Lognormal, Standardabweichung in %) und zeigt die Verteilung der Ersparnis.")
+    col1, col2, col3, col4, col5 = st.columns(5)
+    board_volatility = col1.slider("Kartonpreise ± %", 0, 50, 10)
+    tape_volatility = col2.slider("Tape-Preis ± %", 0, 50, 10)
+    hotmelt_volatility = col3.slider("Hotmelt-Preis ± %", 0, 50, 15)
+    board_correlation = col4.slider("Korrelation RSC/WA", -1.0, 1.0, 0.8, 0.1)
+    draws = col5.selectbox("Ziehungen", [10_000, 100_000, 1_000_000], index=2,
+                           format_func=lambda x: f"{x:,}".replace(",", "."))
+    volatility = (('rsc_price_per_1000', board_volatility / 100), ('wa_price_per_1000', board_volatility / 100),
+                  ('tape_price_per_roll', tape_volatility / 100), ('hotmelt_price_per_kg', hotmelt_volatility / 100))
+    simulation, fig_simulation = run_price_simulation(inputs, volatility, board_correlation, draws)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Wahrscheinlichkeit WA günstiger", f"{simulation.wa_cheaper_prob * 100:.1f} %")
+    col2.metric("Erwartete Ersparnis/Box", f"{simulation.mean:.4f} €", help=f"Std.-Abw. {simulation.std:.4f} €")
+    col3.metric("5 %–95 %-Bereich", f"{simulation.percentiles[5]:.4f} … {simulation.percentiles[95]:.4f} €")
+    col4.metric("Break-even WA-Preis (Median)", f"{simulation.break_even_wa_price[1]:.2f} €/1000",
+                help="WA-Preis pro 1000 Stück, ab dem RSC günstiger wird (5 %/95 %: "
+                     f"{simulation.break_even_wa_price[0]:.2f} / {simulation.break_even_wa_price[2]:.2f} €)")
+    st.plotly_chart(fig_simulation, use_container_width=True)
+
+if view == VIEWS[3]:
     st.header("Export")
 
     st.write("Exportieren Sie die Berechnungsergebnisse als Excel-Datei oder PDF-Report.")
 
-    # Excel Export vorbereiten
-    def create_excel_export():
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            # Übersicht
-            df_overview = pd.DataFrame({
-                'Parameter': ['Länge (mm)', 'Breite (mm)', 'Höhe (mm)', 'Materialstärke (mm)',
-                             'RSC Preis/1000 (€)', 'WA Preis/1000 (€)', 'Produktionsvolumen'],
-                'Wert': [length, width, height, material_thickness,
-                        rsc_price_per_1000, wa_price_per_1000, production_volume]
-            })
-            df_overview.to_excel(writer, sheet_name='Parameter', index=False)
-
-            # Vergleichstabelle
-            df_comparison.to_excel(writer, sheet_name='Kostenvergleich', index=False)
-
-            # Volumenhochrechnung
-            df_volumes.to_excel(writer, sheet_name='Volumenhochrechnung', index=False)
-
-            # Technische Details
-            tech_data = {
-                'Parameter': [
-                    'RSC Bogenlänge (mm)', 'RSC Bogenbreite (mm)', 'RSC Fläche (m²)',
-                    'RSC Tape-Länge (m)', 'RSC Hotmelt Nahtlänge (m)',
-                    'WA Bogenlänge (mm)', 'WA Bogenbreite (mm)', 'WA Fläche (m²)',
-                    'WA Hotmelt Nahtlänge (m)', 'Flächenersparnis (%)'
-                ],
-                'Wert': [
-                    rsc_blank['blank_length'], rsc_blank['blank_width'], rsc_blank['area_m2'],
-                    rsc_tape_cost['tape_length_m'], rsc_hotmelt_cost['seam_length_m'],
-                    wa_blank['blank_length'], wa_blank['blank_width'], wa_blank['area_m2'],
-                    wa_hotmelt_cost['seam_length_m'], area_savings_pct
-                ]
-            }
-            df_tech = pd.DataFrame(tech_data)
-            df_tech.to_excel(writer, sheet_name='Technische Details', index=False)
-
-        return output.getvalue()
-
-    excel_data = create_excel_export()
-
+    # Die Dateien werden erst beim Klick auf den Download-Button erzeugt (und je Eingabe zwischengespeichert)
     col1, col2 = st.columns(2)
 
     with col1:
         st.download_button(
             label="📥 Excel-Datei herunterladen",
-            data=excel_data,
+            data=partial(serve_export, 'xlsx', create_excel_export, inputs, production_volume),
             file_name=f"karton_kostenvergleich_{length}x{width}x{height}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            on_click="ignore"
         )
 
     with col2:
         # CSV Export als Alternative
-        csv_data = df_comparison.to_csv(index=False).encode('utf-8')
         st.download_button(
             label="📥 CSV-Datei herunterladen",
-            data=csv_data,
+            data=partial(serve_export, 'csv', create_csv_export, inputs, production_volume),
             file_name=f"karton_kostenvergleich_{length}x{width}x{height}.csv",
-            mime="text/csv"
+            mime="text/csv",
+            on_click="ignore"
         )
 
     st.divider()
@@ -576,50 +934,324 @@ with tab4:
     # Zusammenfassung für Report
     st.subheader("📄 Zusammenfassung")
 
-    summary = f"""
-    # Karton-Kostenvergleich Report
-
-    ## Eingabeparameter
-    - **Abmessungen**: {length} × {width} × {height} mm
-    - **Material**: {[t for t in [("B-Welle (2.5mm)", 2.5), ("C-Welle (3.5mm)", 3.5), ("E-Welle (1.5mm)", 1.5), ("BC-Welle (6.0mm)", 6.0)] if t[1] == material_thickness][0][0]}
-    - **Produktionsvolumen**: {production_volume:,} Stück
-
-    ## Ergebnisse
-
-    ### RSC-Karton (FEFCO 0201)
-    - Zuschnittsläche: {rsc_blank['area_m2']:.4f} m²
-    - Materialkosten: {rsc_material_cost:.4f} €/Box
-    - Klebekosten (Tape): {rsc_tape_cost['cost_per_box']:.4f} €/Box
-    - **Gesamtkosten: {rsc_total_cost_tape:.4f} €/Box**
-
-    ### Wrap-Around-Karton (FEFCO 0409)
-    - Zuschnittsläche: {wa_blank['area_m2']:.4f} m²
-    - Materialkosten: {wa_material_cost:.4f} €/Box
-    - Klebekosten (Hotmelt): {wa_hotmelt_cost['cost_per_box']:.4f} €/Box
-    - **Gesamtkosten: {wa_total_cost:.4f} €/Box**
-
-    ## Einsparungen durch Wrap-Around
-    - **Flächenersparnis**: {area_savings_pct:.2f}%
-    - **Kostenersparnis pro Box**: {cost_diff_per_box:.4f} € ({cost_diff_pct:.2f}%)
-    - **Gesamtersparnis bei {production_volume:,} Stück**: {cost_diff_per_box * production_volume:.2f} €
-
-    ## Empfehlung
-    {"✅ Wrap-Around ist wirtschaftlicher für diese Anwendung!" if cost_diff_per_box > 0 else "⚠️ RSC ist in diesem Fall günstiger."}
-
-    ---
-    *Erstellt mit Karton-Kostenrechner*
-    """
+    summary = build_summary(inputs, production_volume)
 
     st.markdown(summary)
 
     # Text-Report Download
     st.download_button(
         label="📥 Text-Report herunterladen",
-        data=summary.encode('utf-8'),
+        data=partial(serve_export, 'md', create_markdown_export, inputs, production_volume),
         file_name=f"report_{length}x{width}x{height}.md",
-        mime="text/markdown"
+        mime="text/markdown",
+        on_click="ignore"
     )
 
+if view == VIEWS[4]:
+    st.header("Maßoptimierung")
+    st.write("Sucht innerhalb der zulässigen Zugaben um das Produkt die Innenmaße mit minimaler "
+             "Zuschnittsfläche, Kosten und Kleberlänge (Pareto-Front).")
+
+    with st.form("optimizer"):
+        col1, col2, col3 = st.columns(3)
+        product_dims, clearance_min, clearance_max = [], [], []
+        for col, label, default in ((col1, "Länge", length), (col2, "Breite", width), (col3, "Höhe", height)):
+            with col:
+                product_dims.append(st.number_input(f"Produkt-{label} (mm)", min_value=10, max_value=2000,
+                                                    value=max(10, int(default) - 20), step=5))
+                clearance_min.append(st.number_input(f"Min. Zugabe {label} (mm)", min_value=0, max_value=500, value=5))
+                clearance_max.append(st.number_input(f"Max. Zugabe {label} (mm)", min_value=0, max_value=500, value=60))
+
+        col1, col2, col3, col4 = st.columns(4)
+        target_volume_l = col1.number_input("Mindest-Innenvolumen (l, 0 = keins)", min_value=0.0, value=0.0, step=0.5)
+        step = col2.selectbox("Rasterweite (mm)", [1, 2, 5, 10], index=0)
+        style = col3.radio("Bauart", ["wa", "rsc"], format_func=lambda x: "Wrap-Around" if x == "wa" else "RSC")
+        allow_rotation = col4.checkbox("Produkt drehen erlaubt")
+        if st.form_submit_button("🔍 Optimieren"):
+            st.session_state['optimizer_active'] = True
+
+    if any(lo > hi for lo, hi in zip(clearance_min, clearance_max)):
+        st.error("Die Mindestzugabe darf die Maximalzugabe nicht überschreiten.")
+    elif st.session_state.get('optimizer_active'):
+        df_front, candidates, evaluated = run_optimizer(
+            tuple(product_dims), tuple(clearance_min), tuple(clearance_max),
+            target_volume_l, step, style, allow_rotation, inputs)
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Kandidaten im Raster", f"{candidates:,}".replace(",", "."))
+        col2.metric("Berechnet nach Pruning", f"{evaluated:,}".replace(",", "."))
+        col3.metric("Pareto-optimale Maße", len(df_front))
+
+        if df_front.empty:
+            st.warning("Keine zulässigen Maße: Zielvolumen innerhalb der Maximalzugaben nicht erreichbar.")
+        else:
+            st.dataframe(df_front, use_container_width=True, hide_index=True)
+            import plotly.graph_objects as go
+            fig_front = go.Figure(go.Scatter(
+                x=df_front['Zuschnittsfläche (m²)'], y=df_front['Kosten/Box (€)'], mode='markers',
+                marker=dict(color=df_front['Kleberlänge (m)'], colorscale='Viridis', showscale=True,
+                            colorbar=dict(title='Kleber (m)')),
+                text=[f"{l:g} × {b:g} × {h:g} mm" for l, b, h in
+                      zip(df_front['Länge (mm)'], df_front['Breite (mm)'], df_front['Höhe (mm)'])],
+            ))
+            fig_front.update_layout(title='Pareto-Front: Fläche vs. Kosten', xaxis_title='Fläche (m²)',
+                                    yaxis_title='Kosten/Box (€)', height=400)
+            st.plotly_chart(fig_front, use_container_width=True)
+
+if view == VIEWS[5]:
+    st.header("Sensitivitätsanalyse")
+    st.write("Variiert jeden Eingabeparameter über seinen zulässigen Bereich und zeigt die Wirkung auf die "
+             "Ersparnis von Wrap-Around gegenüber RSC (Tape).")
+
+    col1, col2, col3, col4 = st.columns(4)
+    metric = col1.radio("Kennzahl", ['cost_diff_per_box', 'area_savings_pct'],
+                        format_func=lambda x: "Kosten/Box" if x == 'cost_diff_per_box' else "Fläche (%)")
+    heatmap_x = col2.selectbox("Heatmap x-Achse", NUMERIC_PARAMETERS, index=0, format_func=PARAMETER_LABELS.get)
+    heatmap_y = col3.selectbox("Heatmap y-Achse", NUMERIC_PARAMETERS, index=2, format_func=PARAMETER_LABELS.get)
+    factorial_points = col4.selectbox("Stufen je Zahlenparameter", [3, 4])
+
+    if heatmap_x == heatmap_y:
+        st.error("Bitte zwei verschiedene Parameter für die Heatmap wählen.")
+    else:
+        fig_tornado, fig_heatmap, df_effects, combinations, positive_share = build_sensitivity(
+            inputs, metric, heatmap_x, heatmap_y, factorial_points)
+        st.plotly_chart(fig_tornado, use_container_width=True)
+        st.plotly_chart(fig_heatmap, use_container_width=True)
+
+        st.subheader("Vollfaktorielles Raster")
+        col1, col2 = st.columns(2)
+        col1.metric("Kombinationen", f"{combinations:,}".replace(",", "."))
+        col2.metric("Anteil mit Ersparnis", f"{positive_share * 100:.1f} %")
+        st.dataframe(df_effects, use_container_width=True, hide_index=True)
+
+if view == VIEWS[6]:
+    st.header("Szenarien")
+    st.write("Speichert Konfigurationen nebeneinander. Bei Änderungen werden nur die betroffenen Szenarien "
+             "und Rechenschritte (Zuschnitte, Tape, Hotmelt, Material, Summen) neu berechnet.")
+    workspace = st.session_state.setdefault('scenarios', ScenarioWorkspace())
+
+    col1, col2 = st.columns([3, 1])
+    scenario_name = col1.text_input("Name des Szenarios",
+                                    value=f"{length:g}×{width:g}×{height:g} {flute_label(material_thickness)}")
+    if col2.button("💾 Aktuelle Eingaben speichern", use_container_width=True) and scenario_name:
+        workspace.add(scenario_name, inputs)
+
+    if len(workspace):
+        # Parameter außerhalb des Formulars, damit der Wertebereich sofort zur Auswahl passt
+        col1, col2 = st.columns(2)
+        target = col1.selectbox("Szenario", ["Alle Szenarien"] + workspace.names())
+        parameter = col2.selectbox("Parameter", NUMERIC_PARAMETERS, format_func=PARAMETER_LABELS.get)
+        with st.form("scenario_update"):
+            min_value, max_value, _, step = INPUT_LIMITS[parameter]
+            new_value = st.number_input(f"Neuer Wert: {PARAMETER_LABELS[parameter]}", min_value=float(min_value),
+                                        max_value=float(max_value), step=float(step), value=None,
+                                        key=f'scenario_value_{parameter}')
+            col1, col2 = st.columns(2)
+            apply_clicked = col1.form_submit_button("✏️ Übernehmen")
+            remove_clicked = col2.form_submit_button("🗑️ Szenario löschen")
+        if apply_clicked and new_value is None:
+            st.warning("Bitte einen neuen Wert eingeben.")
+        elif apply_clicked:
+            try:
+                if target == "Alle Szenarien":
+                    recomputed = workspace.update_all(**{parameter: new_value})
+                    st.success(f"{len(recomputed)} von {len(workspace)} Szenarien neu berechnet.")
+                else:
+                    nodes = workspace.update(target, **{parameter: new_value})
+                    st.success(f"Neu berechnet: {', '.join(nodes) or 'nichts (Wert unverändert)'}")
+            except ValueError as exc:
+                st.error(str(exc))
+        if remove_clicked and target in workspace:
+            workspace.remove(target)
+
+    if not len(workspace):
+        st.info("Noch keine Szenarien gespeichert.")
+    else:
+        rows = []
+        for name in workspace.names():
+            scenario_inputs, result = workspace.inputs(name), workspace.result(name)
+            rows.append({
+                'Szenario': name,
+                'Maße (mm)': f"{scenario_inputs.length:g} × {scenario_inputs.width:g} × {scenario_inputs.height:g}",
+                'Wellpappe': flute_label(scenario_inputs.material_thickness),
+                'RSC (€/Box)': result['rsc_total_cost_tape'],
+                'WA (€/Box)': result['wa_total_cost'],
+                'Ersparnis (€/Box)': result['cost_diff_per_box'],
+                'Ersparnis (%)': result['cost_diff_pct'],
+                'Flächenersparnis (%)': result['area_savings_pct'],
+            })
+        df_scenarios = pd.DataFrame(rows)
+        st.dataframe(df_scenarios, use_container_width=True, hide_index=True)
+
+        import plotly.graph_objects as go
+        fig_scenarios = go.Figure([
+            go.Bar(name='RSC (Tape)', x=df_scenarios['Szenario'], y=df_scenarios['RSC (€/Box)'], marker_color='#FF6B6B'),
+            go.Bar(name='Wrap-Around', x=df_scenarios['Szenario'], y=df_scenarios['WA (€/Box)'], marker_color='#4ECDC4'),
+        ])
+        fig_scenarios.update_layout(barmode='group', title='Kosten pro Box je Szenario', yaxis_title='€/Box', height=400)
+        st.plotly_chart(fig_scenarios, use_container_width=True)
+
+        fig_overlay = go.Figure([
+            go.Scatter(x=PRODUCTION_VOLUMES, y=[saving * volume for volume in PRODUCTION_VOLUMES],
+                       mode='lines+markers', name=name)
+            for name, saving in zip(df_scenarios['Szenario'], df_scenarios['Ersparnis (€/Box)'])
+        ])
+        fig_overlay.update_layout(title='Kumulierte Ersparnis je Szenario', xaxis_title='Produktionsvolumen (Stück)',
+                                  yaxis_title='Ersparnis (€)', xaxis_type='log', height=400)
+        st.plotly_chart(fig_overlay, use_container_width=True)
+
+    store = quote_store()
+    if store is not None:
+        st.subheader("🗂️ Angebotsverlauf")
+        st.caption(f"{len(store):,} gespeicherte Angebote – identische Anfragen werden direkt aus dem Speicher "
+                   "beantwortet.".replace(",", "."))
+        col1, col2, col3 = st.columns(3)
+        tolerance = col1.number_input("Maßtoleranz ± (mm)", min_value=0, max_value=1000, value=50, step=10)
+        flute_filter = col2.selectbox("Wellpappe", [None] + FLUTE_OPTIONS,
+                                      format_func=lambda x: "Alle" if x is None else x[0], key='history_flute')
+        period = col3.date_input("Zeitraum", value=(), key='history_period')
+        since = until = None
+        if len(period) == 2:
+            since = time.mktime(period[0].timetuple())
+            until = time.mktime(period[1].timetuple()) + 86400
+        history = store.search(
+            length=(length - tolerance, length + tolerance),
+            width=(width - tolerance, width + tolerance),
+            height=(height - tolerance, height + tolerance),
+            material_thickness=flute_filter[1] if flute_filter else None,
+            since=since, until=until,
+        )
+        if history:
+            st.dataframe(pd.DataFrame([{
+                'Angelegt': pd.Timestamp(entry['created_at'], unit='s').strftime('%d.%m.%Y %H:%M'),
+                'Maße (mm)': f"{entry['length']:g} × {entry['width']:g} × {entry['height']:g}",
+                'Wellpappe': flute_label(entry['material_thickness']),
+                'RSC (€/Box)': entry['result']['rsc_total_cost_tape'],
+                'WA (€/Box)': entry['result']['wa_total_cost'],
+                'Ersparnis (€/Box)': entry['result']['cost_diff_per_box'],
+                'Abrufe': entry['hits'],
+            } for entry in history]), use_container_width=True, hide_index=True)
+        else:
+            st.info("Keine gespeicherten Angebote im gewählten Bereich.")
+
+if view == VIEWS[7]:
+    from carton_cost.breakeven import FixedCosts
+
+    st.header("Break-even")
+    st.write("Stellt der Ersparnis je Box die Investition (WA-Aufrichter statt RSC-Aufrichter mit Verschließer, "
+             "Formatwerkzeuge) und die Rüstkosten je Auftrag gegenüber.")
+
+    defaults = FixedCosts()
+    col1, col2, col3 = st.columns(3)
+    wa_machine_cost = col1.number_input("WA-Aufrichter (€)", min_value=0.0, value=defaults.wa_machine_cost,
+                                        step=5000.0)
+    rsc_machine_cost = col2.number_input("RSC-Aufrichter + Verschließer (€)", min_value=0.0,
+                                         value=defaults.rsc_machine_cost, step=5000.0,
+                                         help="Entfällt bei der Umstellung; 0, wenn die Anlage bereits vorhanden ist")
+    tooling_cost = col3.number_input("Formatwerkzeuge WA (€)", min_value=0.0, value=defaults.tooling_cost,
+                                     step=500.0)
+    col1, col2, col3, col4 = st.columns(4)
+    wa_changeover_cost = col1.number_input("Rüstkosten/Auftrag WA (€)", min_value=0.0,
+                                           value=defaults.wa_changeover_cost, step=10.0)
+    rsc_changeover_cost = col2.number_input("Rüstkosten/Auftrag RSC (€)", min_value=0.0,
+                                            value=defaults.rsc_changeover_cost, step=10.0)
+    run_size = col3.number_input("Losgröße (Boxen/Auftrag)", min_value=1, value=int(defaults.run_size), step=1000)
+    annual_volume = col4.number_input("Jahresmenge (Boxen)", min_value=1, value=int(defaults.annual_volume),
+                                      step=10000)
+    costs = FixedCosts(wa_machine_cost, rsc_machine_cost, tooling_cost, wa_changeover_cost, rsc_changeover_cost,
+                       float(run_size), float(annual_volume))
+
+    col1, col2 = st.columns(2)
+    breakeven_x = col1.selectbox("Heatmap x-Achse", NUMERIC_PARAMETERS, index=0, format_func=PARAMETER_LABELS.get,
+                                 key='breakeven_x')
+    breakeven_y = col2.selectbox("Heatmap y-Achse", NUMERIC_PARAMETERS, index=1, format_func=PARAMETER_LABELS.get,
+                                 key='breakeven_y')
+
+    if breakeven_x == breakeven_y:
+        st.error("Bitte zwei verschiedene Parameter für die Heatmap wählen.")
+    else:
+        result, fig_curve, fig_heatmap = build_break_even(inputs, costs, breakeven_x, breakeven_y)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Investition", f"{costs.investment:,.0f} €".replace(",", "."))
+        col2.metric("Nettoersparnis/Box", f"{result['net_savings_per_box']:.4f} €")
+        if result['break_even_volume'] == float('inf'):
+            col3.metric("Break-even-Menge", "–")
+            col4.metric("Amortisation", "–")
+            st.warning("Nach Rüstkosten bleibt keine Ersparnis je Box: Die Umstellung amortisiert sich nicht.")
+        else:
+            col3.metric("Break-even-Menge", f"{result['break_even_volume']:,.0f}".replace(",", "."))
+            col4.metric("Amortisation", f"{result['payback_months']:.1f} Monate")
+        st.plotly_chart(fig_curve, use_container_width=True)
+        st.plotly_chart(fig_heatmap, use_container_width=True)
+
+if view == VIEWS[8]:
+    st.header("Katalog")
+    st.write("Berechnet alle Zeilen einer CSV- oder Excel-Datei. Fehlende Spalten übernehmen die Werte aus der "
+             "Sidebar; das Ergebnis bleibt auf dem Server, angezeigt wird nur die aktuelle Seite.")
+
+    catalog_file = st.file_uploader("Katalog (CSV oder Excel)", type=['csv', 'xlsx', 'xls'],
+                                    help="Spalten: length, width, height, optional flute bzw. material_thickness, "
+                                         "Preise, tape_pattern, hotmelt_bead_width bzw. hotmelt_usage, "
+                                         "grade, quantity")
+    if catalog_file is None:
+        st.info("Bitte eine Katalogdatei hochladen.")
+    else:
+        pricing, pricing_key = None, None
+        if pricing_mode == PRICING_MODES[1]:
+            pricing = (price_matrix, board_grade, production_volume)
+            pricing_key = (price_matrix.fingerprint, board_grade, production_volume)
+        try:
+            grid = load_catalog(catalog_file.file_id, catalog_file.name, inputs, pricing_key,
+                                catalog_file.getvalue(), pricing)
+        except (ValueError, KeyError) as exc:
+            st.error(f"Katalog kann nicht berechnet werden: {exc}")
+            st.stop()
+
+        col1, col2, col3, col4 = st.columns([2, 1, 2, 1])
+        sort_by = col1.selectbox("Sortieren nach", [None] + grid.columns,
+                                 format_func=lambda x: "Dateireihenfolge" if x is None else x, key='catalog_sort')
+        descending = col2.toggle("Absteigend", key='catalog_descending')
+        filter_column = col3.selectbox("Filter", [None] + grid.columns,
+                                       format_func=lambda x: "Kein Filter" if x is None else x, key='catalog_filter')
+        page_size = col4.selectbox("Zeilen je Seite", [25, 50, 100, 250], index=1, key='catalog_page_size')
+
+        filters = ()
+        if filter_column in grid.numeric_columns:
+            col1, col2 = st.columns(2)
+            low = col1.number_input("Minimum", value=None, key='catalog_min')
+            high = col2.number_input("Maximum", value=None, key='catalog_max')
+            filters = tuple((filter_column, op, value) for op, value in (('>=', low), ('<=', high))
+                            if value is not None)
+        elif filter_column is not None:
+            text = st.text_input("Enthält", key='catalog_text')
+            filters = ((filter_column, 'enthält', text),) if text else ()
+
+        matches = len(grid.view(filters, sort_by, descending))
+        pages = max(1, -(-matches // page_size))
+        # Nach Filter- oder Seitengrößenwechsel kann die gemerkte Seite hinter der letzten liegen
+        if st.session_state.get('catalog_page', 1) > pages:
+            st.session_state['catalog_page'] = pages
+        page_number = st.number_input(f"Seite (von {pages})", min_value=1, max_value=pages, value=1,
+                                      key='catalog_page')
+        df_page, _ = grid.page(page_number - 1, page_size, filters, sort_by, descending)
+        st.dataframe(df_page, use_container_width=True, hide_index=True)
+        first = (page_number - 1) * page_size
+        st.caption(f"Zeilen {min(first + 1, matches):,}–{first + len(df_page):,} von {matches:,} "
+                   f"(Katalog: {len(grid):,} Zeilen)".replace(",", "."))
+
+        col1, col2, col3 = st.columns(3)
+        for col, fmt, label, mime in ((col1, 'csv', "CSV", "text/csv"),
+                                      (col2, 'parquet', "Parquet", "application/octet-stream"),
+                                      (col3, 'xlsx', "Excel", "application/vnd.openxmlformats-officedocument."
+                                                              "spreadsheetml.sheet")):
+            col.download_button(
+                label=f"📥 Ergebnis als {label}",
+                data=partial(serve_export, fmt, create_catalog_export, fmt, grid, filters, sort_by, descending),
+                file_name=f"katalog_ergebnis.{fmt}",
+                mime=mime,
+                on_click="ignore"
+            )
+
 # Footer
 st.divider()
 st.markdown("""
@@ -628,3 +1260,18 @@ st.markdown("""
     <p>RSC = Regular Slotted Container (FEFCO 0201) | Wrap-Around = Five Panel Folder (FEFCO 0409)</p>
 </div>
 """, unsafe_allow_html=True)
+
+METRICS.observe('stage_seconds', time.perf_counter() - rerun_start, stage='rerun')
+
+# Debug-Panel je Sitzung: ?debug=1 an die URL anhängen
+if st.query_params.get('debug') == '1':
+    with st.expander("🐞 Debug: Laufzeiten und Cache", expanded=True):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Reruns dieser Sitzung", st.session_state['reruns'])
+        col2.metric("Dauer dieses Durchlaufs", f"{(time.perf_counter() - rerun_start) * 1000:.0f} ms")
+        col3.metric("Berechnete Stufen (Cache-Miss)", len(stage_timings))
+        if stage_timings:
+            st.dataframe(pd.DataFrame(stage_timings, columns=['Stufe', 'Sekunden']), hide_index=True)
+        st.dataframe(pd.DataFrame(sorted(METRICS.cache_hit_ratios().items()), columns=['Stufe', 'Trefferquote']),
+                     hide_index=True)
+        st.code(METRICS.render_prometheus(), language='text')
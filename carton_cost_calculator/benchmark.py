@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmarks und Performance-Regressionsprüfung
+
+Misst die Einzelwert-Berechnung, die vektorisierte Sammelkalkulation
+(10^3 bis 10^7 Zeilen), einen kompletten Streamlit-Rerun über AppTest und
+den Excel-Export. Jeder Lauf wird in einer JSON-Historie abgelegt und mit dem
+Median der letzten Läufe auf derselben Maschine verglichen; verschlechtert
+sich ein Wert um mehr als die Schwelle, endet das Skript mit Exit-Code 1.
+
+Beispiel:
+    python benchmark.py --max-rows 10000000 --threshold 0.25
+    python benchmark.py --only scalar bulk --no-record
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+DEFAULT_HISTORY = 'benchmark_history.json'
+DEFAULT_THRESHOLD = 0.25
+# Sammelkalkulation läuft in Blöcken, damit 10^7 Zeilen nicht gleichzeitig im Speicher liegen
+BULK_BLOCK_ROWS = 1_000_000
+
+
+def _result(name, value, unit, higher_is_better):
+    return {'name': name, 'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+
+
+def _best_time(fn, repeat):
+    """Kürzeste Laufzeit aus repeat Wiederholungen (wie timeit)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_scalar(args):
+    """Einzelangebote pro Sekunde über calculate_quote"""
+    from carton_cost import DEFAULT_INPUTS, calculate_quote
+
+    calls = 20_000
+    params = [{**DEFAULT_INPUTS, 'length': 100 + i % 1000} for i in range(calls)]
+
+    def run():
+        for p in params:
+            calculate_quote(**p)
+
+    return [_result('scalar.calculate_quote', calls / _best_time(run, args.repeat), 'calls/s', True)]
+
+
+def bench_bulk(args):
+    """Zeilen pro Sekunde der vektorisierten Sammelkalkulation, 10^3 bis max_rows"""
+    import numpy as np
+
+    from carton_cost import DEFAULT_INPUTS
+    from carton_cost.batch import calculate_batch
+
+    rng = np.random.default_rng(0)
+    block = min(BULK_BLOCK_ROWS, args.max_rows)
+    dims = {'length': rng.integers(50, 2001, block), 'width': rng.integers(50, 2001, block),
+            'height': rng.integers(20, 1001, block)}
+    params = {name: value for name, value in DEFAULT_INPUTS.items() if name not in dims}
+
+    results = []
+    rows = 1000
+    while rows <= args.max_rows:
+        def run(rows=rows):
+            for start in range(0, rows, block):
+                n = min(block, rows - start)
+                calculate_batch(**{name: values[:n] for name, values in dims.items()}, **params)
+
+        repeat = args.repeat if rows < 10 ** 7 else 1
+        results.append(_result(f'bulk.calculate_batch.{rows}', rows / _best_time(run, repeat), 'rows/s', True))
+        rows *= 10
+    return results
+
+
+def bench_app(args):
+    """Latenz eines kompletten Skriptdurchlaufs: erster Lauf, geänderte Eingabe, unveränderte Eingabe"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file('app.py', default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    first_run = time.perf_counter() - start
+
+    lengths = iter(range(410, 410 + 10 * args.repeat * 2, 10))
+    changed = _best_time(lambda: at.sidebar.number_input[0].set_value(next(lengths)).run(), args.repeat)
+    cached = _best_time(lambda: at.run(), args.repeat)
+    if at.exception:
+        raise RuntimeError(f"App-Fehler im Benchmark: {at.exception[0].message}")
+    return [
+        _result('app.first_run', first_run, 's', False),
+        _result('app.rerun_changed_input', changed, 's', False),
+        _result('app.rerun_cached', cached, 's', False),
+    ]
+
+
+def bench_excel(args):
+    """Erzeugungszeit des Excel-Exports (ohne Cache) und Dateigröße"""
+    os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+    import app  # Bare Mode: führt das Skript ohne Server aus, UI-Aufrufe sind wirkungslos
+
+    from carton_cost import DEFAULT_INPUTS, normalize_inputs
+
+    inputs = normalize_inputs(**DEFAULT_INPUTS)
+    export = app.create_excel_export.__wrapped__
+    data = export(inputs, 10000)
+    return [
+        _result('export.excel', _best_time(lambda: export(inputs, 10000), args.repeat), 's', False),
+        _result('export.excel_bytes', len(data), 'bytes', False),
+    ]
+
+
+BENCHMARKS = {'scalar': bench_scalar, 'bulk': bench_bulk, 'app': bench_app, 'excel': bench_excel}
+
+
+def machine_id():
+    """Ergebnisse sind nur auf derselben Maschine und Python-Version vergleichbar"""
+    return f"{platform.node()}/{platform.machine()}/py{platform.python_version()}"
+
+
+def load_history(path):
+    path = Path(path)
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def find_regressions(history, results, machine, threshold=DEFAULT_THRESHOLD, window=5):
+    """
+    Vergleicht Ergebnisse mit dem Median der letzten window Läufe derselben Maschine
+
+    Rückgabe: Liste von dicts (name, value, baseline, change_pct) für alle
+    Werte, die sich um mehr als threshold verschlechtert haben.
+    """
+    previous = [run for run in history if run['machine'] == machine]
+    regressions = []
+    for result in results:
+        values = [r['value'] for run in previous for r in run['results'] if r['name'] == result['name']]
+        if not values:
+            continue
+        baseline = statistics.median(values[-window:])
+        change = result['value'] / baseline - 1
+        worse = change < -threshold if result['higher_is_better'] else change > threshold
+        if worse:
+            regressions.append({'name': result['name'], 'value': result['value'],
+                                'baseline': baseline, 'change_pct': change * 100})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks und Regressionsprüfung des Karton-Kostenrechners")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--max-rows', type=int, default=1_000_000, help="Größte Sammelkalkulation (bis 10^7)")
+    parser.add_argument('--repeat', type=int, default=3, help="Wiederholungen je Messung (bester Wert zählt)")
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help="JSON-Historie der Läufe")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Zulässige Verschlechterung gegenüber dem Median (0.25 = 25 %%)")
+    parser.add_argument('--window', type=int, default=5, help="Anzahl früherer Läufe für den Median")
+    parser.add_argument('--no-record', action='store_true', help="Lauf nicht in die Historie schreiben")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.only:
+        for result in BENCHMARKS[name](args):
+            results.append(result)
+            print(f"{result['name']:<32} {result['value']:>16,.4g} {result['unit']}", file=sys.stderr)
+
+    history = load_history(args.history)
+    machine = machine_id()
+    regressions = find_regressions(history, results, machine, args.threshold, args.window)
+    for r in regressions:
+        print(f"REGRESSION {r['name']}: {r['value']:,.4g} statt {r['baseline']:,.4g} ({r['change_pct']:+.1f} %)",
+              file=sys.stderr)
+
+    # Nur unauffällige Läufe gehen in die Historie, sonst verschiebt eine Regression die Vergleichsbasis
+    if not args.no_record and not regressions:
+        history.append({'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                        'machine': machine, 'results': results})
+        Path(args.history).write_text(json.dumps(history, indent=2), encoding='utf-8')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
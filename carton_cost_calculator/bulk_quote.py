@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Sammelkalkulation für ganze Kartonkataloge (CSV/Parquet)
+
+Liest eine Datei mit Kartonspezifikationen blockweise, berechnet jeden Block
+vektorisiert (RSC vs. Wrap-Around) und schreibt die Ergebnisse in einem
+eigenen Schreib-Thread weg (CSV, Parquet, Arrow IPC oder Excel, siehe
+carton_cost.export). Der Speicherbedarf hängt nur von der Blockgröße ab,
+nicht von der Dateigröße.
+
+Erkannte Spalten: die Parameter aus carton_cost.batch.INPUT_COLUMNS sowie
+``flute`` (B, C, E, BC) statt ``material_thickness`` und ``hotmelt_bead_width``
+(1.5, 3, 5 mm) statt ``hotmelt_usage``. Fehlende Spalten erhalten die
+Standardwerte der Sidebar oder die Werte aus ``--set``.
+
+Mit ``--price-matrix`` werden die Materialpreise je 1000 aus einer
+Lieferanten-Preismatrix (€/m² mit Mengenstaffel) und der Zuschnittsfläche
+berechnet; Qualität und Auflage kommen aus den Spalten ``grade`` und
+``quantity`` oder aus ``--grade`` und ``--quantity``.
+
+Beispiel:
+    python bulk_quote.py katalog.parquet ergebnis.parquet --workers 4 --set hotmelt_price_per_kg=3.5
+    python bulk_quote.py katalog.csv ergebnis.csv --price-matrix board_prices.example.csv --grade TT125
+    python bulk_quote.py katalog.parquet ergebnis.xlsx
+"""
+
+import argparse
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from carton_cost import DEFAULT_INPUTS
+from carton_cost.batch import INPUT_COLUMNS
+from carton_cost.catalog import cost_catalog
+from carton_cost.export import EXPORT_FORMATS, FrameWriter, export_format
+from carton_cost.pricing import read_price_matrix
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def _file_format(path, explicit=None):
+    fmt = explicit or Path(path).suffix.lower().lstrip('.')
+    if fmt not in ('csv', 'parquet'):
+        raise ValueError(f"Unbekanntes Dateiformat '{fmt}' (erwartet csv oder parquet)")
+    return fmt
+
+
+def read_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS, fmt=None):
+    """Liest die Eingabedatei als Folge von DataFrames mit höchstens chunk_rows Zeilen"""
+    if _file_format(path, fmt) == 'csv':
+        import pandas as pd
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+    else:
+        import pyarrow.parquet as pq
+        for record_batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield record_batch.to_pandas()
+
+
+def cost_chunk(df, defaults, pricing=None):
+    """Berechnet einen Block (läuft ggf. im Prozesspool), siehe carton_cost.catalog.cost_catalog"""
+    return cost_catalog(df, defaults, pricing)
+
+
+def _bounded_ordered_map(executor, fn, iterable, max_in_flight, *args):
+    """Wie executor.map, hält aber höchstens max_in_flight Blöcke gleichzeitig im Speicher"""
+    pending = deque()
+    for item in iterable:
+        pending.append(executor.submit(fn, item, *args))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class ChunkWriter(threading.Thread):
+    """Schreibt Ergebnisblöcke aus einer begrenzten Queue in die Ausgabedatei"""
+
+    def __init__(self, path, fmt, max_queued=4):
+        super().__init__(daemon=True)
+        self.path = path
+        self.fmt = fmt
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.error = None
+
+    def _chunks(self):
+        while (df := self.queue.get()) is not None:
+            yield df
+
+    def run(self):
+        try:
+            self._write()
+        except Exception as exc:  # noqa: BLE001 - Fehler an den Haupt-Thread weiterreichen
+            self.error = exc
+            for _ in self._chunks():
+                pass
+
+    def _write(self):
+        with FrameWriter(self.path, self.fmt) as writer:
+            for df in self._chunks():
+                writer.write(df)
+
+    def put(self, df):
+        if self.error is not None:
+            raise self.error
+        self.queue.put(df)
+
+    def close(self):
+        self.queue.put(None)
+        self.join()
+        if self.error is not None:
+            raise self.error
+
+
+def run(input_path, output_path, chunk_rows=DEFAULT_CHUNK_ROWS, workers=0, defaults=None,
+        input_format=None, output_format=None, pricing=None):
+    """Berechnet die ganze Eingabedatei und gibt die Anzahl geschriebener Zeilen zurück"""
+    defaults = {**DEFAULT_INPUTS, **(defaults or {})}
+    chunks = read_chunks(input_path, chunk_rows, input_format)
+    writer = ChunkWriter(output_path, export_format(output_path, output_format))
+    writer.start()
+
+    rows = 0
+    try:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for result in _bounded_ordered_map(executor, cost_chunk, chunks, 2 * workers, defaults,
+                                                   pricing):
+                    writer.put(result)
+                    rows += len(result)
+        else:
+            for chunk in chunks:
+                result = cost_chunk(chunk, defaults, pricing)
+                writer.put(result)
+                rows += len(result)
+    finally:
+        writer.close()
+    return rows
+
+
+def _parse_setting(text):
+    name, sep, value = text.partition('=')
+    if not sep or name not in INPUT_COLUMNS:
+        raise argparse.ArgumentTypeError(f"Erwartet name=wert mit name aus {', '.join(INPUT_COLUMNS)}")
+    if name == 'tape_pattern':
+        return name, value
+    try:
+        return name, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{name} muss eine Zahl sein") from None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sammelkalkulation RSC vs. Wrap-Around für CSV/Parquet-Kataloge")
+    parser.add_argument('input', help="Eingabedatei (.csv oder .parquet)")
+    parser.add_argument('output', help="Ausgabedatei (.csv, .parquet, .arrow oder .xlsx)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help="Zeilen je Block")
+    parser.add_argument('--workers', type=int, default=0, help="Prozesse für die Berechnung (0 = im Hauptprozess)")
+    parser.add_argument('--set', dest='settings', type=_parse_setting, action='append', default=[],
+                        metavar='NAME=WERT', help="Standardwert für fehlende Spalten, mehrfach möglich")
+    parser.add_argument('--price-matrix', help="Preismatrix (CSV: grade, flute, min_m2, price_per_m2)")
+    parser.add_argument('--grade', help="Papierqualität, falls der Katalog keine Spalte 'grade' hat")
+    parser.add_argument('--quantity', type=int, default=10000,
+                        help="Auflage je Artikel für die Mengenstaffel, falls keine Spalte 'quantity'")
+    parser.add_argument('--input-format', choices=['csv', 'parquet'])
+    parser.add_argument('--output-format', choices=list(EXPORT_FORMATS))
+    args = parser.parse_args(argv)
+
+    pricing = None
+    if args.price_matrix:
+        matrix = read_price_matrix(args.price_matrix)
+        pricing = (matrix, args.grade or matrix.grades()[0], args.quantity)
+
+    start = time.perf_counter()
+    rows = run(args.input, args.output, args.chunk_rows, args.workers, dict(args.settings),
+               args.input_format, args.output_format, pricing)
+    elapsed = time.perf_counter() - start
+    print(f"{rows} Zeilen in {elapsed:.1f} s berechnet ({rows / max(elapsed, 1e-9):,.0f} Zeilen/s) -> {args.output}",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Berechnungskern des Karton-Kostenrechners (ohne UI-Abhängigkeiten)
+
+Der Paket-Import lädt weder Streamlit noch pandas, plotly oder NumPy. Der
+vektorisierte Katalogpfad liegt in ``carton_cost.batch`` und wird bei Bedarf
+explizit importiert.
+"""
+
+from .calculations import (
+    QuoteInputs,
+    calculate_hotmelt_cost_rsc,
+    calculate_hotmelt_cost_wa,
+    calculate_quote,
+    calculate_rsc_blank_dimensions,
+    calculate_tape_cost_rsc,
+    calculate_wraparound_blank_dimensions,
+    normalize_inputs,
+)
+from .formulas import TAPE_PATTERN_H, TAPE_PATTERN_SIMPLE, is_h_pattern
+from .options import (
+    BEAD_OPTIONS,
+    DEFAULT_INPUTS,
+    FLUTE_OPTIONS,
+    INPUT_LIMITS,
+    PRODUCTION_VOLUMES,
+    TAPE_PATTERNS,
+    flute_label,
+)
+
+__all__ = [
+    'BEAD_OPTIONS',
+    'DEFAULT_INPUTS',
+    'FLUTE_OPTIONS',
+    'INPUT_LIMITS',
+    'PRODUCTION_VOLUMES',
+    'QuoteInputs',
+    'TAPE_PATTERNS',
+    'TAPE_PATTERN_H',
+    'TAPE_PATTERN_SIMPLE',
+    'calculate_hotmelt_cost_rsc',
+    'calculate_hotmelt_cost_wa',
+    'calculate_quote',
+    'calculate_rsc_blank_dimensions',
+    'calculate_tape_cost_rsc',
+    'calculate_wraparound_blank_dimensions',
+    'flute_label',
+    'is_h_pattern',
+]
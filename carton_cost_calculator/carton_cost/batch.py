@@ -0,0 +1,112 @@
+"""
+Vektorisierte Batch-Kostenrechnung für ganze Artikelkataloge
+
+Nutzt dieselben elementweisen Formeln (formulas.py) wie die Einzelwert-
+Funktionen, daher liefern beide Wege identische Werte.
+"""
+
+import numpy as np
+
+from .calculations import QuoteInputs
+from .formulas import (
+    hotmelt_cost_rsc,
+    hotmelt_cost_wa,
+    is_h_pattern,
+    rsc_blank_dimensions,
+    tape_cost_rsc,
+    wraparound_blank_dimensions,
+)
+
+# Eingabespalten des Batch-Pfads (Reihenfolge = Parameterreihenfolge von calculate_batch)
+INPUT_COLUMNS = list(QuoteInputs._fields)
+
+
+def calculate_batch(length, width, height, material_thickness,
+                    rsc_price_per_1000, wa_price_per_1000,
+                    tape_price_per_roll, tape_length_per_roll, tape_pattern,
+                    hotmelt_price_per_kg, hotmelt_usage):
+    """
+    Berechnet alle Zuschnitt-, Kleber- und Vergleichsspalten in einem Durchlauf
+
+    Jeder Parameter darf ein Skalar oder ein Array sein; es gelten die
+    NumPy-Broadcasting-Regeln. Rückgabe ist ein dict mit einem Array je Spalte.
+    """
+    L = np.asarray(length, dtype=float)
+    B = np.asarray(width, dtype=float)
+    H = np.asarray(height, dtype=float)
+    t = np.asarray(material_thickness, dtype=float)
+
+    rsc_blank = rsc_blank_dimensions(L, B, H, t)
+    wa_blank = wraparound_blank_dimensions(L, B, H, t)
+    rsc_tape = tape_cost_rsc(L, B, H, np.asarray(tape_price_per_roll, dtype=float),
+                             np.asarray(tape_length_per_roll, dtype=float),
+                             is_h_pattern(tape_pattern))
+    rsc_hotmelt = hotmelt_cost_rsc(L, B, H, np.asarray(hotmelt_price_per_kg, dtype=float),
+                                   np.asarray(hotmelt_usage, dtype=float))
+    wa_hotmelt = hotmelt_cost_wa(L, B, H, np.asarray(hotmelt_price_per_kg, dtype=float),
+                                 np.asarray(hotmelt_usage, dtype=float))
+
+    # Materialkosten pro Box
+    rsc_material_cost = np.asarray(rsc_price_per_1000, dtype=float) / 1000
+    wa_material_cost = np.asarray(wa_price_per_1000, dtype=float) / 1000
+
+    # Gesamtkosten pro Box
+    rsc_total_cost_tape = rsc_material_cost + rsc_tape['cost_per_box']
+    rsc_total_cost_hotmelt = rsc_material_cost + rsc_hotmelt['cost_per_box']
+    wa_total_cost = wa_material_cost + wa_hotmelt['cost_per_box']
+
+    # Einsparungen RSC (Tape) vs. Wrap-Around
+    area_savings_pct = ((rsc_blank['area_m2'] - wa_blank['area_m2']) / rsc_blank['area_m2']) * 100
+    cost_diff_per_box = rsc_total_cost_tape - wa_total_cost
+    cost_diff_pct = (cost_diff_per_box / rsc_total_cost_tape) * 100
+
+    columns = {
+        'rsc_blank_length': rsc_blank['blank_length'],
+        'rsc_blank_width': rsc_blank['blank_width'],
+        'rsc_area_m2': rsc_blank['area_m2'],
+        'wa_blank_length': wa_blank['blank_length'],
+        'wa_blank_width': wa_blank['blank_width'],
+        'wa_area_m2': wa_blank['area_m2'],
+        'rsc_tape_length_m': rsc_tape['tape_length_m'],
+        'rsc_tape_cost': rsc_tape['cost_per_box'],
+        'rsc_hotmelt_seam_length_m': rsc_hotmelt['seam_length_m'],
+        'rsc_hotmelt_kg': rsc_hotmelt['hotmelt_kg'],
+        'rsc_hotmelt_cost': rsc_hotmelt['cost_per_box'],
+        'wa_seam_length_m': wa_hotmelt['seam_length_m'],
+        'wa_hotmelt_kg': wa_hotmelt['hotmelt_kg'],
+        'wa_hotmelt_cost': wa_hotmelt['cost_per_box'],
+        'rsc_material_cost': rsc_material_cost,
+        'wa_material_cost': wa_material_cost,
+        'rsc_total_cost_tape': rsc_total_cost_tape,
+        'rsc_total_cost_hotmelt': rsc_total_cost_hotmelt,
+        'wa_total_cost': wa_total_cost,
+        'area_savings_pct': area_savings_pct,
+        'cost_diff_per_box': cost_diff_per_box,
+        'cost_diff_pct': cost_diff_pct,
+    }
+
+    # Alle Spalten auf gemeinsame Länge bringen (Skalar-Parameter broadcasten)
+    shape = np.broadcast_shapes(*(np.shape(v) for v in columns.values()))
+    return {name: np.broadcast_to(values, shape) for name, values in columns.items()}
+
+
+def calculate_batch_frame(df, **defaults):
+    """
+    Batch-Berechnung für einen pandas DataFrame mit Spalten aus INPUT_COLUMNS
+
+    Fehlende Spalten werden aus ``defaults`` ergänzt (z.B. ein einheitlicher
+    Hotmelt-Preis für den ganzen Katalog). Gibt eine Kopie von ``df`` mit
+    angehängten Ergebnisspalten zurück.
+    """
+    params = {}
+    for name in INPUT_COLUMNS:
+        if name in df.columns:
+            params[name] = df[name].to_numpy()
+        elif name in defaults:
+            params[name] = defaults[name]
+        else:
+            raise KeyError(f"Spalte '{name}' fehlt und hat keinen Standardwert")
+
+    results = calculate_batch(**params)
+    return df.assign(**{name: np.broadcast_to(values, (len(df),))
+                        for name, values in results.items()})
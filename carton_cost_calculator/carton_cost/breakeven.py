@@ -0,0 +1,88 @@
+"""
+Break-even der Umstellung von RSC auf Wrap-Around inklusive Fixkosten
+
+Wrap-Around spart je Box cost_diff_per_box, verlangt aber eine Investition
+(WA-Aufrichter statt RSC-Aufrichter/Verschließer, Formatwerkzeuge) und hat je
+Auftrag andere Rüstkosten. Bei fester Losgröße werden die Rüstkosten auf die
+Box umgelegt; Break-even und Amortisation sind dann geschlossen lösbar:
+
+    Nettoersparnis je Box   s  = cost_diff_per_box − (Rüsten WA − Rüsten RSC) / Losgröße
+    Investition             F  = Maschine WA − Maschine RSC + Werkzeuge
+    Break-even-Menge        V* = F / s            (nur für s > 0, sonst unendlich)
+    Amortisation            T  = V* / Jahresmenge × 12 Monate
+
+Alle Funktionen rechnen elementweise mit NumPy-Broadcasting. break_even_grid
+holt die Ersparnis über sensitivity.evaluate für ein ganzes 2D-Raster in einem
+Aufruf, eine Heatmap braucht daher nur Millisekunden.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .sensitivity import heatmap
+
+
+class FixedCosts(NamedTuple):
+    """Fixkosten der Umstellung in € und Mengenannahmen in Boxen"""
+    wa_machine_cost: float = 180_000.0     # Wrap-Around-Aufrichter
+    rsc_machine_cost: float = 45_000.0     # RSC-Aufrichter mit Tape-Verschließer (entfällt bei Umstellung)
+    tooling_cost: float = 8_000.0          # Formatwerkzeuge für das WA-Maß
+    wa_changeover_cost: float = 120.0      # Rüstkosten je Auftrag WA
+    rsc_changeover_cost: float = 40.0      # Rüstkosten je Auftrag RSC
+    run_size: float = 20_000.0             # Boxen je Auftrag
+    annual_volume: float = 1_000_000.0     # Boxen je Jahr
+
+    @property
+    def investment(self):
+        return self.wa_machine_cost - self.rsc_machine_cost + self.tooling_cost
+
+    @property
+    def changeover_per_box(self):
+        return (self.wa_changeover_cost - self.rsc_changeover_cost) / self.run_size
+
+
+def _validate(costs):
+    if costs.run_size <= 0 or costs.annual_volume <= 0:
+        raise ValueError("Losgröße und Jahresmenge müssen größer als 0 sein")
+
+
+def net_savings(cost_diff_per_box, volume, costs=FixedCosts()):
+    """Kumulierte Ersparnis nach Abzug von Investition und Rüstkosten bei gegebener Menge"""
+    _validate(costs)
+    s = np.asarray(cost_diff_per_box, dtype=float) - costs.changeover_per_box
+    return np.asarray(volume, dtype=float) * s - costs.investment
+
+
+def break_even(cost_diff_per_box, costs=FixedCosts()):
+    """
+    Break-even-Menge und Amortisationsdauer (Skalare oder Arrays)
+
+    Rückgabe: dict mit net_savings_per_box, break_even_volume (Boxen),
+    payback_months und annual_net_savings (€/Jahr nach Rüstkosten). Ohne
+    positive Nettoersparnis sind Menge und Dauer unendlich; ist die
+    Investition nicht positiv, amortisiert sich die Umstellung sofort (0).
+    """
+    _validate(costs)
+    s = np.asarray(cost_diff_per_box, dtype=float) - costs.changeover_per_box
+    investment = costs.investment
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume = np.where(s > 0, np.maximum(investment, 0.0) / s, np.inf)
+    if investment <= 0:
+        volume = np.where(s >= 0, 0.0, volume)
+    return {
+        'net_savings_per_box': s,
+        'break_even_volume': volume,
+        'payback_months': volume / costs.annual_volume * 12,
+        'annual_net_savings': s * costs.annual_volume,
+    }
+
+
+def break_even_grid(inputs, costs=FixedCosts(), x='length', y='width', points=41):
+    """
+    Break-even über ein 2D-Raster zweier Eingabeparameter, übrige Parameter aus inputs
+
+    Rückgabe: (x-Stufen, y-Stufen, dict wie break_even mit Arrays [y, x])
+    """
+    x_levels, y_levels, cost_diff = heatmap(inputs, x, y, 'cost_diff_per_box', points)
+    return x_levels, y_levels, break_even(cost_diff, costs)
@@ -0,0 +1,130 @@
+"""
+Einzelwert-Berechnungen für einen Karton
+
+Dünne Wrapper um die elementweisen Formeln in formulas.py sowie die
+Gesamtberechnung eines Angebots (calculate_quote), wie sie app.py anzeigt.
+"""
+
+from typing import NamedTuple
+
+from . import formulas
+
+# Stand der Formeln; bei jeder Änderung, die Ergebnisse von calculate_quote
+# verändert, erhöhen (gespeicherte Angebote älterer Stände werden verworfen)
+FORMULA_VERSION = 1
+
+
+class QuoteInputs(NamedTuple):
+    """Normalisierte Eingabeparameter eines Angebots (hashbar, als Cache-Schlüssel geeignet)"""
+    length: float
+    width: float
+    height: float
+    material_thickness: float
+    rsc_price_per_1000: float
+    wa_price_per_1000: float
+    tape_price_per_roll: float
+    tape_length_per_roll: float
+    tape_pattern: str
+    hotmelt_price_per_kg: float
+    hotmelt_usage: float
+
+
+def normalize_inputs(length, width, height, material_thickness,
+                     rsc_price_per_1000, wa_price_per_1000,
+                     tape_price_per_roll, tape_length_per_roll, tape_pattern,
+                     hotmelt_price_per_kg, hotmelt_usage):
+    """
+    Bringt die Eingaben in eine kanonische Form
+    Zahlen werden zu float, damit z.B. 400 und 400.0 denselben Schlüssel ergeben.
+    """
+    return QuoteInputs(
+        float(length), float(width), float(height), float(material_thickness),
+        float(rsc_price_per_1000), float(wa_price_per_1000),
+        float(tape_price_per_roll), float(tape_length_per_roll),
+        formulas.TAPE_PATTERN_H if formulas.is_h_pattern(tape_pattern) else formulas.TAPE_PATTERN_SIMPLE,
+        float(hotmelt_price_per_kg), float(hotmelt_usage),
+    )
+
+
+def calculate_rsc_blank_dimensions(L, B, H, t):
+    """
+    Berechnet die RSC-Zuschnittmaße
+    L = Länge (innen), B = Breite (innen), H = Höhe
+    t = Materialstärke
+    """
+    return formulas.rsc_blank_dimensions(L, B, H, t)
+
+
+def calculate_wraparound_blank_dimensions(L, B, H, t):
+    """
+    Berechnet die Wrap-Around-Zuschnittmaße
+    """
+    return formulas.wraparound_blank_dimensions(L, B, H, t)
+
+
+def calculate_tape_cost_rsc(L, B, H, tape_price, tape_length_roll, pattern):
+    """
+    Berechnet Klebeband-Kosten für RSC
+    """
+    return formulas.tape_cost_rsc(L, B, H, tape_price, tape_length_roll, formulas.is_h_pattern(pattern))
+
+
+def calculate_hotmelt_cost_wa(L, B, H, hotmelt_price_kg, hotmelt_usage_g_per_m):
+    """
+    Berechnet Hotmelt-Kosten für Wrap-Around
+    3 Klebestellen: beide Enden + Längsnaht
+    """
+    return formulas.hotmelt_cost_wa(L, B, H, hotmelt_price_kg, hotmelt_usage_g_per_m)
+
+
+def calculate_hotmelt_cost_rsc(L, B, H, hotmelt_price_kg, hotmelt_usage_g_per_m):
+    """
+    Berechnet Hotmelt-Kosten für RSC (alternative zu Tape)
+    Herstellernaht + Klappenverschluss
+    """
+    return formulas.hotmelt_cost_rsc(L, B, H, hotmelt_price_kg, hotmelt_usage_g_per_m)
+
+
+def calculate_quote(length, width, height, material_thickness,
+                    rsc_price_per_1000, wa_price_per_1000,
+                    tape_price_per_roll, tape_length_per_roll, tape_pattern,
+                    hotmelt_price_per_kg, hotmelt_usage):
+    """
+    Berechnet den vollständigen RSC-vs.-Wrap-Around-Vergleich für einen Karton
+    """
+    rsc_blank = calculate_rsc_blank_dimensions(length, width, height, material_thickness)
+    wa_blank = calculate_wraparound_blank_dimensions(length, width, height, material_thickness)
+
+    rsc_tape_cost = calculate_tape_cost_rsc(length, width, height, tape_price_per_roll, tape_length_per_roll, tape_pattern)
+    rsc_hotmelt_cost = calculate_hotmelt_cost_rsc(length, width, height, hotmelt_price_per_kg, hotmelt_usage)
+    wa_hotmelt_cost = calculate_hotmelt_cost_wa(length, width, height, hotmelt_price_per_kg, hotmelt_usage)
+
+    # Materialkosten pro Box
+    rsc_material_cost = rsc_price_per_1000 / 1000
+    wa_material_cost = wa_price_per_1000 / 1000
+
+    # Gesamtkosten pro Box (RSC mit Tape, RSC mit Hotmelt, Wrap-Around mit Hotmelt)
+    rsc_total_cost_tape = rsc_material_cost + rsc_tape_cost['cost_per_box']
+    rsc_total_cost_hotmelt = rsc_material_cost + rsc_hotmelt_cost['cost_per_box']
+    wa_total_cost = wa_material_cost + wa_hotmelt_cost['cost_per_box']
+
+    # Einsparungen
+    area_savings_pct = ((rsc_blank['area_m2'] - wa_blank['area_m2']) / rsc_blank['area_m2']) * 100
+    cost_diff_per_box = rsc_total_cost_tape - wa_total_cost
+    cost_diff_pct = (cost_diff_per_box / rsc_total_cost_tape) * 100
+
+    return {
+        'rsc_blank': rsc_blank,
+        'wa_blank': wa_blank,
+        'rsc_tape_cost': rsc_tape_cost,
+        'rsc_hotmelt_cost': rsc_hotmelt_cost,
+        'wa_hotmelt_cost': wa_hotmelt_cost,
+        'rsc_material_cost': rsc_material_cost,
+        'wa_material_cost': wa_material_cost,
+        'rsc_total_cost_tape': rsc_total_cost_tape,
+        'rsc_total_cost_hotmelt': rsc_total_cost_hotmelt,
+        'wa_total_cost': wa_total_cost,
+        'area_savings_pct': area_savings_pct,
+        'cost_diff_per_box': cost_diff_per_box,
+        'cost_diff_pct': cost_diff_pct,
+    }
@@ -0,0 +1,157 @@
+"""
+Kataloge: Spalten normalisieren, berechnen und seitenweise ausliefern
+
+cost_catalog ist der gemeinsame Berechnungsschritt für bulk_quote.py und den
+Katalog-Upload der App. ResultGrid hält das Ergebnis als spaltenorientierte
+Arrow-Tabelle auf dem Server; Filter und Sortierung laufen dort über
+pyarrow.compute und liefern nur Zeilenindizes, an den Browser geht mit
+page() nur die sichtbare Seite als kleiner DataFrame.
+"""
+
+import csv
+import io
+import threading
+from collections import OrderedDict
+
+from .batch import calculate_batch_frame
+from .options import BEAD_OPTIONS, FLUTE_THICKNESS
+
+# Raupenbreite -> Verbrauch in g/m
+BEAD_USAGE = {width: usage for _, width, usage in BEAD_OPTIONS}
+# Filteroperatoren: Spalte op Wert
+FILTER_OPERATORS = ('>=', '<=', '==', 'enthält')
+# Anzahl zwischengespeicherter Filter-/Sortierkombinationen je Ergebnis
+VIEW_CACHE_SIZE = 8
+
+
+def cost_catalog(df, defaults, pricing=None):
+    """
+    Berechnet einen Katalog-DataFrame (auch blockweise im Prozesspool)
+
+    Erkennt ``flute`` (B, C, E, BC) statt ``material_thickness`` und
+    ``hotmelt_bead_width`` (mm) statt ``hotmelt_usage``; fehlende Spalten
+    kommen aus defaults. pricing: optional (PriceMatrix, Qualität, Auflage)
+    für flächenbasierte Materialpreise, Spalten ``grade`` und ``quantity``
+    haben Vorrang.
+    """
+    if 'flute' in df.columns and 'material_thickness' not in df.columns:
+        df = df.assign(material_thickness=df['flute'].astype(str).str.upper().map(FLUTE_THICKNESS))
+        if df['material_thickness'].isna().any():
+            raise ValueError(f"Unbekannte Welle in Spalte 'flute' (erlaubt: {', '.join(FLUTE_THICKNESS)})")
+    if 'hotmelt_bead_width' in df.columns and 'hotmelt_usage' not in df.columns:
+        df = df.assign(hotmelt_usage=df['hotmelt_bead_width'].astype(float).map(BEAD_USAGE))
+        if df['hotmelt_usage'].isna().any():
+            raise ValueError(f"Unbekannte Raupenbreite (erlaubt: {', '.join(map(str, BEAD_USAGE))} mm)")
+    if pricing is not None:
+        matrix, grade, quantity = pricing
+        dims = [df[name].to_numpy() if name in df.columns else defaults[name]
+                for name in ('length', 'width', 'height', 'material_thickness')]
+        df = df.assign(**matrix.box_prices_per_1000(
+            df['grade'].astype(str).to_numpy() if 'grade' in df.columns else grade, *dims,
+            df['quantity'].to_numpy() if 'quantity' in df.columns else quantity))
+    return calculate_batch_frame(df, **defaults)
+
+
+def read_catalog(data, filename):
+    """
+    Liest einen hochgeladenen Katalog (Bytes) als DataFrame
+
+    Excel (.xlsx/.xls): erstes Arbeitsblatt. CSV: Trennzeichen , ; oder Tab
+    werden erkannt; bei Semikolon gilt das Dezimalkomma (deutscher Excel-Export).
+    """
+    import pandas as pd
+
+    if filename.lower().endswith(('.xlsx', '.xls')):
+        return pd.read_excel(io.BytesIO(data))
+    sample = data[:4096].decode('utf-8-sig', errors='ignore')
+    try:
+        delimiter = csv.Sniffer().sniff(sample, delimiters=',;\t').delimiter
+    except csv.Error:
+        delimiter = ','
+    return pd.read_csv(io.BytesIO(data), sep=delimiter, decimal=',' if delimiter == ';' else '.',
+                       encoding='utf-8-sig')
+
+
+class ResultGrid:
+    """Server-seitiger Ergebnispuffer mit Filter, Sortierung und Seitenabruf"""
+
+    def __init__(self, df):
+        import pyarrow as pa
+
+        self.table = pa.Table.from_pandas(df, preserve_index=False)
+        # Eine Instanz wird über st.cache_resource von allen Sitzungen geteilt
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.table.num_rows
+
+    @property
+    def columns(self):
+        return self.table.column_names
+
+    @property
+    def numeric_columns(self):
+        import pyarrow as pa
+
+        return [field.name for field in self.table.schema
+                if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)]
+
+    def _mask(self, column, op, value):
+        import pyarrow.compute as pc
+
+        values = self.table.column(column)
+        if op == 'enthält':
+            return pc.match_substring(pc.cast(values, 'string'), str(value), ignore_case=True)
+        if op not in FILTER_OPERATORS:
+            raise ValueError(f"Unbekannter Filter '{op}' (erwartet: {', '.join(FILTER_OPERATORS)})")
+        compare = {'>=': pc.greater_equal, '<=': pc.less_equal, '==': pc.equal}[op]
+        return compare(values, value)
+
+    def view(self, filters=(), sort_by=None, descending=False):
+        """
+        Zeilenindizes nach Filtern und Sortierung (zwischengespeichert je Kombination)
+
+        filters: Folge von (Spalte, Operator, Wert), alle müssen zutreffen.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        key = (tuple(map(tuple, filters)), sort_by, descending)
+        with self._lock:
+            if key in self._views:
+                self._views.move_to_end(key)
+                return self._views[key]
+
+        for column in [column for column, _, _ in filters] + ([sort_by] if sort_by else []):
+            if column not in self.columns:
+                raise ValueError(f"Unbekannte Spalte '{column}'")
+        indices = pa.array(range(len(self)), type=pa.int64())
+        if filters:
+            mask = self._mask(*filters[0])
+            for condition in filters[1:]:
+                mask = pc.and_kleene(mask, self._mask(*condition))
+            indices = pc.filter(indices, mask, null_selection_behavior='drop')
+        if sort_by:
+            order = pc.array_sort_indices(self.table.column(sort_by).take(indices),
+                                          order='descending' if descending else 'ascending')
+            indices = indices.take(order)
+
+        # Berechnung außerhalb der Sperre; rechnen zwei Sitzungen dieselbe Ansicht, gewinnt die letzte
+        with self._lock:
+            self._views[key] = indices
+            if len(self._views) > VIEW_CACHE_SIZE:
+                self._views.popitem(last=False)
+        return indices
+
+    def page(self, number, size, filters=(), sort_by=None, descending=False):
+        """Seite number (ab 0) mit size Zeilen als DataFrame; Rückgabe: (DataFrame, Trefferzahl)"""
+        indices = self.view(filters, sort_by, descending)
+        start = max(0, number) * size
+        return self.table.take(indices[start:start + size]).to_pandas(), len(indices)
+
+    def frames(self, filters=(), sort_by=None, descending=False, chunk_rows=50_000):
+        """Ganze Ansicht blockweise als DataFrames (für den Export)"""
+        indices = self.view(filters, sort_by, descending)
+        for start in range(0, len(indices), chunk_rows):
+            yield self.table.take(indices[start:start + chunk_rows]).to_pandas()
@@ -0,0 +1,126 @@
+"""
+Blockweiser Export großer Ergebnisse in konstantem Speicher
+
+FrameWriter nimmt DataFrame-Blöcke entgegen und schreibt sie sofort weg; im
+Speicher liegt nie mehr als der aktuelle Block. Formate:
+
+- csv:     pyarrow CSVWriter
+- parquet: pyarrow ParquetWriter (eine Row Group je Block)
+- arrow:   Arrow IPC (Dateiformat, per Memory-Map lesbar)
+- xlsx:    xlsxwriter im constant_memory-Modus: jede Zeile wird beim Wechsel
+           zur nächsten in eine temporäre Datei geschrieben. Ab 1.048.576
+           Zeilen (Excel-Grenze) wird auf ein weiteres Arbeitsblatt umgebrochen.
+
+Spaltennamen und -typen legt der erste Block fest; spätere Blöcke werden
+darauf gecastet (bei CSV-Eingaben können z.B. int und float wechseln). Ohne
+einen einzigen Block entsteht in jedem Format eine leere Datei mit Kopfzeile
+bzw. Schema aus columns (Textspalten).
+"""
+
+from pathlib import Path
+
+EXPORT_FORMATS = ('csv', 'parquet', 'arrow', 'xlsx')
+# Zeilen je Arbeitsblatt inklusive Kopfzeile
+XLSX_MAX_ROWS = 1_048_576
+XLSX_SHEET_NAME = 'Ergebnis'
+XLSX_ROWS_PER_SLICE = 10_000
+
+
+def export_format(path, explicit=None):
+    """Exportformat aus der Dateiendung (.feather/.ipc gelten als Arrow IPC)"""
+    fmt = explicit or Path(path).suffix.lower().lstrip('.')
+    fmt = 'arrow' if fmt in ('feather', 'ipc') else fmt
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unbekanntes Dateiformat '{fmt}' (erwartet {', '.join(EXPORT_FORMATS)})")
+    return fmt
+
+
+class FrameWriter:
+    """
+    Schreibt DataFrames blockweise in eine Datei (Pfad oder binäres Dateiobjekt)
+
+    columns: Spaltennamen für die leere Datei, falls kein Block geschrieben wird
+    """
+
+    def __init__(self, target, fmt, columns=()):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unbekanntes Dateiformat '{fmt}' (erwartet {', '.join(EXPORT_FORMATS)})")
+        self.target = target
+        self.fmt = fmt
+        self.columns = list(columns)
+        self.rows = 0
+        self._writer = self._schema = None
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, df):
+        if self.fmt == 'xlsx':
+            self._write_xlsx(df)
+        else:
+            self._write_arrow(df)
+        self.rows += len(df)
+
+    def _write_arrow(self, df):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            if self.fmt == 'csv':
+                import pyarrow.csv as pa_csv
+                self._writer = pa_csv.CSVWriter(self.target, self._schema)
+            elif self.fmt == 'parquet':
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.target, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.target, self._schema)
+        else:
+            table = table.cast(self._schema)
+        self._writer.write_table(table)
+
+    def _write_xlsx(self, df):
+        if self._writer is None:
+            import xlsxwriter
+
+            self._writer = xlsxwriter.Workbook(self.target, {'constant_memory': True, 'nan_inf_to_errors': True})
+            self._schema = list(df.columns)
+            self._sheet, self._sheet_row = None, XLSX_MAX_ROWS
+        # tolist() liefert Python-Skalare, die xlsxwriter ohne Umweg über str schreibt; in
+        # Teilblöcken, damit nicht der ganze Block als Python-Objekte im Speicher liegt
+        for start in range(0, len(df), XLSX_ROWS_PER_SLICE):
+            part = df.iloc[start:start + XLSX_ROWS_PER_SLICE]
+            for values in zip(*(part[column].tolist() for column in self._schema)):
+                if self._sheet_row == XLSX_MAX_ROWS:
+                    number = len(self._writer.worksheets()) + 1
+                    self._sheet = self._writer.add_worksheet(XLSX_SHEET_NAME if number == 1
+                                                             else f'{XLSX_SHEET_NAME} {number}')
+                    self._sheet.write_row(0, 0, self._schema)
+                    self._sheet_row = 1
+                self._sheet.write_row(self._sheet_row, 0, values)
+                self._sheet_row += 1
+
+    def close(self):
+        if self._closed:
+            return
+        if self._writer is None:
+            # Kein Block: leere Datei mit Kopfzeile bzw. Schema, in allen Formaten gleich
+            import pandas as pd
+
+            self.write(pd.DataFrame({name: pd.Series(dtype='string') for name in self.columns}))
+        if self.fmt == 'xlsx' and not self._writer.worksheets():
+            self._writer.add_worksheet(XLSX_SHEET_NAME).write_row(0, 0, self._schema)
+        self._writer.close()
+        self._writer, self._closed = None, True
+
+
+def write_frames(frames, target, fmt, columns=()):
+    """Schreibt eine Folge von DataFrames; Rückgabe: Anzahl Zeilen (columns: siehe FrameWriter)"""
+    with FrameWriter(target, fmt, columns) as writer:
+        for df in frames:
+            writer.write(df)
+    return writer.rows
@@ -0,0 +1,139 @@
+"""
+Elementweise Zuschnitt- und Kleberformeln
+
+Alle Formeln akzeptieren Skalare ebenso wie NumPy-Arrays bzw. pandas-Spalten.
+NumPy wird nur geladen, wenn tatsächlich Arrays verzweigt werden müssen, damit
+der Einzelwert-Pfad ohne schwere Abhängigkeiten importierbar bleibt.
+"""
+
+TAPE_PATTERN_H = "H-Muster (empfohlen)"
+TAPE_PATTERN_SIMPLE = "Einfach"
+
+
+def _select(condition, if_true, if_false):
+    """Skalar-Verzweigung bzw. np.where für Arrays"""
+    if getattr(condition, 'ndim', 0) == 0:
+        return if_true if condition else if_false
+    import numpy as np
+    return np.where(condition, if_true, if_false)
+
+
+def is_h_pattern(pattern):
+    """
+    Wandelt das Verschlussmuster in ein bool (bzw. bool-Array) um
+    Akzeptiert die Bezeichnungen aus der Sidebar oder bereits boolesche Werte.
+    """
+    if isinstance(pattern, str):
+        return pattern == TAPE_PATTERN_H
+    # Listen und Tupel wie Arrays behandeln (bool([...]) wäre immer True)
+    if getattr(pattern, 'ndim', 0) == 0 and not isinstance(pattern, (list, tuple)):
+        return bool(pattern)
+    import numpy as np
+    pattern = np.asarray(pattern)
+    if pattern.dtype == bool:
+        return pattern
+    return pattern == TAPE_PATTERN_H
+
+
+def rsc_blank_dimensions(L, B, H, t):
+    """
+    RSC-Zuschnittmaße (FEFCO 0201), elementweise
+    L = Länge (innen), B = Breite (innen), H = Höhe, t = Materialstärke
+    """
+    manufacturer_flap = 25  # mm
+    trim_allowance = 20  # mm
+
+    # Bogenlänge = 2L + 2B + 4t + Klebelasche + Verschnitt
+    blank_length = 2 * L + 2 * B + 4 * t + manufacturer_flap + trim_allowance
+
+    # Bogenbreite = B + 2H + 4t + Verschnitt
+    blank_width = B + 2 * H + 4 * t + trim_allowance
+
+    # Fläche in m²
+    area_m2 = (blank_length / 1000) * (blank_width / 1000)
+
+    return {
+        'blank_length': blank_length,
+        'blank_width': blank_width,
+        'area_m2': area_m2
+    }
+
+
+def wraparound_blank_dimensions(L, B, H, t):
+    """
+    Wrap-Around-Zuschnittmaße (FEFCO 0409), elementweise
+    """
+    overlap = 75  # mm Standard-Überlappung
+
+    # Bogenlänge = 2L + 2B + Überlappung
+    blank_length = 2 * L + 2 * B + overlap
+
+    # Bogenbreite = B + 2H
+    blank_width = B + 2 * H
+
+    # Fläche in m²
+    area_m2 = (blank_length / 1000) * (blank_width / 1000)
+
+    return {
+        'blank_length': blank_length,
+        'blank_width': blank_width,
+        'area_m2': area_m2
+    }
+
+
+def tape_cost_rsc(L, B, H, tape_price, tape_length_roll, h_pattern):
+    """
+    Klebeband-Kosten für RSC, elementweise
+    h_pattern = True für H-Muster, False für einfaches Muster
+    """
+    # H-Muster: L + 2B + Überstand pro Seite, Einfach: B + Überstand
+    tape_per_box = _select(h_pattern, (L + 2 * B + 150) / 1000, (B + 100) / 1000)  # in Meter
+    tape_per_box = tape_per_box * 2  # Oben und unten
+
+    cost_per_meter = tape_price / tape_length_roll
+    cost_per_box = tape_per_box * cost_per_meter
+
+    return {
+        'tape_length_m': tape_per_box,
+        'cost_per_box': cost_per_box
+    }
+
+
+def hotmelt_cost_wa(L, B, H, hotmelt_price_kg, hotmelt_usage_g_per_m):
+    """
+    Hotmelt-Kosten für Wrap-Around, elementweise
+    3 Klebestellen: beide Enden + Längsnaht
+    """
+    # Längsnaht entlang der Höhe + beide Enden
+    total_seam_length = H / 1000 + (2 * (L + B)) / 1000  # m
+
+    # Hotmelt-Verbrauch in kg
+    hotmelt_kg = (total_seam_length * hotmelt_usage_g_per_m) / 1000
+
+    cost_per_box = hotmelt_kg * hotmelt_price_kg
+
+    return {
+        'seam_length_m': total_seam_length,
+        'hotmelt_kg': hotmelt_kg,
+        'cost_per_box': cost_per_box
+    }
+
+
+def hotmelt_cost_rsc(L, B, H, hotmelt_price_kg, hotmelt_usage_g_per_m):
+    """
+    Hotmelt-Kosten für RSC (Alternative zu Tape), elementweise
+    Herstellernaht + Klappenverschluss
+    """
+    # Herstellernaht + Klappenverschluss (H-Muster, oben und unten)
+    total_seam_length = H / 1000 + 2 * (B + B) / 1000  # m
+
+    # Hotmelt-Verbrauch in kg
+    hotmelt_kg = (total_seam_length * hotmelt_usage_g_per_m) / 1000
+
+    cost_per_box = hotmelt_kg * hotmelt_price_kg
+
+    return {
+        'seam_length_m': total_seam_length,
+        'hotmelt_kg': hotmelt_kg,
+        'cost_per_box': cost_per_box
+    }
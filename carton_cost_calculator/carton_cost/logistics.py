@@ -0,0 +1,165 @@
+"""
+Ladeplanung: Zuschnitte pro Palette und Frachtkosten pro Box
+
+RSC-Kartons werden vorgeklebt und einmal gefaltet angeliefert (halbe
+Bogenlänge, doppelte Materialstärke), Wrap-Around-Zuschnitte komplett flach.
+Für beide wird das beste Lagenbild auf der Palette gesucht, daraus die
+Stapelhöhe, die Paletten pro Auftrag, die Paletten pro LKW und die Fracht
+pro Box abgeleitet.
+
+Lagenbilder werden per Guillotine-Rekursion über die Normalmaße (Kombinationen
+aus Stücklänge und -breite) gesucht, die LKW-Belegung als Reihenbeladung.
+Beide Suchen werden je Stück- bzw. Palettenmaß gemerkt; ein Katalog mit
+wiederkehrenden Zuschnittmaßen sucht jedes Maß nur einmal.
+"""
+
+import math
+from bisect import bisect_right
+from functools import lru_cache
+from typing import NamedTuple
+
+
+# Palettentyp: Bezeichnung -> (Länge, Breite) in mm
+PALLET_TYPES = {
+    "Europalette (1200×800)": (1200, 800),
+    "Industriepalette (1200×1000)": (1200, 1000),
+}
+
+
+class LoadSpec(NamedTuple):
+    """Paletten- und LKW-Daten (Standard: Europalette, Sattelzug)"""
+    pallet_length: float = 1200
+    pallet_width: float = 800
+    pallet_height: float = 144
+    max_load_height: float = 1800   # Gesamthöhe inkl. Palette in mm
+    max_pallet_weight: float = 1000  # kg Ladung je Palette
+    overhang: float = 0              # zulässiger Überstand je Seite in mm
+    truck_length: float = 13600
+    truck_width: float = 2450
+    truck_max_weight: float = 24000  # kg
+    truck_cost: float = 1200.0       # € je Komplettladung
+    board_grammage: float = 0.6      # kg/m² Wellpappe (typischer Mittelwert)
+
+
+class LoadPlan(NamedTuple):
+    """Ergebnis der Ladeplanung für eine Bauart"""
+    piece_length: float       # mm, Maß des angelieferten Stücks
+    piece_width: float
+    piece_thickness: float
+    per_layer: int
+    layers: int
+    per_pallet: int
+    custom_pallet: bool       # Stück passt nicht auf die Palette: Sonderpalette nach Stückmaß
+    pallets: int              # Paletten für die Auftragsmenge
+    pallets_per_truck: int
+    freight_per_box: float    # €, Fracht anteilig je Palettenstellplatz
+
+
+def _normal_set(a, b, limit):
+    """Alle Längen i·a + j·b ≤ limit (mögliche Schnittpositionen eines Lagenbilds)"""
+    values = set()
+    for i in range(limit // a + 1):
+        rest = limit - i * a
+        values.update(i * a + j * b for j in range(rest // b + 1))
+    return sorted(values)
+
+
+@lru_cache(maxsize=4096)
+def layer_pattern(piece_length, piece_width, area_length, area_width):
+    """
+    Höchstzahl gleicher Rechtecke auf einer Fläche (beide Ausrichtungen, Guillotine-Schnitte)
+
+    Maße in ganzen Millimetern; Stückmaße werden aufgerundet, die Fläche abgerundet.
+    """
+    a, b = math.ceil(piece_length), math.ceil(piece_width)
+    length, width = int(area_length), int(area_width)
+    if min(a, b) <= 0:
+        raise ValueError("Stückmaße müssen größer als 0 sein")
+    xs, ys = _normal_set(a, b, length), _normal_set(a, b, width)
+    memo = {}
+
+    def best(x, y):
+        if (x, y) in memo:
+            return memo[x, y]
+        value = max((x // a) * (y // b), (x // b) * (y // a))
+        for cut in xs[1:]:
+            if cut > x // 2:
+                break
+            value = max(value, best(cut, y) + best(xs[bisect_right(xs, x - cut) - 1], y))
+        for cut in ys[1:]:
+            if cut > y // 2:
+                break
+            value = max(value, best(x, cut) + best(x, ys[bisect_right(ys, y - cut) - 1]))
+        memo[x, y] = value
+        return value
+
+    return best(xs[-1], ys[-1])
+
+
+@lru_cache(maxsize=4096)
+def truck_pattern(pallet_length, pallet_width, truck_length, truck_width):
+    """
+    Paletten pro LKW bei Reihenbeladung (wie mit dem Stapler üblich)
+
+    Jede Reihe über die Ladebreite ist entweder quer (Tiefe = kurze Seite)
+    oder längs (Tiefe = lange Seite, ggf. mit quer gestellten Paletten
+    hintereinander); die Reihenfolge über die Ladelänge ist ein 1D-Rucksack.
+    """
+    long_side = math.ceil(max(pallet_length, pallet_width))
+    short_side = math.ceil(min(pallet_length, pallet_width))
+    length, width = int(truck_length), int(truck_width)
+    # Reihe der Tiefe long_side: i Paletten quer (je long_side // short_side hintereinander), Rest längs
+    deep_row = max(i * (long_side // short_side) + (width - i * long_side) // short_side
+                   for i in range(width // long_side + 1))
+    flat_row = width // long_side
+    return max(k * deep_row + ((length - k * long_side) // short_side) * flat_row
+               for k in range(length // long_side + 1))
+
+
+def plan_load(blank_length, blank_width, thickness, quantity, style, spec=LoadSpec()):
+    """
+    Ladeplanung für einen Zuschnitt
+
+    style: 'rsc' (vorgeklebt, gefaltet) oder 'wa' (flach)
+    thickness: Materialstärke der Wellpappe in mm
+    """
+    if style == 'rsc':
+        piece = (blank_length / 2, blank_width, 2 * thickness)
+    elif style == 'wa':
+        piece = (blank_length, blank_width, thickness)
+    else:
+        raise ValueError(f"Unbekannte Bauart '{style}' (erwartet: rsc, wa)")
+    piece_length, piece_width, piece_thickness = piece
+
+    per_layer = layer_pattern(piece_length, piece_width,
+                              spec.pallet_length + 2 * spec.overhang, spec.pallet_width + 2 * spec.overhang)
+    custom_pallet = per_layer == 0
+    if custom_pallet:
+        per_layer = 1
+        footprint = (math.ceil(max(piece_length, piece_width)), math.ceil(min(piece_length, piece_width)))
+    else:
+        footprint = (spec.pallet_length, spec.pallet_width)
+
+    piece_weight = blank_length * blank_width / 1e6 * spec.board_grammage
+    layers = int((spec.max_load_height - spec.pallet_height) // piece_thickness)
+    layers = min(layers, int(spec.max_pallet_weight // (per_layer * piece_weight)))
+    if layers < 1:
+        raise ValueError("Palettenhöhe bzw. -gewicht reicht nicht für eine Lage")
+    per_pallet = per_layer * layers
+
+    pallets_per_truck = truck_pattern(*footprint, spec.truck_length, spec.truck_width)
+    pallets_per_truck = min(pallets_per_truck, int(spec.truck_max_weight // (per_pallet * piece_weight)))
+    if pallets_per_truck < 1:
+        raise ValueError("Palette passt nicht auf die LKW-Ladefläche")
+
+    pallets = math.ceil(quantity / per_pallet)
+    freight_per_box = pallets * spec.truck_cost / pallets_per_truck / quantity
+    return LoadPlan(piece_length, piece_width, piece_thickness, per_layer, layers, per_pallet,
+                    custom_pallet, pallets, pallets_per_truck, freight_per_box)
+
+
+def plan_loads(blank_lengths, blank_widths, thicknesses, quantities, style, spec=LoadSpec()):
+    """Ladeplanung für einen ganzen Katalog; Ergebnis als dict mit einer Liste je LoadPlan-Feld"""
+    plans = [plan_load(length, width, thickness, quantity, style, spec)
+             for length, width, thickness, quantity in zip(blank_lengths, blank_widths, thicknesses, quantities)]
+    return {name: [getattr(plan, name) for plan in plans] for name in LoadPlan._fields}
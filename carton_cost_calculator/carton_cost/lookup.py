@@ -0,0 +1,246 @@
+"""
+Vorberechnete Kostentabellen mit Interpolation
+
+Legt über dem Raster Länge × Breite × Höhe × Welle dichte Tabellen als
+memory-mapped NumPy-Dateien (.npy) ab. Angebote werden dann per Indexzugriff
+und trilinearer Interpolation beantwortet, statt die Formeln auszuwerten.
+
+Zwei Ebenen:
+- Geometrie (Flächen, Tape- und Nahtlängen) hängt nur vom Raster ab und wird
+  einmal berechnet.
+- Kosten sind linear in Tape- und Nahtlänge. lookup() interpoliert daher nur
+  die Geometrie und wendet die Preise der jeweiligen Anfrage an: keine
+  Schreibzugriffe und keine Sperre je Anfrage, beliebige Preise parallel.
+  set_prices legt für einen festen Preisstand zusätzlich Kostentabellen ab,
+  die quote() ohne Preise liest.
+
+Fehlerschranke: Beim Aufbau wird die Interpolation an allen Zellmittelpunkten
+gegen calculate_batch geprüft; die größte Abweichung je Kennzahl steht in
+error_bound. Echte Schranken sind das nur für die Flächen und Kosten:
+
+- Flächen sind in jedem Maß höchstens quadratisch (gemischte Terme sind
+  bilinear und werden exakt interpoliert); der Fehler ist in Zellmitte maximal.
+- Kosten sind linear in Tape- und Nahtlänge und damit exakt, für alle
+  Preisparameter.
+- area_savings_pct ist ein Quotient zweier Flächen, sein Fehler kann auch
+  abseits der Zellmitte größer sein. Der Wert in error_bound ist nur eine
+  empirische Angabe aus der Mittelpunktprüfung (Standardraster: ca. 0,96
+  Prozentpunkte an den Mitten, bis ca. 1,0 an Zufallspunkten).
+"""
+
+import json
+import os
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import calculate_batch
+from .calculations import QuoteInputs
+from .formulas import TAPE_PATTERN_H, TAPE_PATTERN_SIMPLE, is_h_pattern
+from .options import DEFAULT_INPUTS, FLUTE_OPTIONS
+
+GEOMETRY_TABLES = ('rsc_area_m2', 'wa_area_m2', 'area_savings_pct',
+                   'tape_length_h_m', 'tape_length_simple_m', 'wa_seam_length_m')
+COST_TABLES = ('rsc_total_cost_tape', 'wa_total_cost', 'cost_diff_per_box')
+# Kennzahlen, die eine Abfrage liefert
+LOOKUP_METRICS = ('rsc_area_m2', 'wa_area_m2', 'area_savings_pct') + COST_TABLES
+# Alles außer den Rasterachsen (Maße und Welle) gilt als Preisparameter
+PRICE_FIELDS = QuoteInputs._fields[4:]
+
+
+class LookupGrid(NamedTuple):
+    """Rasterachsen: (Start, Ende, Schritt) in mm je Maß, Materialstärken der Wellen"""
+    length: tuple = (50, 2000, 50)
+    width: tuple = (50, 2000, 50)
+    height: tuple = (20, 1000, 25)
+    flutes: tuple = tuple(thickness for _, thickness in FLUTE_OPTIONS)
+
+    def axes(self):
+        """Stützstellen je Maß; der Endwert gehört immer dazu (letzte Zelle ggf. kürzer als step)"""
+        return [np.append(np.arange(start, stop - step / 1000, step, dtype=float), float(stop))
+                for start, stop, step in (self.length, self.width, self.height)]
+
+
+def _geometry(L, B, H, t):
+    """Preisunabhängige Größen über calculate_batch (Preise 1, damit Kosten = Längen)"""
+    unit = dict(rsc_price_per_1000=1.0, wa_price_per_1000=1.0, tape_price_per_roll=1.0,
+                tape_length_per_roll=1.0, hotmelt_price_per_kg=1.0, hotmelt_usage=1.0)
+    h = calculate_batch(L, B, H, t, tape_pattern=TAPE_PATTERN_H, **unit)
+    simple = calculate_batch(L, B, H, t, tape_pattern=TAPE_PATTERN_SIMPLE, **unit)
+    return {
+        'rsc_area_m2': h['rsc_area_m2'],
+        'wa_area_m2': h['wa_area_m2'],
+        'area_savings_pct': h['area_savings_pct'],
+        'tape_length_h_m': h['rsc_tape_length_m'],
+        'tape_length_simple_m': simple['rsc_tape_length_m'],
+        'wa_seam_length_m': h['wa_seam_length_m'],
+    }
+
+
+def _costs(geometry, prices):
+    """Kostentabellen aus den Geometrietabellen (gleiche Rechenreihenfolge wie formulas.py)"""
+    tape_length = geometry['tape_length_h_m' if is_h_pattern(prices['tape_pattern']) else 'tape_length_simple_m']
+    rsc_total_cost_tape = (prices['rsc_price_per_1000'] / 1000
+                           + tape_length * (prices['tape_price_per_roll'] / prices['tape_length_per_roll']))
+    hotmelt_kg = geometry['wa_seam_length_m'] * prices['hotmelt_usage'] / 1000
+    wa_total_cost = prices['wa_price_per_1000'] / 1000 + hotmelt_kg * prices['hotmelt_price_per_kg']
+    return {
+        'rsc_total_cost_tape': rsc_total_cost_tape,
+        'wa_total_cost': wa_total_cost,
+        'cost_diff_per_box': rsc_total_cost_tape - wa_total_cost,
+    }
+
+
+def _normalize_prices(prices):
+    unknown = sorted(set(prices) - set(PRICE_FIELDS))
+    missing = sorted(set(PRICE_FIELDS) - set(prices))
+    if unknown or missing:
+        raise ValueError(f"Preisparameter erwartet: {', '.join(PRICE_FIELDS)}")
+    prices = {name: prices[name] if name == 'tape_pattern' else float(prices[name]) for name in PRICE_FIELDS}
+    prices['tape_pattern'] = TAPE_PATTERN_H if is_h_pattern(prices['tape_pattern']) else TAPE_PATTERN_SIMPLE
+    return prices
+
+
+class CostLookup:
+    """Kostentabellen in einem Verzeichnis; Abfragen sind thread-sicher"""
+
+    def __init__(self, directory, grid=LookupGrid()):
+        self.directory = directory
+        self.grid = LookupGrid(*(tuple(axis) for axis in grid[:3]), tuple(sorted(grid.flutes)))
+        self._axes = self.grid.axes()
+        self._flutes = np.array(self.grid.flutes, dtype=float)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        manifest = self._read_manifest()
+        # Tabellenform mit vergleichen: ältere Verzeichnisse ohne Achsenendwert werden neu gebildet
+        if manifest.get('grid') == [list(axis) for axis in self.grid] and manifest.get('shape') == self._shape():
+            self.prices = manifest.get('prices')
+            self.error_bound = manifest.get('error_bound', {})
+        else:
+            self._build_geometry()
+            self.prices, self.error_bound = None, {}
+        self._tables = {name: self._open(f'geometry_{name}') for name in GEOMETRY_TABLES}
+        if self.prices is not None:
+            self._tables.update({name: self._open(f'cost_{name}') for name in COST_TABLES})
+        if not self.error_bound:
+            self.error_bound = self._measure_error(self.prices or {name: DEFAULT_INPUTS[name] for name in PRICE_FIELDS})
+            self._write_manifest()
+
+    def _path(self, name):
+        return os.path.join(self.directory, f'{name}.npy')
+
+    def _open(self, name):
+        return np.load(self._path(name), mmap_mode='r')
+
+    def _save(self, name, values):
+        # Erst vollständig schreiben, dann atomar ersetzen: offene Memmaps bleiben gültig
+        tmp = self._path(name) + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.save(f, np.ascontiguousarray(values))
+        os.replace(tmp, self._path(name))
+
+    def _shape(self):
+        return [len(self._flutes)] + [len(axis) for axis in self._axes]
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.directory, 'manifest.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self):
+        manifest = {'grid': [list(axis) for axis in self.grid], 'shape': self._shape(), 'prices': self.prices,
+                    'error_bound': self.error_bound}
+        with open(os.path.join(self.directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    def _mesh(self, axes):
+        """Maße als (Wellen, nL, nB, nH)-Arrays"""
+        t = self._flutes[:, None, None, None]
+        L, B, H = np.meshgrid(*axes, indexing='ij')
+        return L[None], B[None], H[None], t
+
+    def _build_geometry(self):
+        for name, values in _geometry(*self._mesh(self._axes)).items():
+            self._save(f'geometry_{name}', np.broadcast_to(values, (len(self._flutes),) + values.shape[1:]))
+        self.prices, self.error_bound = None, {}
+        self._write_manifest()
+
+    def set_prices(self, **prices):
+        """
+        Bildet die Kostentabellen für neue Preisparameter (nur wenn sie sich ändern)
+        Rückgabe: True, wenn neu gebildet wurde.
+        """
+        prices = _normalize_prices(prices)
+        with self._lock:
+            if prices == self.prices:
+                return False
+            geometry = {name: self._tables[name] for name in GEOMETRY_TABLES}
+            for name, values in _costs(geometry, prices).items():
+                self._save(f'cost_{name}', values)
+                self._tables[name] = self._open(f'cost_{name}')
+            self.prices = prices
+            self.error_bound = self._measure_error(prices)
+            self._write_manifest()
+            return True
+
+    def _measure_error(self, prices):
+        """
+        Größte Abweichung der Interpolation an den Zellmittelpunkten gegenüber calculate_batch
+
+        Für area_savings_pct nur empirisch, siehe Modulbeschreibung.
+        """
+        centers = [(axis[:-1] + axis[1:]) / 2 for axis in self._axes]
+        L, B, H, t = (np.broadcast_to(v, (len(self._flutes),) + tuple(len(c) for c in centers))
+                      for v in self._mesh(centers))
+        exact = calculate_batch(L, B, H, t, **prices)
+        approx = self.quote(L, B, H, t, prices)
+        return {name: float(np.max(np.abs(approx[name] - exact[name]))) for name in LOOKUP_METRICS}
+
+    def _interpolate(self, L, B, H, t, names):
+        positions = []
+        for axis, value in zip(self._axes, (L, B, H)):
+            value = np.asarray(value, dtype=float)
+            if np.any((value < axis[0]) | (value > axis[-1])):
+                raise ValueError(f"Maß außerhalb des Tabellenrasters ({axis[0]:g}–{axis[-1]:g} mm)")
+            index = np.minimum(np.searchsorted(axis, value, side='right') - 1, len(axis) - 2)
+            positions.append((index, (value - axis[index]) / (axis[index + 1] - axis[index])))
+        flute = np.minimum(np.searchsorted(self._flutes, t), len(self._flutes) - 1)
+        if np.any(self._flutes[flute] != np.asarray(t, dtype=float)):
+            raise ValueError("Wellpappe-Typ nicht im Tabellenraster")
+
+        (i, fi), (j, fj), (k, fk) = positions
+        result = {name: 0.0 for name in names}
+        for di in (0, 1):
+            wi = fi if di else 1 - fi
+            for dj in (0, 1):
+                wj = fj if dj else 1 - fj
+                for dk in (0, 1):
+                    weight = wi * wj * (fk if dk else 1 - fk)
+                    for name in names:
+                        result[name] = result[name] + weight * self._tables[name][flute, i + di, j + dj, k + dk]
+        return result
+
+    def quote(self, length, width, height, material_thickness, prices=None):
+        """
+        Interpolierte Kennzahlen (Skalare oder Arrays)
+
+        prices: Preisparameter (PRICE_FIELDS) dieser Abfrage; ohne Angabe gelten
+        die mit set_prices abgelegten Kostentabellen.
+        """
+        if prices is None:
+            if self.prices is None:
+                raise ValueError("Keine Preisparameter gesetzt (set_prices)")
+            return self._interpolate(length, width, height, material_thickness, LOOKUP_METRICS)
+        geometry = self._interpolate(length, width, height, material_thickness, GEOMETRY_TABLES)
+        return {**{name: geometry[name] for name in LOOKUP_METRICS if name in geometry},
+                **_costs(geometry, _normalize_prices(prices))}
+
+    def lookup(self, inputs):
+        """Angebot für QuoteInputs: Geometrie interpolieren, Preise der Anfrage anwenden"""
+        result = self.quote(inputs.length, inputs.width, inputs.height, inputs.material_thickness,
+                            {name: getattr(inputs, name) for name in PRICE_FIELDS})
+        return {name: float(value) for name, value in result.items()}
@@ -0,0 +1,212 @@
+"""
+Laufzeitmetriken im Prometheus-Textformat
+
+Prozessweites, thread-sicheres Register für Zähler, Messwerte (Gauges) und
+Histogramme. Stufen werden mit ``METRICS.timer('stage')`` gemessen; jede
+Messung geht zusätzlich als JSON-Zeile an den Logger ``carton_cost.metrics``
+(Level DEBUG) und an den Sammler des laufenden Threads, falls einer aktiv ist
+(z.B. für das Debug-Panel eines Streamlit-Durchlaufs).
+
+Nur Standardbibliothek, damit API und Streamlit-Prozess es gleichermaßen
+einbinden können.
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("carton_cost.metrics")
+
+PREFIX = 'carton_'
+# Histogramm-Grenzen in Sekunden: von Einzelformeln bis zu kompletten Exporten
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    """Zahl verlustfrei: ganze Zahlen als int, sonst repr(float) (keine Exponentenkürzung wie bei :g)"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+
+class MetricsRegistry:
+    """Zähler, Gauges und Histogramme mit Labels"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._types = {}
+        self._help = {}
+        self._values = defaultdict(int)  # (name, labels) -> Wert (Zähler/Gauge); ganzzahlige Zähler bleiben int
+        self._histograms = {}               # (name, labels) -> [Bucket-Zähler..., count, sum]
+        self._local = threading.local()
+
+    def _register(self, name, kind, help_text):
+        known = self._types.setdefault(name, kind)
+        if known != kind:
+            raise ValueError(f"Metrik '{name}' ist bereits als {known} registriert")
+        if help_text:
+            self._help.setdefault(name, help_text)
+
+    def inc(self, name, value=1, help_text=None, **labels):
+        """Erhöht einen Zähler"""
+        with self._lock:
+            self._register(name, 'counter', help_text)
+            self._values[name, _label_key(labels)] += value
+
+    def set(self, name, value, help_text=None, **labels):
+        """Setzt einen Messwert"""
+        with self._lock:
+            self._register(name, 'gauge', help_text)
+            self._values[name, _label_key(labels)] = value
+
+    def observe(self, name, value, help_text=None, **labels):
+        """Trägt einen Wert in ein Histogramm ein"""
+        with self._lock:
+            self._register(name, 'histogram', help_text)
+            key = (name, _label_key(labels))
+            histogram = self._histograms.setdefault(key, [0] * len(self.buckets) + [0, 0.0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram[i] += 1
+            histogram[-2] += 1
+            histogram[-1] += value
+
+    @contextmanager
+    def timer(self, stage, **labels):
+        """Misst die Dauer einer Stufe als carton_stage_seconds{stage=...}"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe('stage_seconds', elapsed, "Dauer je Verarbeitungsstufe", stage=stage, **labels)
+            records = getattr(self._local, 'records', None)
+            if records is not None:
+                records.append((stage, elapsed))
+            logger.debug(json.dumps({'event': 'stage', 'stage': stage, 'seconds': round(elapsed, 6), **labels}))
+
+    def start_collecting(self):
+        """Sammelt ab jetzt alle Stufenzeiten dieses Threads in der zurückgegebenen Liste"""
+        self._local.records = []
+        return self._local.records
+
+    def cached(self, stage, cache):
+        """
+        Umhüllt einen Cache-Decorator (z.B. st.cache_data) mit Metriken
+
+        Zählt jeden Aufruf und jeden Cache-Miss; gemessen wird nur die
+        tatsächliche Berechnung. Quelltext und Name der Funktion bleiben für
+        die Schlüsselbildung des Caches erhalten.
+        """
+        def decorator(fn):
+            @wraps(fn)
+            def compute(*args, **kwargs):
+                self.inc('cache_misses_total', help_text="Berechnungen bei Cache-Miss", stage=stage)
+                with self.timer(stage):
+                    return fn(*args, **kwargs)
+
+            cached_fn = cache(compute)
+
+            @wraps(fn)
+            def call(*args, **kwargs):
+                self.inc('cache_calls_total', help_text="Aufrufe zwischengespeicherter Stufen", stage=stage)
+                return cached_fn(*args, **kwargs)
+
+            call.clear = getattr(cached_fn, 'clear', None)
+            return call
+        return decorator
+
+    def cache_hit_ratios(self):
+        """Trefferquote je Stufe aus Aufrufen und Cache-Misses"""
+        with self._lock:
+            calls = {dict(k)['stage']: v for (n, k), v in self._values.items() if n == 'cache_calls_total'}
+            misses = {dict(k)['stage']: v for (n, k), v in self._values.items() if n == 'cache_misses_total'}
+        return {stage: 1 - misses.get(stage, 0) / count for stage, count in calls.items() if count}
+
+    def snapshot(self):
+        """Alle Werte als dict: Name -> {Label-Tupel: Wert bzw. (count, sum)}"""
+        with self._lock:
+            result = defaultdict(dict)
+            for (name, key), value in self._values.items():
+                result[name][key] = value
+            for (name, key), histogram in self._histograms.items():
+                result[name][key] = (histogram[-2], histogram[-1])
+        return dict(result)
+
+    def render_prometheus(self, prefix=PREFIX):
+        """Textformat für Prometheus (Version 0.0.4)"""
+        with self._lock:
+            lines = []
+            for name in sorted(self._types):
+                full = prefix + name
+                if name in self._help:
+                    lines.append(f"# HELP {full} {self._help[name]}")
+                lines.append(f"# TYPE {full} {self._types[name]}")
+                if self._types[name] == 'histogram':
+                    for (metric, key), histogram in sorted(self._histograms.items()):
+                        if metric != name:
+                            continue
+                        for bound, count in zip(self.buckets, histogram):
+                            lines.append(f"{full}_bucket{_format_labels(key, [('le', bound)])} {count}")
+                        lines.append(f"{full}_bucket{_format_labels(key, [('le', '+Inf')])} {histogram[-2]}")
+                        lines.append(f"{full}_count{_format_labels(key)} {histogram[-2]}")
+                        lines.append(f"{full}_sum{_format_labels(key)} {_format_value(histogram[-1])}")
+                else:
+                    for (metric, key), value in sorted(self._values.items()):
+                        if metric == name:
+                            lines.append(f"{full}{_format_labels(key)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = METRICS
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(port, host='0.0.0.0', registry=METRICS):
+    """Startet einen /metrics-Endpunkt in einem Hintergrund-Thread (z.B. neben Streamlit)"""
+    handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
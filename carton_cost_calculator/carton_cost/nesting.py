@@ -0,0 +1,172 @@
+"""
+Bahnbelegung der Wellpappenanlage (Deckle-Trim-Optimierung)
+
+Bezahlt wird nicht die Zuschnittsfläche, sondern die gelaufene Bahn mit fester
+Arbeitsbreite (Deckle). Ein Schnittmuster legt quer zur Bahn mehrere Nutzen
+(Lanes) nebeneinander; mit zwei Querschneidern können zwei verschiedene
+Zuschnitte im selben Muster laufen. Je Meter Bahn liefert ein Muster
+``Nutzen × 1000 / Zuschnittlänge`` Zuschnitte je Artikel.
+
+Ablauf:
+1. Alle maximalen Muster (1 oder 2 Artikel, gedreht/ungedreht) werden einmal
+   vektorisiert aufgezählt und je Breitenmix zwischengespeichert.
+2. Ein sequentielles Verfahren (SHP) wählt jeweils das Muster mit der größten
+   noch nutzbaren Breite und lässt es laufen, bis der erste enthaltene Artikel
+   erfüllt ist. Jede Runde erfüllt mindestens einen Artikel; bei Hunderten von
+   Artikeln bleiben es Hunderte vektorisierte Runden.
+
+Standardmäßig liegt die Zuschnittbreite (Höhenrichtung, Wellenrichtung) quer
+zur Bahn; ``allow_rotation`` erlaubt zusätzlich die gedrehte Lage.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+DEFAULT_DECKLE_WIDTH = 2500  # mm Arbeitsbreite
+DEFAULT_EDGE_TRIM = 30  # mm Mindest-Randbeschnitt gesamt
+
+
+class NestingPlan(NamedTuple):
+    """Ergebnis der Bahnbelegung"""
+    patterns: list       # je Muster: Lanes, Lauflänge (m), Bahn- und Beschnittfläche
+    board_m2: float      # gelaufene Bahnfläche (tatsächlicher Papierverbrauch)
+    blank_m2: float      # Nettofläche der bestellten Zuschnitte
+    trim_m2: float       # Randbeschnitt und ungenutzte Breite
+    overrun_m2: float    # Überproduktion in Lanes bereits erfüllter Artikel
+    waste_pct: float     # Verlust (Beschnitt + Überproduktion) in % der Bahnfläche
+
+
+@lru_cache(maxsize=64)
+def enumerate_patterns(usable_width, lane_widths, lane_skus, max_lanes, max_skus_per_pattern):
+    """
+    Zählt alle maximalen Schnittmuster auf (zwischengespeichert je Breitenmix)
+
+    lane_widths/lane_skus: Breite quer zur Bahn und Artikelindex je Lage
+    Rückgabe: Arrays (item_a, lanes_a, item_b, lanes_b); item_b = -1 bei Ein-Artikel-Mustern
+    """
+    widths = np.asarray(lane_widths, dtype=float)
+    skus = np.asarray(lane_skus)
+    n = len(widths)
+
+    # Ein Artikel: so viele Nutzen wie Breite und Lanes erlauben
+    single_lanes = np.minimum(max_lanes, np.floor(usable_width / widths)).astype(int)
+    single = np.flatnonzero(single_lanes >= 1)
+    item_a, lanes_a = [single], [single_lanes[single]]
+    item_b, lanes_b = [np.full(len(single), -1)], [np.zeros(len(single), dtype=int)]
+
+    if max_skus_per_pattern >= 2 and n > 1:
+        I, J = np.triu_indices(n, 1)
+        different = skus[I] != skus[J]
+        I, J = I[different], J[different]
+        for k_a in range(1, max_lanes):
+            rest = usable_width - k_a * widths[I]
+            k_b = np.minimum(max_lanes - k_a, np.floor(rest / widths[J])).astype(int)
+            valid = (rest > 0) & (k_b >= 1)
+            item_a.append(I[valid])
+            lanes_a.append(np.full(valid.sum(), k_a))
+            item_b.append(J[valid])
+            lanes_b.append(k_b[valid])
+
+    return tuple(np.concatenate(values) for values in (item_a, lanes_a, item_b, lanes_b))
+
+
+def plan_corrugator_run(blank_lengths, blank_widths, quantities,
+                        deckle_width=DEFAULT_DECKLE_WIDTH, edge_trim=DEFAULT_EDGE_TRIM,
+                        max_lanes=8, max_skus_per_pattern=2, allow_rotation=False):
+    """
+    Plant die Bahnbelegung für einen Auftragsmix
+
+    blank_lengths/blank_widths: Zuschnittmaße je Artikel in mm (z.B. aus calculate_batch)
+    quantities: bestellte Stückzahl je Artikel
+    max_skus_per_pattern: 1 oder 2 (Anzahl Querschneider)
+    """
+    if max_skus_per_pattern not in (1, 2):
+        raise ValueError("max_skus_per_pattern muss 1 oder 2 sein")
+    lengths = np.atleast_1d(np.asarray(blank_lengths, dtype=float))
+    widths = np.atleast_1d(np.asarray(blank_widths, dtype=float))
+    demand = np.atleast_1d(np.asarray(quantities, dtype=float))
+    usable = deckle_width - edge_trim
+    n_skus = len(lengths)
+
+    # Lagen: Breite quer zur Bahn, Länge in Laufrichtung
+    across, along, skus = [widths], [lengths], [np.arange(n_skus)]
+    if allow_rotation:
+        across.append(lengths)
+        along.append(widths)
+        skus.append(np.arange(n_skus))
+    across, along, skus = (np.concatenate(values) for values in (across, along, skus))
+
+    fits = np.isin(np.arange(n_skus), skus[across <= usable])
+    if not fits.all():
+        raise ValueError(f"Zuschnitt breiter als die nutzbare Arbeitsbreite ({usable:g} mm): "
+                         f"Artikel {', '.join(map(str, np.flatnonzero(~fits)))}")
+
+    item_a, lanes_a, item_b, lanes_b = enumerate_patterns(
+        float(usable), tuple(across.tolist()), tuple(skus.tolist()), max_lanes, max_skus_per_pattern)
+    has_b = item_b >= 0
+    item_b = np.where(has_b, item_b, item_a)
+    sku_a, sku_b = skus[item_a], np.where(has_b, skus[item_b], -1)
+    # Belegte Breite und Zuschnitte je Meter Bahn je Lane-Gruppe
+    width_a = lanes_a * across[item_a]
+    width_b = np.where(has_b, lanes_b * across[item_b], 0.0)
+    rate_a = lanes_a * 1000 / along[item_a]
+    rate_b = np.where(has_b, lanes_b * 1000 / along[item_b], 0.0)
+
+    # Patternindizes je Artikel, getrennt nach erster und zweiter Lane-Gruppe
+    order_a, order_b = np.argsort(sku_a, kind='stable'), np.argsort(sku_b, kind='stable')
+    bounds_a = np.searchsorted(sku_a, np.arange(n_skus + 1), sorter=order_a)
+    bounds_b = np.searchsorted(sku_b, np.arange(n_skus + 1), sorter=order_b)
+
+    remaining = demand.copy()
+    blank_area = lengths * widths / 1e6
+    # Nutzbare Breite je Muster; erfüllte Artikel werden nur in ihren eigenen Mustern abgezogen
+    useful = width_a + width_b
+
+    def close(sku):
+        closed = order_a[bounds_a[sku]:bounds_a[sku + 1]]
+        useful[closed] -= width_a[closed]
+        closed = order_b[bounds_b[sku]:bounds_b[sku + 1]]
+        useful[closed] -= width_b[closed]
+
+    # Artikel ohne Bedarf sind von Anfang an erfüllt (sonst wählt die Schleife
+    # ggf. ein Muster, in dem kein Artikel mehr offen ist)
+    for sku in np.flatnonzero(remaining <= 0):
+        close(sku)
+    patterns = []
+    board_m2 = overrun_m2 = 0.0
+    while (remaining > 0).any():
+        best = int(np.argmax(useful))
+        groups = [(int(sku_a[best]), int(lanes_a[best]), across[item_a[best]], rate_a[best])]
+        if has_b[best]:
+            groups.append((int(sku_b[best]), int(lanes_b[best]), across[item_b[best]], rate_b[best]))
+        run_m = min(remaining[sku] / rate for sku, _, _, rate in groups if remaining[sku] > 0)
+
+        lanes = []
+        for sku, ups, lane_width, rate in groups:
+            produced = rate * run_m
+            overrun = max(0.0, produced - remaining[sku])
+            overrun_m2 += overrun * blank_area[sku]
+            if remaining[sku] > 0 and produced >= remaining[sku] * (1 - 1e-12):
+                close(sku)
+                remaining[sku] = 0.0
+            else:
+                remaining[sku] = max(0.0, remaining[sku] - produced)
+            lanes.append({'sku': sku, 'ups': ups, 'width_mm': float(lane_width), 'blanks': float(produced)})
+
+        trim_width = deckle_width - width_a[best] - width_b[best]
+        board = deckle_width * run_m / 1000
+        board_m2 += board
+        patterns.append({
+            'lanes': lanes,
+            'run_m': float(run_m),
+            'board_m2': float(board),
+            'trim_m2': float(trim_width * run_m / 1000),
+            'trim_pct': float(trim_width / deckle_width * 100),
+        })
+
+    blank_m2 = float(np.dot(demand, blank_area))
+    trim_m2 = sum(p['trim_m2'] for p in patterns)
+    waste_pct = (board_m2 - blank_m2) / board_m2 * 100 if board_m2 else 0.0
+    return NestingPlan(patterns, float(board_m2), blank_m2, float(trim_m2), float(overrun_m2), float(waste_pct))
@@ -0,0 +1,129 @@
+"""
+Maßoptimierung: günstigster Zuschnitt innerhalb einer Toleranzhülle
+
+Sucht über das L×B×H-Raster um ein Produkt (Produktmaß + Mindest-/Maximal-
+zugabe je Achse) die Innenmaße mit minimaler Zuschnittsfläche, Kosten und
+Kleberlänge und gibt die Pareto-Front dieser drei Ziele zurück.
+
+Pruning: Fläche, Kosten und Kleberlänge steigen mit H monoton (bzw. bleiben
+gleich). Für jedes (L, B) ist daher nur die kleinste zulässige Höhe
+Pareto-relevant; sie ergibt sich direkt aus Mindestzugabe und Zielvolumen.
+Aus dem 3D-Raster wird so ein 2D-Raster, das vollständig vektorisiert
+ausgewertet wird.
+"""
+
+from bisect import bisect_right
+from itertools import permutations
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import calculate_batch
+from .options import DEFAULT_INPUTS
+
+# Zielgrößen je Bauart: (Fläche, Kosten, Kleberlänge)
+OBJECTIVES = {
+    'rsc': ('rsc_area_m2', 'rsc_total_cost_tape', 'rsc_tape_length_m'),
+    'wa': ('wa_area_m2', 'wa_total_cost', 'wa_seam_length_m'),
+}
+
+
+class OptimizerResult(NamedTuple):
+    """Ergebnis der Maßoptimierung"""
+    front: dict          # Spalten der Pareto-Front, aufsteigend nach Kosten sortiert
+    candidates: int      # Größe des vollständigen L×B×H-Rasters
+    evaluated: int       # tatsächlich berechnete Kandidaten nach dem Pruning
+
+
+def pareto_mask(objectives):
+    """
+    Markiert die nicht dominierten Zeilen einer (n, 3)-Matrix (alle Ziele minimiert)
+
+    Nach lexikographischer Sortierung kann ein Punkt nur von früheren Punkten
+    dominiert werden. Die Prüfung reduziert sich damit auf eine 2D-Abfrage gegen
+    eine Treppenkurve (Ziel 2 aufsteigend, Ziel 3 fallend): O(n log n) statt
+    paarweiser Vergleiche.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    if objectives.shape[1] == 2:
+        objectives = np.column_stack([objectives, np.zeros(len(objectives))])
+    # Identische Punkte dominieren sich nicht gegenseitig: einmal prüfen, Ergebnis übertragen
+    unique, inverse = np.unique(objectives, axis=0, return_inverse=True)
+
+    stair_o2, stair_o3 = [], []
+    keep = []
+    for _, o2, o3 in unique.tolist():
+        idx = bisect_right(stair_o2, o2)
+        if idx and stair_o3[idx - 1] <= o3:
+            keep.append(False)
+            continue
+        keep.append(True)
+        end = idx
+        while end < len(stair_o3) and stair_o3[end] >= o3:
+            end += 1
+        stair_o2[idx:end] = [o2]
+        stair_o3[idx:end] = [o3]
+
+    return np.asarray(keep, dtype=bool)[inverse.ravel()]
+
+
+def _axis_values(product, clearance_min, clearance_max, step):
+    return product + np.arange(clearance_min, clearance_max + step / 2, step)
+
+
+def optimize_dimensions(product_length, product_width, product_height,
+                        clearance_min=(5, 5, 5), clearance_max=(50, 50, 50),
+                        target_volume_l=None, step=1.0, style='wa',
+                        allow_rotation=False, **params):
+    """
+    Sucht die Pareto-optimalen Innenmaße für ein Produkt
+
+    clearance_min/clearance_max: Zugabe je Achse (L, B, H) in mm
+    target_volume_l: Mindest-Innenvolumen in Litern (optional)
+    step: Rasterweite in mm
+    style: 'wa' oder 'rsc' (bestimmt die drei Zielgrößen)
+    allow_rotation: Produkt darf in allen Achsfolgen eingelegt werden
+    params: Material- und Preisparameter wie in calculate_batch (Standard: Sidebar)
+    """
+    if style not in OBJECTIVES:
+        raise ValueError(f"Unbekannte Bauart '{style}' (erwartet: {', '.join(OBJECTIVES)})")
+    if step <= 0:
+        raise ValueError("step muss größer als 0 sein")
+    params = {**DEFAULT_INPUTS, **params}
+    for name in ('length', 'width', 'height'):
+        params.pop(name)
+
+    product = (product_length, product_width, product_height)
+    orientations = set(permutations(product)) if allow_rotation else {product}
+
+    lengths, widths, heights = [], [], []
+    candidates = 0
+    for p_length, p_width, p_height in sorted(orientations):
+        L = _axis_values(p_length, clearance_min[0], clearance_max[0], step)
+        B = _axis_values(p_width, clearance_min[1], clearance_max[1], step)
+        h_min, h_max = p_height + clearance_min[2], p_height + clearance_max[2]
+        candidates += len(L) * len(B) * len(_axis_values(p_height, clearance_min[2], clearance_max[2], step))
+
+        LL, BB = (grid.ravel() for grid in np.meshgrid(L, B, indexing='ij'))
+        # Kleinste zulässige Höhe je (L, B): Mindestzugabe bzw. Zielvolumen, auf das Raster gerundet
+        H = np.full(LL.shape, h_min, dtype=float)
+        if target_volume_l:
+            h_volume = target_volume_l * 1e6 / (LL * BB)
+            H = np.maximum(H, h_min + np.ceil(np.round((h_volume - h_min) / step, 9)) * step)
+        feasible = H <= h_max + 1e-9
+        lengths.append(LL[feasible])
+        widths.append(BB[feasible])
+        heights.append(H[feasible])
+
+    L, B, H = (np.concatenate(values) for values in (lengths, widths, heights))
+    results = calculate_batch(L, B, H, **params)
+
+    area, cost, adhesive = (results[name] for name in OBJECTIVES[style])
+    mask = pareto_mask(np.column_stack([area, cost, adhesive]))
+
+    front = {'length': L[mask], 'width': B[mask], 'height': H[mask],
+             'volume_l': (L * B * H)[mask] / 1e6}
+    front.update({name: np.asarray(values)[mask] for name, values in results.items()})
+    order = np.lexsort((front[OBJECTIVES[style][0]], front[OBJECTIVES[style][1]]))
+    front = {name: values[order] for name, values in front.items()}
+    return OptimizerResult(front, candidates, len(L))
@@ -0,0 +1,66 @@
+"""
+Auswahllisten und Wertebereiche der Eingabeparameter
+
+Gemeinsame Quelle für die Sidebar in app.py und alle Headless-Pfade.
+"""
+
+from .formulas import TAPE_PATTERN_H, TAPE_PATTERN_SIMPLE
+
+# Wellpappe-Typ: (Bezeichnung, Materialstärke in mm)
+FLUTE_OPTIONS = [
+    ("B-Welle (2.5mm)", 2.5),
+    ("C-Welle (3.5mm)", 3.5),
+    ("E-Welle (1.5mm)", 1.5),
+    ("BC-Welle (6.0mm)", 6.0)
+]
+
+# Wellpappe-Kürzel ("C-Welle (3.5mm)" -> "C") für Kataloge und Preismatrizen
+FLUTE_THICKNESS = {label.split('-')[0]: thickness for label, thickness in FLUTE_OPTIONS}
+
+# Hotmelt-Raupe: (Bezeichnung, Breite in mm, Verbrauch in g/m)
+BEAD_OPTIONS = [
+    ("1.5mm (0.50 g/m)", 1.5, 0.50),
+    ("3mm (2.0 g/m)", 3.0, 2.0),
+    ("5mm (6.67 g/m)", 5.0, 6.67)
+]
+
+TAPE_PATTERNS = [TAPE_PATTERN_H, TAPE_PATTERN_SIMPLE]
+
+PRODUCTION_VOLUMES = [1000, 10000, 100000, 1000000]
+
+# Zulässige Wertebereiche: Name -> (min, max, Standardwert, Schrittweite)
+INPUT_LIMITS = {
+    'length': (50, 2000, 400, 10),
+    'width': (50, 2000, 300, 10),
+    'height': (20, 1000, 200, 10),
+    'rsc_price_per_1000': (100.0, 2000.0, 610.0, 10.0),
+    'wa_price_per_1000': (100.0, 2000.0, 555.0, 10.0),
+    'tape_price_per_roll': (0.5, 20.0, 2.5, 0.1),
+    'tape_length_per_roll': (10, 200, 66, 1),
+    'hotmelt_price_per_kg': (1.0, 30.0, 3.0, 0.5),
+}
+
+
+# Standardwerte je Eingabeparameter (entspricht der Vorbelegung der Sidebar)
+DEFAULT_INPUTS = {
+    'length': INPUT_LIMITS['length'][2],
+    'width': INPUT_LIMITS['width'][2],
+    'height': INPUT_LIMITS['height'][2],
+    'material_thickness': FLUTE_OPTIONS[1][1],
+    'rsc_price_per_1000': INPUT_LIMITS['rsc_price_per_1000'][2],
+    'wa_price_per_1000': INPUT_LIMITS['wa_price_per_1000'][2],
+    'tape_price_per_roll': INPUT_LIMITS['tape_price_per_roll'][2],
+    'tape_length_per_roll': INPUT_LIMITS['tape_length_per_roll'][2],
+    'tape_pattern': TAPE_PATTERN_H,
+    'hotmelt_price_per_kg': INPUT_LIMITS['hotmelt_price_per_kg'][2],
+    'hotmelt_usage': BEAD_OPTIONS[1][2],
+}
+
+
+def flute_label(thickness):
+    """Bezeichnung des Wellpappe-Typs zu einer Materialstärke"""
+    for label, value in FLUTE_OPTIONS:
+        if value == thickness:
+            return label
+    return f"{thickness}mm"
+
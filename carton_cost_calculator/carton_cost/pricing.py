@@ -0,0 +1,173 @@
+"""
+Flächenbasierte Bogenpreise aus einer Lieferanten-Preismatrix
+
+Die Matrix ordnet jeder Kombination aus Papierqualität (grade) und Welle
+einen Preis in €/m² zu, gestaffelt nach der Bestellmenge in m² (Zeile gilt
+ab min_m2). Daraus ergeben sich die Materialkosten je Box aus der
+tatsächlichen Zuschnittsfläche und der Auflage; price_per_1000 liefert sie
+im Format der Eingabeparameter (Preis je 1000 Stück), sodass Angebot,
+Szenarien und Exporte unverändert weiterrechnen.
+
+Index: Hash-Tabelle je (Qualität, Welle) mit sortierten Staffelgrenzen,
+gesucht wird per Binärsuche (bisect bzw. np.searchsorted für Arrays).
+
+CSV-Format (Kopfzeile erforderlich):
+    grade,flute,min_m2,price_per_m2
+    TT125,C,0,0.62
+    TT125,C,5000,0.59
+"""
+
+import csv
+import hashlib
+import io
+import math
+from bisect import bisect_right
+
+from .formulas import rsc_blank_dimensions, wraparound_blank_dimensions
+from .options import FLUTE_THICKNESS
+
+MATRIX_COLUMNS = ('grade', 'flute', 'min_m2', 'price_per_m2')
+
+
+def parse_flute(value):
+    """Welle als Kürzel (B, C, E, BC), Bezeichnung ("C-Welle (3.5mm)") oder Materialstärke in mm"""
+    text = str(value).strip()
+    try:
+        return float(text.replace(',', '.'))
+    except ValueError:
+        pass
+    code = text.split('-')[0].upper()
+    if code not in FLUTE_THICKNESS:
+        raise ValueError(f"Unbekannte Welle '{value}' (erlaubt: {', '.join(FLUTE_THICKNESS)} oder Stärke in mm)")
+    return FLUTE_THICKNESS[code]
+
+
+class PriceMatrix:
+    """Indizierte Preismatrix: (Qualität, Materialstärke) -> Staffelpreise"""
+
+    def __init__(self, rows):
+        """rows: Iterable von (grade, flute, min_m2, price_per_m2)"""
+        entries = {}
+        for grade, flute, min_m2, price in rows:
+            key = (str(grade).strip(), parse_flute(flute))
+            min_m2, price = float(min_m2), float(price)
+            if not (math.isfinite(min_m2) and math.isfinite(price)) or min_m2 < 0 or price <= 0:
+                raise ValueError(f"Ungültige Staffel für {key[0]}/{flute}: ab {min_m2} m² zu {price} €/m²")
+            entries.setdefault(key, {})[min_m2] = price
+        if not entries:
+            raise ValueError("Preismatrix ist leer")
+
+        self._index = {}
+        for key, breaks in entries.items():
+            thresholds = sorted(breaks)
+            if thresholds[0] != 0:
+                raise ValueError(f"Staffel für {key[0]}/{key[1]:g} mm muss bei 0 m² beginnen")
+            self._index[key] = (thresholds, [breaks[m2] for m2 in thresholds])
+        # Inhaltshash als Cache-Schlüssel (id() wird nach der Freigabe wiederverwendet)
+        self.fingerprint = hashlib.sha256(repr(sorted(self._index.items())).encode('utf-8')).hexdigest()
+
+    def __len__(self):
+        return sum(len(thresholds) for thresholds, _ in self._index.values())
+
+    def grades(self):
+        return sorted({grade for grade, _ in self._index})
+
+    def flutes(self, grade):
+        """Materialstärken, für die eine Qualität bepreist ist"""
+        return sorted(thickness for g, thickness in self._index if g == grade)
+
+    def _breaks(self, grade, thickness):
+        try:
+            return self._index[grade, float(thickness)]
+        except KeyError:
+            raise ValueError(f"Kein Preis für Qualität '{grade}' mit {float(thickness):g} mm Welle") from None
+
+    def price_per_m2(self, grade, thickness, order_m2):
+        """Staffelpreis in €/m² für eine Bestellmenge in m²"""
+        thresholds, prices = self._breaks(grade, thickness)
+        return prices[bisect_right(thresholds, order_m2) - 1]
+
+    def prices_per_m2(self, grade, thickness, order_m2):
+        """Vektorisiert: grade, thickness und order_m2 dürfen Skalare oder Arrays sein"""
+        import numpy as np
+
+        def factorize(values, dtype):
+            # Skalare (der Normalfall: eine Qualität für den ganzen Katalog) ohne np.unique
+            values = np.asarray(values, dtype=dtype)
+            if values.ndim == 0:
+                return values.reshape(1), np.zeros((), dtype=int)
+            return np.unique(values, return_inverse=True)
+
+        grades, grade_codes = factorize(grade, str)
+        thicknesses, thickness_codes = factorize(thickness, float)
+        shape = np.broadcast_shapes(np.shape(grade), np.shape(thickness), np.shape(order_m2))
+        grade_codes, thickness_codes, order_m2 = (np.broadcast_to(v, shape) for v in (
+            np.reshape(grade_codes, np.shape(grade)), np.reshape(thickness_codes, np.shape(thickness)),
+            np.asarray(order_m2, dtype=float)))
+        codes = (grade_codes * len(thicknesses) + thickness_codes).ravel()
+        order_m2 = order_m2.ravel()
+        # Nach (Qualität, Welle) sortieren, dann je Abschnitt eine Binärsuche über die Staffelgrenzen
+        order = np.argsort(codes, kind='stable')
+        starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0])
+        result = np.empty(len(codes))
+        for start, stop in zip(starts, np.r_[starts[1:], len(codes)]):
+            rows = order[start:stop]
+            code = codes[rows[0]]
+            thresholds, prices = self._breaks(str(grades[code // len(thicknesses)]),
+                                              thicknesses[code % len(thicknesses)])
+            result[rows] = np.asarray(prices)[np.searchsorted(thresholds, order_m2[rows], side='right') - 1]
+        return result.reshape(shape)
+
+    def price_per_1000(self, grade, thickness, area_m2, quantity):
+        """Materialpreis je 1000 Boxen: Fläche × Staffelpreis bei Auflage × Fläche"""
+        if getattr(area_m2, 'ndim', 0) or getattr(quantity, 'ndim', 0) or getattr(thickness, 'ndim', 0):
+            return area_m2 * self.prices_per_m2(grade, thickness, area_m2 * quantity) * 1000
+        return area_m2 * self.price_per_m2(grade, thickness, area_m2 * quantity) * 1000
+
+    def box_prices_per_1000(self, grade, length, width, height, thickness, quantity):
+        """Materialpreise je 1000 für RSC und Wrap-Around aus den jeweiligen Zuschnittsflächen"""
+        rsc_area = rsc_blank_dimensions(length, width, height, thickness)['area_m2']
+        wa_area = wraparound_blank_dimensions(length, width, height, thickness)['area_m2']
+        return {
+            'rsc_price_per_1000': self.price_per_1000(grade, thickness, rsc_area, quantity),
+            'wa_price_per_1000': self.price_per_1000(grade, thickness, wa_area, quantity),
+        }
+
+
+def read_price_matrix(source):
+    """Liest eine Preismatrix aus CSV (Dateipfad, Text oder Bytes; Bytes sind immer Inhalt)"""
+    if isinstance(source, bytes):
+        try:
+            return _parse_csv(io.StringIO(source.decode('utf-8-sig')))
+        except UnicodeDecodeError:
+            raise ValueError("Preismatrix: Datei ist nicht UTF-8-kodiert") from None
+    if isinstance(source, str) and '\n' in source:
+        return _parse_csv(io.StringIO(source))
+    with open(source, encoding='utf-8-sig', newline='') as f:
+        return _parse_csv(f)
+
+
+def _parse_csv(f):
+    sample = f.read(4096)
+    f.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+    except csv.Error:
+        # Kein Trennzeichen erkennbar (z.B. nur eine Spalte): Komma annehmen,
+        # die Spaltenprüfung unten meldet dann den eigentlichen Fehler
+        dialect = csv.excel
+    reader = csv.DictReader(f, dialect=dialect)
+    try:
+        missing = set(MATRIX_COLUMNS) - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"Preismatrix: Spalten fehlen: {', '.join(sorted(missing))}")
+        rows = []
+        for line, row in enumerate(reader, start=2):
+            try:
+                rows.append((row['grade'], row['flute'], float(row['min_m2'].replace(',', '.')),
+                             float(row['price_per_m2'].replace(',', '.'))))
+            except (ValueError, AttributeError):
+                raise ValueError(f"Preismatrix Zeile {line}: min_m2 und price_per_m2 müssen Zahlen sein") from None
+    except csv.Error as exc:
+        raise ValueError(f"Preismatrix: keine gültige CSV-Datei ({exc})") from None
+    return PriceMatrix(rows)
@@ -0,0 +1,160 @@
+"""
+Szenario-Arbeitsbereich mit inkrementeller Neuberechnung
+
+Hält beliebig viele benannte Konfigurationen nebeneinander. Das Angebot ist
+als Abhängigkeitsgraph zerlegt:
+
+    Eingaben -> Zuschnitte / Tape / Hotmelt / Material -> Summen
+
+Ändert sich ein Parameter, werden nur die davon abhängigen Knoten des
+betroffenen Szenarios neu berechnet (z.B. Hotmelt-Preis: Hotmelt und Summen,
+nicht aber die Zuschnitte). Das Ergebnis je Szenario entspricht exakt
+calculate_quote.
+"""
+
+from .calculations import (
+    QuoteInputs,
+    calculate_hotmelt_cost_rsc,
+    calculate_hotmelt_cost_wa,
+    calculate_rsc_blank_dimensions,
+    calculate_tape_cost_rsc,
+    calculate_wraparound_blank_dimensions,
+    normalize_inputs,
+)
+from .options import INPUT_LIMITS
+
+
+def _blanks(v):
+    return {
+        'rsc_blank': calculate_rsc_blank_dimensions(v['length'], v['width'], v['height'], v['material_thickness']),
+        'wa_blank': calculate_wraparound_blank_dimensions(v['length'], v['width'], v['height'], v['material_thickness']),
+    }
+
+
+def _tape(v):
+    return {'rsc_tape_cost': calculate_tape_cost_rsc(v['length'], v['width'], v['height'], v['tape_price_per_roll'],
+                                                     v['tape_length_per_roll'], v['tape_pattern'])}
+
+
+def _hotmelt(v):
+    return {
+        'rsc_hotmelt_cost': calculate_hotmelt_cost_rsc(v['length'], v['width'], v['height'],
+                                                       v['hotmelt_price_per_kg'], v['hotmelt_usage']),
+        'wa_hotmelt_cost': calculate_hotmelt_cost_wa(v['length'], v['width'], v['height'],
+                                                     v['hotmelt_price_per_kg'], v['hotmelt_usage']),
+    }
+
+
+def _material(v):
+    return {'rsc_material_cost': v['rsc_price_per_1000'] / 1000, 'wa_material_cost': v['wa_price_per_1000'] / 1000}
+
+
+def _area_savings(v):
+    rsc_area, wa_area = v['rsc_blank']['area_m2'], v['wa_blank']['area_m2']
+    return {'area_savings_pct': ((rsc_area - wa_area) / rsc_area) * 100}
+
+
+def _totals(v):
+    rsc_total_cost_tape = v['rsc_material_cost'] + v['rsc_tape_cost']['cost_per_box']
+    wa_total_cost = v['wa_material_cost'] + v['wa_hotmelt_cost']['cost_per_box']
+    cost_diff_per_box = rsc_total_cost_tape - wa_total_cost
+    return {
+        'rsc_total_cost_tape': rsc_total_cost_tape,
+        'rsc_total_cost_hotmelt': v['rsc_material_cost'] + v['rsc_hotmelt_cost']['cost_per_box'],
+        'wa_total_cost': wa_total_cost,
+        'cost_diff_per_box': cost_diff_per_box,
+        'cost_diff_pct': (cost_diff_per_box / rsc_total_cost_tape) * 100,
+    }
+
+
+# Knoten -> (Abhängigkeiten: Eingabefelder oder Knoten, Berechnung); Reihenfolge ist topologisch
+GRAPH = {
+    'blanks': (('length', 'width', 'height', 'material_thickness'), _blanks),
+    'tape': (('length', 'width', 'height', 'tape_price_per_roll', 'tape_length_per_roll', 'tape_pattern'), _tape),
+    'hotmelt': (('length', 'width', 'height', 'hotmelt_price_per_kg', 'hotmelt_usage'), _hotmelt),
+    'material': (('rsc_price_per_1000', 'wa_price_per_1000'), _material),
+    'area_savings': (('blanks',), _area_savings),
+    'totals': (('material', 'tape', 'hotmelt'), _totals),
+}
+
+
+def affected_nodes(changed):
+    """Alle Knoten, die (direkt oder indirekt) von den geänderten Feldern abhängen, in Rechenreihenfolge"""
+    dirty = set(changed)
+    nodes = []
+    for node, (dependencies, _) in GRAPH.items():
+        if dirty.intersection(dependencies):
+            dirty.add(node)
+            nodes.append(node)
+    return nodes
+
+
+class ScenarioWorkspace:
+    """Benannte Szenarien mit zwischengespeicherten Knotenergebnissen"""
+
+    def __init__(self):
+        self._inputs = {}
+        self._values = {}
+        self.node_evaluations = 0  # Anzahl berechneter Knoten seit Anlage (für Diagnose)
+
+    def __contains__(self, name):
+        return name in self._inputs
+
+    def __len__(self):
+        return len(self._inputs)
+
+    def names(self):
+        return list(self._inputs)
+
+    def inputs(self, name):
+        return self._inputs[name]
+
+    def _evaluate(self, name, nodes):
+        values = self._values[name]
+        values.update(self._inputs[name]._asdict())
+        for node in nodes:
+            values.update(GRAPH[node][1](values))
+        self.node_evaluations += len(nodes)
+        return nodes
+
+    def add(self, name, inputs):
+        """Legt ein Szenario an bzw. ersetzt es vollständig"""
+        if not isinstance(inputs, QuoteInputs):
+            inputs = normalize_inputs(**inputs)
+        self._inputs[name] = inputs
+        self._values[name] = {}
+        return self._evaluate(name, list(GRAPH))
+
+    def remove(self, name):
+        del self._inputs[name]
+        del self._values[name]
+
+    def update(self, name, **changes):
+        """
+        Ändert Parameter eines Szenarios; Rückgabe: neu berechnete Knoten
+
+        Werte außerhalb von INPUT_LIMITS werden mit ValueError abgewiesen.
+        """
+        unknown = sorted(set(changes) - set(QuoteInputs._fields))
+        if unknown:
+            raise ValueError(f"Unbekannte Parameter: {', '.join(unknown)}")
+        for field, value in changes.items():
+            if field in INPUT_LIMITS:
+                low, high = INPUT_LIMITS[field][:2]
+                if not low <= value <= high:
+                    raise ValueError(f"{field} muss zwischen {low:g} und {high:g} liegen")
+        old = self._inputs[name]
+        new = normalize_inputs(**{**old._asdict(), **changes})
+        changed = [field for field in QuoteInputs._fields if getattr(old, field) != getattr(new, field)]
+        self._inputs[name] = new
+        return self._evaluate(name, affected_nodes(changed))
+
+    def update_all(self, **changes):
+        """Setzt Parameter in allen Szenarien; Rückgabe: {Szenario: neu berechnete Knoten} der betroffenen"""
+        recomputed = {name: self.update(name, **changes) for name in self.names()}
+        return {name: nodes for name, nodes in recomputed.items() if nodes}
+
+    def result(self, name):
+        """Angebot eines Szenarios im Format von calculate_quote"""
+        values = self._values[name]
+        return {key: value for key, value in values.items() if key not in QuoteInputs._fields}
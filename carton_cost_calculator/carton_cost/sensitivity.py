@@ -0,0 +1,145 @@
+"""
+Sensitivitätsanalyse über alle Eingabeparameter
+
+Jeder Parameter erhält Stufen aus seinem zulässigen Bereich (INPUT_LIMITS)
+bzw. aus den Auswahllisten (Welle, Raupenbreite, Verschlussmuster).
+
+Alle Auswertungen laufen als ein einziges gebroadcastetes Raster: jeder
+variierte Parameter bekommt eine eigene Array-Achse. Die Formeln rechnen jede
+Teilgröße nur über die Achsen, von denen sie abhängt (z.B. Bandlänge nur über
+L×B×Muster, Materialkosten nur über die Preise); erst die Summe wird auf das
+volle Raster aufgespannt.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .calculations import QuoteInputs
+from .formulas import (
+    hotmelt_cost_wa,
+    is_h_pattern,
+    rsc_blank_dimensions,
+    tape_cost_rsc,
+    wraparound_blank_dimensions,
+)
+from .options import BEAD_OPTIONS, FLUTE_OPTIONS, INPUT_LIMITS
+
+PARAMETERS = QuoteInputs._fields
+METRICS = ('cost_diff_per_box', 'area_savings_pct')
+
+
+class FactorialResult(NamedTuple):
+    """Ergebnis des vollfaktoriellen Rasters"""
+    levels: dict          # Parameter -> Stufen (Achsenreihenfolge = Reihenfolge der Schlüssel)
+    values: np.ndarray    # Kennzahl je Kombination, eine Achse je Parameter
+    main_effects: dict    # Parameter -> Mittelwert der Kennzahl je Stufe
+    positive_share: float  # Anteil der Kombinationen mit positivem Wert
+
+
+def parameter_levels(name, points=5):
+    """Stufen eines Parameters: Auswahlliste bzw. gleichmäßig über den zulässigen Bereich"""
+    if name == 'material_thickness':
+        return np.array([thickness for _, thickness in FLUTE_OPTIONS])
+    if name == 'hotmelt_usage':
+        return np.array([usage for _, _, usage in BEAD_OPTIONS])
+    if name == 'tape_pattern':
+        return np.array([True, False])
+    if name not in INPUT_LIMITS:
+        raise ValueError(f"Unbekannter Parameter '{name}'")
+    low, high, _, _ = INPUT_LIMITS[name]
+    return np.linspace(low, high, points)
+
+
+def evaluate(metric='cost_diff_per_box', **params):
+    """
+    Berechnet nur die angeforderte Kennzahl (Skalare oder broadcastbare Arrays)
+
+    Gleiche Rechenreihenfolge wie calculate_batch, daher identische Werte.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unbekannte Kennzahl '{metric}' (erwartet: {', '.join(METRICS)})")
+    p = {name: params[name] if name == 'tape_pattern' else np.asarray(params[name], dtype=float)
+         for name in PARAMETERS}
+    L, B, H = p['length'], p['width'], p['height']
+
+    if metric == 'area_savings_pct':
+        rsc_area = rsc_blank_dimensions(L, B, H, p['material_thickness'])['area_m2']
+        wa_area = wraparound_blank_dimensions(L, B, H, p['material_thickness'])['area_m2']
+        return ((rsc_area - wa_area) / rsc_area) * 100
+
+    tape = tape_cost_rsc(L, B, H, p['tape_price_per_roll'], p['tape_length_per_roll'],
+                         is_h_pattern(p['tape_pattern']))
+    hotmelt = hotmelt_cost_wa(L, B, H, p['hotmelt_price_per_kg'], p['hotmelt_usage'])
+    rsc_total_cost_tape = p['rsc_price_per_1000'] / 1000 + tape['cost_per_box']
+    wa_total_cost = p['wa_price_per_1000'] / 1000 + hotmelt['cost_per_box']
+    return rsc_total_cost_tape - wa_total_cost
+
+
+def _base(inputs):
+    base = inputs._asdict()
+    base['tape_pattern'] = is_h_pattern(base['tape_pattern'])
+    return base
+
+
+def tornado(inputs, metric='cost_diff_per_box', points=9):
+    """
+    Einzelvariation je Parameter über den ganzen Bereich, übrige Parameter fest
+
+    Rückgabe: Liste von dicts (parameter, low, high, level_low, level_high),
+    absteigend nach Spannweite sortiert.
+    """
+    base = _base(inputs)
+    base_value = float(evaluate(metric, **base))
+    bars = []
+    for name in PARAMETERS:
+        levels = parameter_levels(name, points)
+        values = np.broadcast_to(evaluate(metric, **{**base, name: levels}), levels.shape)
+        low, high = int(np.argmin(values)), int(np.argmax(values))
+        bars.append({
+            'parameter': name,
+            'base': base_value,
+            'low': float(values[low]),
+            'high': float(values[high]),
+            'level_low': levels[low].item(),
+            'level_high': levels[high].item(),
+        })
+    return sorted(bars, key=lambda bar: bar['high'] - bar['low'], reverse=True)
+
+
+def heatmap(inputs, x='length', y='height', metric='cost_diff_per_box', points=41):
+    """Kennzahl über ein 2D-Raster zweier Parameter; Rückgabe (x-Stufen, y-Stufen, Werte[y, x])"""
+    if x == y:
+        raise ValueError("x und y müssen verschiedene Parameter sein")
+    x_levels, y_levels = parameter_levels(x, points), parameter_levels(y, points)
+    values = evaluate(metric, **{**_base(inputs), x: x_levels[None, :], y: y_levels[:, None]})
+    return x_levels, y_levels, np.broadcast_to(values, (len(y_levels), len(x_levels)))
+
+
+def full_factorial(inputs, parameters=None, metric='cost_diff_per_box', points=3):
+    """
+    Vollfaktorielles Raster über die gewählten Parameter (Standard: alle)
+
+    Nicht variierte Parameter behalten den Wert aus inputs. Bei points=3 und
+    allen Parametern sind das 3^8 × 4 Wellen × 3 Raupen × 2 Muster = 157.464
+    Kombinationen.
+    """
+    parameters = list(PARAMETERS if parameters is None else parameters)
+    unknown = sorted(set(parameters) - set(PARAMETERS))
+    if unknown:
+        raise ValueError(f"Unbekannte Parameter: {', '.join(unknown)}")
+
+    levels = {name: parameter_levels(name, points) for name in parameters}
+    axes = {}
+    for axis, (name, values) in enumerate(levels.items()):
+        shape = [1] * len(levels)
+        shape[axis] = len(values)
+        axes[name] = values.reshape(shape)
+    values = evaluate(metric, **{**_base(inputs), **axes})
+    values = np.broadcast_to(values, tuple(len(v) for v in levels.values()))
+
+    main_effects = {}
+    for axis, name in enumerate(levels):
+        others = tuple(i for i in range(values.ndim) if i != axis)
+        main_effects[name] = values.mean(axis=others)
+    return FactorialResult(levels, values, main_effects, float(np.count_nonzero(values > 0)) / values.size)
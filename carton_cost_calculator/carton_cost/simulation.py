@@ -0,0 +1,87 @@
+"""
+Monte-Carlo-Simulation schwankender Einkaufspreise
+
+Zieht Kartonpreise (RSC/Wrap-Around), Hotmelt-Preis und Tape-Rollenpreis aus
+Lognormal-Verteilungen um die eingegebenen Werte und berechnet daraus die
+Verteilung der Kostendifferenz pro Box.
+
+Die Geometrie (Bandlänge, Hotmelt-Verbrauch) hängt nicht von den Preisen ab
+und wird einmal skalar berechnet; die Kostenformeln sind in den Preisen
+linear und laufen direkt auf den Preisvektoren. 10^6 Ziehungen kosten so nur
+wenige Array-Operationen.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .formulas import hotmelt_cost_wa, is_h_pattern, tape_cost_rsc
+
+# Relative Standardabweichung je Preis (z.B. 0.10 = ±10 %)
+DEFAULT_VOLATILITY = {
+    'rsc_price_per_1000': 0.10,
+    'wa_price_per_1000': 0.10,
+    'tape_price_per_roll': 0.10,
+    'hotmelt_price_per_kg': 0.15,
+}
+# RSC- und Wrap-Around-Zuschnitte hängen am selben Papiermarkt
+DEFAULT_BOARD_CORRELATION = 0.8
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+class SimulationResult(NamedTuple):
+    """Ergebnis der Preissimulation"""
+    cost_diff_per_box: np.ndarray    # RSC (Tape) minus Wrap-Around je Ziehung
+    wa_cheaper_prob: float           # Anteil der Ziehungen, in denen Wrap-Around günstiger ist
+    mean: float
+    std: float
+    percentiles: dict                # Perzentil -> Kostendifferenz pro Box
+    break_even_wa_price: np.ndarray  # WA-Preis pro 1000 Stück, ab dem beide gleich teuer sind
+
+
+def _lognormal(base, sigma, z):
+    # Erwartungswert bleibt beim Eingabepreis: exp(-sigma²/2) gleicht die Schiefe aus
+    return base * np.exp(sigma * z - sigma ** 2 / 2)
+
+
+def simulate_cost_diff(inputs, draws=1_000_000, volatility=None,
+                       board_correlation=DEFAULT_BOARD_CORRELATION, seed=None):
+    """
+    Verteilung der Kostendifferenz pro Box bei schwankenden Preisen
+
+    inputs: QuoteInputs (z.B. aus normalize_inputs)
+    volatility: relative Standardabweichung je Preis, ergänzt DEFAULT_VOLATILITY
+    board_correlation: Korrelation der RSC- und Wrap-Around-Kartonpreise
+    """
+    volatility = {**DEFAULT_VOLATILITY, **(volatility or {})}
+    unknown = sorted(set(volatility) - set(DEFAULT_VOLATILITY))
+    if unknown:
+        raise ValueError(f"Keine Preisverteilung für: {', '.join(unknown)}")
+    if not -1 <= board_correlation <= 1:
+        raise ValueError("board_correlation muss zwischen -1 und 1 liegen")
+
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal((4, draws))
+    z_wa = board_correlation * z[0] + np.sqrt(1 - board_correlation ** 2) * z[1]
+
+    rsc_price = _lognormal(inputs.rsc_price_per_1000, volatility['rsc_price_per_1000'], z[0])
+    wa_price = _lognormal(inputs.wa_price_per_1000, volatility['wa_price_per_1000'], z_wa)
+    tape_price = _lognormal(inputs.tape_price_per_roll, volatility['tape_price_per_roll'], z[2])
+    hotmelt_price = _lognormal(inputs.hotmelt_price_per_kg, volatility['hotmelt_price_per_kg'], z[3])
+
+    L, B, H = inputs.length, inputs.width, inputs.height
+    tape = tape_cost_rsc(L, B, H, tape_price, inputs.tape_length_per_roll, is_h_pattern(inputs.tape_pattern))
+    hotmelt = hotmelt_cost_wa(L, B, H, hotmelt_price, inputs.hotmelt_usage)
+
+    rsc_total = rsc_price / 1000 + tape['cost_per_box']
+    cost_diff = rsc_total - (wa_price / 1000 + hotmelt['cost_per_box'])
+    break_even_wa_price = (rsc_total - hotmelt['cost_per_box']) * 1000
+
+    return SimulationResult(
+        cost_diff_per_box=cost_diff,
+        wa_cheaper_prob=float(np.count_nonzero(cost_diff > 0)) / draws,
+        mean=float(cost_diff.mean()),
+        std=float(cost_diff.std()),
+        percentiles=dict(zip(PERCENTILES, np.percentile(cost_diff, PERCENTILES).tolist())),
+        break_even_wa_price=break_even_wa_price,
+    )
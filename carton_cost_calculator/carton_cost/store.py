@@ -0,0 +1,162 @@
+"""
+Persistenter Angebotsspeicher (SQLite)
+
+Speichert Ergebnisse von calculate_quote unter einem kanonischen Hash aller
+Eingaben. Identische Anfragen werden direkt aus der Datenbank beantwortet,
+auch über Sitzungs- und Prozessgrenzen hinweg. Indizes auf Maßen, Welle und
+Datum erlauben die Suche im Verlauf; oberhalb von max_entries werden die am
+längsten nicht mehr genutzten Einträge verdrängt.
+
+Die Tabelle meta hält Schema- und Formelstand (FORMULA_VERSION); passt der
+Stand beim Öffnen nicht, wird der Speicher geleert, damit nach Änderungen an
+der Berechnung keine veralteten Angebote ausgeliefert werden.
+
+Nur Standardbibliothek; eine Instanz darf von mehreren Threads genutzt werden.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from .calculations import FORMULA_VERSION, QuoteInputs, calculate_quote, normalize_inputs
+
+DEFAULT_MAX_ENTRIES = 100_000
+INPUT_FIELDS = QuoteInputs._fields
+# Bei Änderungen an Tabellen oder Schlüssel erhöhen
+SCHEMA_VERSION = 1
+STORE_VERSION = f'{SCHEMA_VERSION}.{FORMULA_VERSION}'
+
+_META = 'CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)'
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS quotes (
+    key TEXT PRIMARY KEY,
+    {', '.join(f'{name} {"TEXT" if name == "tape_pattern" else "REAL"} NOT NULL' for name in INPUT_FIELDS)},
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_quotes_dims ON quotes (length, width, height);
+CREATE INDEX IF NOT EXISTS idx_quotes_flute ON quotes (material_thickness);
+CREATE INDEX IF NOT EXISTS idx_quotes_created ON quotes (created_at);
+CREATE INDEX IF NOT EXISTS idx_quotes_last_used ON quotes (last_used);
+"""
+
+
+def input_key(inputs):
+    """Kanonischer Hash der normalisierten Eingaben (400 und 400.0 ergeben denselben Schlüssel)"""
+    if not isinstance(inputs, QuoteInputs):
+        inputs = normalize_inputs(**inputs)
+    canonical = json.dumps([repr(value) for value in inputs], separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class QuoteStore:
+    """SQLite-Speicher für Angebote mit LRU-Verdrängung"""
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL: Leser blockieren den Schreiber nicht; NORMAL reicht für einen Cache
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(_META)
+        self._migrate()
+
+    def _migrate(self):
+        """Verwirft Angebote eines anderen Schema- oder Formelstands"""
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+                if row is None or row[0] != STORE_VERSION:
+                    self._db.execute('DROP TABLE IF EXISTS quotes')
+                    self._db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)",
+                                     (STORE_VERSION,))
+                for statement in filter(str.strip, _SCHEMA.split(';')):
+                    self._db.execute(statement)
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __len__(self):
+        # Immer aus der Datenbank: App und API können sich eine Datei teilen
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM quotes').fetchone()[0]
+
+    def get(self, inputs):
+        """Gespeichertes Ergebnis oder None"""
+        key = input_key(inputs)
+        with self._lock:
+            row = self._db.execute('SELECT result FROM quotes WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute('UPDATE quotes SET last_used = ?, hits = hits + 1 WHERE key = ?', (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, inputs, result):
+        """Speichert ein Ergebnis und verdrängt bei Bedarf die ältesten Einträge"""
+        if not isinstance(inputs, QuoteInputs):
+            inputs = normalize_inputs(**inputs)
+        now = time.time()
+        columns = ', '.join(INPUT_FIELDS)
+        placeholders = ', '.join('?' * (len(INPUT_FIELDS) + 4))
+        with self._lock:
+            cursor = self._db.execute(
+                f'INSERT OR IGNORE INTO quotes (key, {columns}, result, created_at, last_used) VALUES ({placeholders})',
+                (input_key(inputs), *inputs, json.dumps(result), now, now))
+            if cursor.rowcount:
+                self._db.execute('DELETE FROM quotes WHERE key IN '
+                                 '(SELECT key FROM quotes ORDER BY last_used LIMIT '
+                                 'max(0, (SELECT COUNT(*) FROM quotes) - ?))',
+                                 (self.max_entries,))
+
+    def get_or_compute(self, inputs, compute=None):
+        """Ergebnis aus dem Speicher oder berechnen (Standard: calculate_quote) und ablegen"""
+        if not isinstance(inputs, QuoteInputs):
+            inputs = normalize_inputs(**inputs)
+        result = self.get(inputs)
+        if result is None:
+            result = (compute or calculate_quote)(*inputs)
+            self.put(inputs, result)
+        return result
+
+    def search(self, length=None, width=None, height=None, material_thickness=None,
+               since=None, until=None, limit=100):
+        """
+        Sucht im Verlauf, neueste zuerst
+
+        length/width/height: (min, max) in mm; material_thickness: exakter Wert
+        since/until: Unix-Zeitstempel des Anlegens
+        """
+        conditions, params = [], []
+        for name, bounds in (('length', length), ('width', width), ('height', height)):
+            if bounds is not None:
+                conditions.append(f'{name} BETWEEN ? AND ?')
+                params.extend(bounds)
+        if material_thickness is not None:
+            conditions.append('material_thickness = ?')
+            params.append(float(material_thickness))
+        if since is not None:
+            conditions.append('created_at >= ?')
+            params.append(since)
+        if until is not None:
+            conditions.append('created_at <= ?')
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        query = (f'SELECT {", ".join(INPUT_FIELDS)}, result, created_at, hits FROM quotes {where} '
+                 'ORDER BY created_at DESC LIMIT ?')
+        with self._lock:
+            rows = self._db.execute(query, (*params, limit)).fetchall()
+        return [{**dict(zip(INPUT_FIELDS, row)), 'result': json.loads(row[-3]), 'created_at': row[-2], 'hits': row[-1]}
+                for row in rows]
@@ -0,0 +1,189 @@
+"""
+FEFCO-Bauarten als erweiterbares Register
+
+Jede Bauart deklariert ihre Zuschnittformel sowie die Längen von Klebenaht
+(Hotmelt) und Verschluss (Klebeband) als Ausdruck in den Innenmaßen L, B, H,
+der Materialstärke t und dem Verschlussmuster h (1 = H-Muster, 0 = einfach).
+Die Ausdrücke werden einmal zu einer Python-Funktion kompiliert, die beliebig
+viele Bauarten in einem Durchlauf auswertet – mit Skalaren ebenso wie mit
+NumPy-Arrays. Alle Längen in mm.
+
+RSC (0201) und Wrap-Around (0409) rechnet das Angebot weiterhin mit den
+festen Formeln in formulas.py; das Register führt sie mit denselben Zugaben
+für Vergleich und Rangliste. Die Maße für 0200, 0203, 0427 und 0711 sind
+übliche Näherungen für die Kalkulation, keine Werkzeugzeichnungen.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from .formulas import is_h_pattern
+
+# Konstruktionszugaben in mm (dieselben Werte wie in formulas.py)
+CONSTANTS = {
+    'manufacturer_flap': 25,     # Klebelasche der Herstellernaht
+    'trim_allowance': 20,        # Verschnitt
+    'overlap': 75,               # Überlappung Wrap-Around
+    'tape_overhang_h': 150,      # Klebeband-Überstand H-Muster
+    'tape_overhang_simple': 100,  # Klebeband-Überstand einfacher Streifen
+}
+VARIABLES = ('L', 'B', 'H', 't', 'h')
+FIELDS = ('blank_length', 'blank_width', 'glue_length', 'tape_length')
+# Preisbasis einer Bauart: Bogenpreis aus dem RSC- bzw. dem Wrap-Around-Preis je 1000
+PRICE_BASES = ('rsc', 'wa')
+
+
+class Style(NamedTuple):
+    """Eine FEFCO-Bauart; Formeln als Ausdrücke in VARIABLES und CONSTANTS"""
+    code: str
+    name: str
+    blank_length: str
+    blank_width: str
+    glue_length: str = '0'
+    tape_length: str = '0'
+    price_basis: str = 'rsc'
+
+
+STYLES = {}
+
+
+def register_style(code, name, blank_length, blank_width, glue_length='0', tape_length='0', price_basis='rsc'):
+    """Registriert (oder ersetzt) eine Bauart; unbekannte Namen in den Formeln ergeben ValueError"""
+    if price_basis not in PRICE_BASES:
+        raise ValueError(f"FEFCO {code}: Preisbasis muss {' oder '.join(PRICE_BASES)} sein")
+    style = Style(code, name, blank_length, blank_width, glue_length, tape_length, price_basis)
+    allowed = set(VARIABLES) | set(CONSTANTS)
+    for field in FIELDS:
+        try:
+            unknown = set(compile(getattr(style, field), field, 'eval').co_names) - allowed
+        except SyntaxError as exc:
+            raise ValueError(f"FEFCO {code}: ungültige Formel für {field}: {exc.msg}") from None
+        if unknown:
+            raise ValueError(f"FEFCO {code}: unbekannte Namen in {field}: {', '.join(sorted(unknown))}")
+    STYLES[code] = style
+    compile_styles.cache_clear()
+    return style
+
+
+@lru_cache(maxsize=32)
+def compile_styles(codes, fields=FIELDS):
+    """
+    Kompiliert die Formeln der Bauarten codes (Tupel) zu einer einzigen Funktion
+
+    evaluate(L, B, H, t, h) liefert je Bauart ein Tupel der Werte von fields
+    (Standard: blank_length, blank_width, glue_length, tape_length).
+    """
+    rows = ',\n        '.join(f"({', '.join(getattr(STYLES[code], field) for field in fields)},)"
+                              for code in codes)
+    source = f"def evaluate(L, B, H, t, h):\n    return (\n        {rows},\n    )\n"
+    namespace = dict(CONSTANTS)
+    exec(compile(source, f"<FEFCO {', '.join(codes)}>", 'exec'), namespace)
+    return namespace['evaluate']
+
+
+def blank_dimensions(code, L, B, H, t):
+    """Zuschnittmaße und Fläche (m²) einer Bauart, elementweise"""
+    blank_length, blank_width = compile_styles((code,), ('blank_length', 'blank_width'))(L, B, H, t, 1)[0]
+    return {
+        'blank_length': blank_length,
+        'blank_width': blank_width,
+        'area_m2': (blank_length / 1000) * (blank_width / 1000),
+    }
+
+
+def compare_styles(L, B, H, t, board_price_per_m2, tape_price_per_m, hotmelt_price_per_kg, hotmelt_usage,
+                   h_pattern=True, codes=None):
+    """
+    Stückkosten aller (bzw. der angegebenen) Bauarten in einem Durchlauf
+
+    Material = Zuschnittfläche × Bogenpreis, Verschluss = Klebeband + Hotmelt.
+    board_price_per_m2: ein Preis für alle oder (bei Skalar-Eingaben) eine
+    Folge mit einem Preis je Bauart in der Reihenfolge von codes.
+    Rückgabe: dict mit 'codes' und Arrays der Form (Bauarten, *Eingabeform).
+    """
+    import numpy as np
+
+    codes = tuple(codes or STYLES)
+    shape = np.broadcast_shapes(*(np.shape(v) for v in (L, B, H, t, h_pattern)))
+    evaluated = compile_styles(codes)(L, B, H, t, h_pattern)
+    # Konstante Ausdrücke (z.B. '0') auf die Eingabeform bringen
+    values = np.stack([np.broadcast_to(np.asarray(v, dtype=float), shape) for row in evaluated for v in row])
+    values = values.reshape(len(codes), 4, *shape)
+    blank_length, blank_width, glue_length, tape_length = (values[:, i] for i in range(4))
+
+    area_m2 = (blank_length / 1000) * (blank_width / 1000)
+    material_cost = area_m2 * np.asarray(board_price_per_m2, dtype=float)
+    tape_cost = tape_length / 1000 * tape_price_per_m
+    hotmelt_cost = glue_length / 1000 * hotmelt_usage / 1000 * hotmelt_price_per_kg
+    return {
+        'codes': codes,
+        'blank_length': blank_length,
+        'blank_width': blank_width,
+        'area_m2': area_m2,
+        'glue_length_m': glue_length / 1000,
+        'tape_length_m': tape_length / 1000,
+        'material_cost': material_cost,
+        'closure_cost': tape_cost + hotmelt_cost,
+        'total_cost': material_cost + tape_cost + hotmelt_cost,
+    }
+
+
+def rank_styles(inputs, board_price_per_m2=None, codes=None):
+    """
+    Rangliste der Bauarten für ein Angebot (QuoteInputs), günstigste zuerst
+
+    Ohne board_price_per_m2 gilt je Bauart ihre Preisbasis: der Bogenpreis aus
+    dem RSC-Preis je 1000 und der RSC-Zuschnittfläche bzw. für Wrap-Around-Bauarten
+    aus dem WA-Preis je 1000 und der WA-Zuschnittfläche. RSC und Wrap-Around
+    kosten dann genau wie im Angebot.
+    """
+    codes = tuple(codes or STYLES)
+    if board_price_per_m2 is None:
+        dims = (inputs.length, inputs.width, inputs.height, inputs.material_thickness)
+        basis = {
+            'rsc': inputs.rsc_price_per_1000 / 1000 / blank_dimensions('0201', *dims)['area_m2'],
+            'wa': inputs.wa_price_per_1000 / 1000 / blank_dimensions('0409', *dims)['area_m2'],
+        }
+        board_price_per_m2 = [basis[STYLES[code].price_basis] for code in codes]
+    result = compare_styles(inputs.length, inputs.width, inputs.height, inputs.material_thickness,
+                            board_price_per_m2, inputs.tape_price_per_roll / inputs.tape_length_per_roll,
+                            inputs.hotmelt_price_per_kg, inputs.hotmelt_usage,
+                            is_h_pattern(inputs.tape_pattern), codes)
+    rows = [{
+        'code': code,
+        'name': STYLES[code].name,
+        **{key: float(result[key][i]) for key in ('blank_length', 'blank_width', 'area_m2', 'glue_length_m',
+                                                   'tape_length_m', 'material_cost', 'closure_cost', 'total_cost')},
+    } for i, code in enumerate(result['codes'])]
+    return sorted(rows, key=lambda row: row['total_cost'])
+
+
+# Bogenbreite wie beim RSC-Modell (B + 2H): Klappen je Seite B/2, bei FOL B, beim Automatikboden 3B/4;
+# Klebeband-Verschluss je Klappenseite wie bei tape_cost_rsc
+_TAPE_CLOSURE = "(h * (L + 2 * B + tape_overhang_h) + (1 - h) * (B + tape_overhang_simple))"
+
+register_style('0200', "Halbe Faltschachtel (ohne Deckelklappen)",
+               "2 * L + 2 * B + 4 * t + manufacturer_flap + trim_allowance",
+               "B / 2 + 2 * H + 4 * t + trim_allowance",
+               tape_length=_TAPE_CLOSURE)
+register_style('0201', "Faltschachtel (RSC)",
+               "2 * L + 2 * B + 4 * t + manufacturer_flap + trim_allowance",
+               "B + 2 * H + 4 * t + trim_allowance",
+               tape_length=f"2 * {_TAPE_CLOSURE}")
+register_style('0203', "Faltschachtel mit überlappenden Klappen (FOL)",
+               "2 * L + 2 * B + 4 * t + manufacturer_flap + trim_allowance",
+               "2 * B + 2 * H + 4 * t + trim_allowance",
+               tape_length="2 * (L + tape_overhang_simple)")
+register_style('0409', "Wrap-Around",
+               "2 * L + 2 * B + overlap",
+               "B + 2 * H",
+               glue_length="H + 2 * (L + B)",
+               price_basis='wa')
+register_style('0427', "Versandverpackung mit Steckverschluss (Mailer)",
+               "L + 4 * H + 4 * t + trim_allowance",
+               "2 * B + 3 * H + 6 * t + trim_allowance")
+register_style('0711', "Faltschachtel mit Automatikboden",
+               "2 * L + 2 * B + 4 * t + manufacturer_flap + trim_allowance",
+               "B / 2 + 3 * B / 4 + 2 * H + 4 * t + trim_allowance",
+               glue_length="H + B",
+               tape_length=_TAPE_CLOSURE)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Lasttest mit gleichzeitigen Sitzungen gegen einen lokalen Streamlit-Server
+
+Startet app.py als Streamlit-Server (oder nutzt einen laufenden über --url)
+und spielt je Stufe N Browser-Sitzungen gleichzeitig ab. Jede Sitzung spricht
+das Websocket-Protokoll des Browsers (/_stcore/stream): erster Lauf, dann
+eine realistische Folge von Sidebar-Eingaben und Ansichtswechseln, nach
+jeder Eingabe wird bis zum Ende des Reruns (script_finished) gewartet.
+
+Ausgabe je Stufe: Rerun-Latenz (p50/p90/p99), Durchsatz, CPU-Zeit und
+Speicherzuwachs des Serverprozesses je Sitzung (aus /proc, nur Linux) sowie
+der Sättigungspunkt: die erste Stufe, ab der Reruns sich stauen (p90 mehr
+als latency_factor × p90 der kleinsten Stufe oder kaum noch Durchsatzgewinn).
+
+Beispiel:
+    python loadtest.py --sessions 1 2 4 8 16 --json loadtest.json
+    python loadtest.py --url ws://127.0.0.1:8501 --sessions 4 8 --think-time 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from carton_cost import BEAD_OPTIONS, FLUTE_OPTIONS, TAPE_PATTERNS
+
+# Eingabefolge einer Sitzung: (Beschriftung des Widgets, Wert wie im Browser angezeigt)
+SCENARIO = (
+    ('Länge (mm)', 500.0),
+    ('Breite (mm)', 350.0),
+    ('Wellpappe-Typ', FLUTE_OPTIONS[0][0]),
+    ('Ansicht', ['📈 Visualisierung']),
+    ('Höhe (mm)', 250.0),
+    ('Verschlussmuster', TAPE_PATTERNS[1]),
+    ('Ansicht', ['📐 Technische Details']),
+    ('Raupenbreite', BEAD_OPTIONS[2][0]),
+    ('Auflage', '100.000'),
+    ('Ansicht', ['💾 Export']),
+    ('Länge (mm)', 400.0),
+    ('Ansicht', ['📊 Kostenvergleich']),
+)
+# Jede Sitzung variiert die Maße, damit nicht alle Reruns aus demselben Cache-Eintrag kommen
+SESSION_DIMENSION_OFFSET = 10
+DIMENSION_LABELS = ('Länge (mm)', 'Breite (mm)', 'Höhe (mm)')
+
+DEFAULT_SESSIONS = (1, 2, 4, 8, 16)
+DEFAULT_LATENCY_FACTOR = 2.0
+DEFAULT_MIN_GAIN = 0.1
+
+
+class Session:
+    """Eine Browser-Sitzung: Widget-Zustände wie der Browser, Reruns über den Websocket"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.widgets = {}   # Beschriftung -> (Elementtyp, Widget-ID)
+        self.states = {}    # Widget-ID -> WidgetState
+        self.errors = 0
+
+    async def rerun(self, timeout):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await asyncio.wait_for(self.ws.recv(), timeout))
+            kind = forward.WhichOneof('type')
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                self._register(forward.delta.new_element)
+            elif kind == 'script_finished':
+                return time.perf_counter() - start
+
+    def _register(self, element):
+        element_type = element.WhichOneof('type')
+        if element_type == 'exception':
+            self.errors += 1
+            return
+        widget = getattr(element, element_type)
+        widget_id = getattr(widget, 'id', '')
+        if widget_id and getattr(widget, 'label', ''):
+            self.widgets[widget.label] = (element_type, widget_id)
+
+    def set_value(self, label, value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        if label not in self.widgets:
+            raise KeyError(f"Widget '{label}' nicht gefunden")
+        element_type, widget_id = self.widgets[label]
+        state = WidgetState(id=widget_id)
+        if element_type == 'number_input':
+            state.double_value = value
+        elif element_type == 'button_group':
+            state.string_array_value.data.extend(value)
+        else:
+            state.string_value = value
+        self.states[widget_id] = state
+
+
+def session_steps(index, scenario=SCENARIO):
+    """Eingabefolge der index-ten Sitzung (Maße je Sitzung versetzt)"""
+    offset = (index % 20) * SESSION_DIMENSION_OFFSET
+    return [(label, value + offset if label in DIMENSION_LABELS else value) for label, value in scenario]
+
+
+async def run_session(url, index, steps, think_time, timeout):
+    """Spielt eine Sitzung ab; Rückgabe: (Rerun-Latenzen in s, Anzahl App-Fehler)"""
+    import websockets
+
+    origin = url.replace('ws://', 'http://').replace('wss://', 'https://')
+    async with websockets.connect(f"{url}/_stcore/stream", subprotocols=['streamlit'], origin=origin,
+                                  max_size=None) as ws:
+        session = Session(ws)
+        latencies = [await session.rerun(timeout)]
+        for label, value in steps:
+            await asyncio.sleep(think_time)
+            session.set_value(label, value)
+            latencies.append(await session.rerun(timeout))
+    return latencies, session.errors
+
+
+class ProcessSampler:
+    """CPU-Zeit und RSS eines Prozesses aus /proc; der Spitzenwert wird im Hintergrund mitgeschrieben"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.peak_rss = 0
+
+    def cpu_seconds(self):
+        with open(f'/proc/{self.pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+    def rss_bytes(self):
+        with open(f'/proc/{self.pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    async def watch(self, interval=0.05):
+        while True:
+            self.peak_rss = max(self.peak_rss, self.rss_bytes())
+            await asyncio.sleep(interval)
+
+
+def percentile(values, q):
+    """q-Perzentil (0–100) mit linearer Interpolation"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+async def run_level(url, sessions, steps=SCENARIO, think_time=0.0, timeout=120, pid=None):
+    """Eine Laststufe mit sessions gleichzeitigen Sitzungen; Rückgabe: Kennzahlen als dict"""
+    sampler = ProcessSampler(pid) if pid else None
+    if sampler:
+        rss_before, cpu_before = sampler.rss_bytes(), sampler.cpu_seconds()
+        sampler.peak_rss = rss_before
+        watcher = asyncio.ensure_future(sampler.watch())
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(run_session(url, i, session_steps(i, steps), think_time, timeout)
+                                         for i in range(sessions)))
+    finally:
+        if sampler:
+            watcher.cancel()
+    wall = time.perf_counter() - start
+    latencies = [latency for session_latencies, _ in results for latency in session_latencies]
+    level = {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'errors': sum(errors for _, errors in results),
+        'p50_s': percentile(latencies, 50),
+        'p90_s': percentile(latencies, 90),
+        'p99_s': percentile(latencies, 99),
+        'max_s': max(latencies),
+        'throughput_per_s': len(latencies) / wall,
+        'wall_s': wall,
+    }
+    if sampler:
+        level['cpu_per_session_s'] = (sampler.cpu_seconds() - cpu_before) / sessions
+        level['rss_mb'] = sampler.peak_rss / 2 ** 20
+        level['rss_per_session_mb'] = max(0, sampler.peak_rss - rss_before) / 2 ** 20 / sessions
+    return level
+
+
+def find_saturation(levels, latency_factor=DEFAULT_LATENCY_FACTOR, min_gain=DEFAULT_MIN_GAIN):
+    """
+    Erste Stufe (Anzahl Sitzungen), ab der sich Reruns stauen, sonst None
+
+    Gestaut: p90 über latency_factor × p90 der kleinsten Stufe, oder der
+    Durchsatz steigt gegenüber der vorigen Stufe um weniger als min_gain.
+    """
+    levels = sorted(levels, key=lambda level: level['sessions'])
+    if not levels:
+        return None
+    baseline = levels[0]['p90_s']
+    for previous, level in zip(levels, levels[1:]):
+        if (level['p90_s'] > latency_factor * baseline
+                or level['throughput_per_s'] < (1 + min_gain) * previous['throughput_per_s']):
+            return level['sessions']
+    return None
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, script='app.py', timeout=60):
+    """Startet app.py headless auf 127.0.0.1:port und wartet auf /_stcore/health"""
+    env = {**os.environ, 'STREAMLIT_BROWSER_GATHER_USAGE_STATS': 'false'}
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', script, '--server.headless=true',
+         f'--server.port={port}', '--server.address=127.0.0.1', '--server.fileWatcherType=none'],
+        cwd=Path(__file__).parent, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Streamlit-Server beendet (Exit-Code {process.returncode})")
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Streamlit-Server antwortet nicht")
+
+
+def run(sessions=DEFAULT_SESSIONS, url=None, steps=SCENARIO, think_time=0.0, timeout=120, pid=None):
+    """Alle Laststufen nacheinander; startet ohne url einen eigenen Server"""
+    process = None
+    if url is None:
+        port = free_port()
+        process = start_server(port)
+        url, pid = f'ws://127.0.0.1:{port}', process.pid
+    try:
+        # Aufwärmen: Lazy-Importe der Ansichten zählen nicht zur ersten Stufe
+        asyncio.run(run_level(url, 1, steps, timeout=timeout))
+        return [asyncio.run(run_level(url, n, steps, think_time, timeout, pid)) for n in sessions]
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lasttest des Karton-Kostenrechners mit gleichzeitigen Sitzungen")
+    parser.add_argument('--sessions', nargs='+', type=int, default=list(DEFAULT_SESSIONS),
+                        help="Gleichzeitige Sitzungen je Stufe")
+    parser.add_argument('--url', help="Laufender Server (ws://host:port), sonst wird app.py gestartet")
+    parser.add_argument('--pid', type=int, help="Prozess-ID des laufenden Servers für CPU und Speicher")
+    parser.add_argument('--steps', type=int, default=len(SCENARIO), help="Eingaben je Sitzung (Szenario wird wiederholt)")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Pause vor jeder Eingabe (s)")
+    parser.add_argument('--timeout', type=float, default=120, help="Höchstdauer eines Reruns (s)")
+    parser.add_argument('--latency-factor', type=float, default=DEFAULT_LATENCY_FACTOR)
+    parser.add_argument('--min-gain', type=float, default=DEFAULT_MIN_GAIN)
+    parser.add_argument('--json', help="Ergebnisse zusätzlich als JSON-Datei")
+    args = parser.parse_args(argv)
+
+    steps = [SCENARIO[i % len(SCENARIO)] for i in range(args.steps)]
+    levels = run(args.sessions, args.url, steps, args.think_time, args.timeout, args.pid)
+
+    print(f"{'Sitzungen':>9} {'Reruns':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'Reruns/s':>9} "
+          f"{'CPU s/Sitz.':>11} {'MB/Sitz.':>9} {'Fehler':>6}", file=sys.stderr)
+    for level in levels:
+        print(f"{level['sessions']:>9} {level['reruns']:>7} {level['p50_s'] * 1000:>8.0f} "
+              f"{level['p90_s'] * 1000:>8.0f} {level['p99_s'] * 1000:>8.0f} {level['throughput_per_s']:>9.1f} "
+              f"{level.get('cpu_per_session_s', float('nan')):>11.2f} "
+              f"{level.get('rss_per_session_mb', float('nan')):>9.1f} {level['errors']:>6}", file=sys.stderr)
+    saturation = find_saturation(levels, args.latency_factor, args.min_gain)
+    print(f"Sättigung ab {saturation} gleichzeitigen Sitzungen" if saturation
+          else "Sättigung im gemessenen Bereich nicht erreicht", file=sys.stderr)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({'levels': levels, 'saturation_sessions': saturation}, indent=2),
+                                   encoding='utf-8')
+    return 1 if any(level['errors'] for level in levels) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests für die HTTP/JSON-Schnittstelle
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import api
+from carton_cost.lookup import CostLookup
+
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    lookup = CostLookup(tmp_path_factory.mktemp('lookup'))
+    server = api.QuoteServer(('127.0.0.1', 0), workers=2, lookup=lookup)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _post(url, payload):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return response.read()
+
+
+def test_single_quote(server):
+    body = json.loads(_post(server + '/quote', {'length': 400, 'width': 300, 'height': 200}))
+    assert body['rsc_blank']['blank_length'] == 1459
+    assert round(body['cost_diff_per_box'], 4) == round(0.6971 - 0.5646, 4)
+
+
+def test_lookup_quote_matches_exact_quote(server):
+    payload = {'length': 437, 'width': 281, 'height': 133}
+    exact = json.loads(_post(server + '/quote', payload))
+    body = json.loads(_post(server + '/quote/lookup', payload))
+    assert body['cost_diff_per_box'] == pytest.approx(exact['cost_diff_per_box'], abs=1e-12)
+    assert abs(body['rsc_area_m2'] - exact['rsc_blank']['area_m2']) <= body['error_bound']['rsc_area_m2']
+
+
+def test_invalid_quote_returns_400(server):
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _post(server + '/quote', {'length': 'breit'})
+    assert exc.value.code == 400
+    assert 'length' in json.loads(exc.value.read())['error']
+
+
+@pytest.mark.parametrize('body', [b'{"length": NaN}', b'{"width": Infinity}', b'{"height": 1' + b'0' * 400 + b'}'])
+def test_non_finite_values_return_400(server, body):
+    request = urllib.request.Request(server + '/quote', data=body, headers={'Content-Type': 'application/json'})
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        urllib.request.urlopen(request, timeout=60)
+    assert exc.value.code == 400
+    assert 'endliche Zahl' in json.loads(exc.value.read())['error']
+
+
+def test_bulk_quote_streams_all_rows_in_order(server, monkeypatch):
+    monkeypatch.setattr(api, 'BULK_CHUNK_ROWS', 100)
+    items = [{'length': 100 + i, 'width': 200, 'height': 150} for i in range(250)]
+    lines = _post(server + '/quotes/bulk', {'defaults': {'material_thickness': 2.5}, 'items': items}).splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [row['length'] for row in rows] == [item['length'] for item in items]
+    single = json.loads(_post(server + '/quote', {**items[-1], 'material_thickness': 2.5}))
+    assert rows[-1]['wa_total_cost'] == single['wa_total_cost']
+
+
+def test_bulk_quote_uses_tape_pattern_per_item(server):
+    items = [{'tape_pattern': 'Einfach'}, {'tape_pattern': True}, {'length': 500, 'tape_pattern': False}, {}]
+    rows = [json.loads(line) for line in _post(server + '/quotes/bulk', {'items': items}).splitlines()]
+    for item, row in zip(items, rows):
+        single = json.loads(_post(server + '/quote', item))
+        assert row['rsc_tape_length_m'] == single['rsc_tape_cost']['tape_length_m']
+        assert row['rsc_total_cost_tape'] == single['rsc_total_cost_tape']
+    assert rows[0]['rsc_tape_length_m'] < rows[1]['rsc_tape_length_m']
+
+
+def test_unknown_tape_pattern_returns_400(server):
+    for path, payload in (('/quote', {'tape_pattern': 'Kreuz'}), ('/quotes/bulk', {'items': [{'tape_pattern': 'h'}]})):
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            _post(server + path, payload)
+        assert exc.value.code == 400
+        assert 'tape_pattern' in json.loads(exc.value.read())['error']
+
+
+def test_metrics_endpoint(server):
+    _post(server + '/quote', {'length': 410})
+    with urllib.request.urlopen(server + '/metrics', timeout=10) as response:
+        assert response.headers['Content-Type'].startswith('text/plain')
+        text = response.read().decode('utf-8')
+    assert 'carton_api_requests_total{route="/quote",status="200"}' in text
+    assert 'carton_api_request_seconds_count{route="/quote"}' in text
+    assert 'carton_api_quote_cache_misses' in text
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Smoke-Tests für die Streamlit-Oberfläche (headless über AppTest)
+"""
+
+from streamlit.testing.v1 import AppTest
+
+
+def _run_app():
+    return AppTest.from_file('app.py', default_timeout=60).run()
+
+
+def test_app_renders_default_quote():
+    at = _run_app()
+    assert not at.exception
+    metrics = {m.label: m.value for m in at.metric}
+    assert metrics['Gesamtkosten/Box (Tape)'] == '0.6971 €'
+    assert metrics['Gesamtkosten/Box'] == '0.5646 €'
+
+
+def test_reverted_input_renders_same_result():
+    at = _run_app()
+    before = [m.value for m in at.metric]
+    at.sidebar.number_input[0].set_value(500).run()
+    assert [m.value for m in at.metric] != before
+    at.sidebar.number_input[0].set_value(400).run()
+    assert not at.exception
+    assert [m.value for m in at.metric] == before
+
+
+def test_only_selected_view_is_rendered():
+    headers = ["Kostenvergleich", "Export", "Szenarien", "Break-even"]
+    at = _run_app()
+    assert [h for h in headers if h in [e.value for e in at.header]] == ["Kostenvergleich"]
+    for view, header in (("💾 Export", "Export"), ("📚 Szenarien", "Szenarien"), ("⚖️ Break-even", "Break-even")):
+        at.session_state['view'] = view
+        at.run()
+        assert not at.exception
+        assert [h for h in headers if h in [e.value for e in at.header]] == [header]
+
+
+def test_result_tables_stay_numeric():
+    at = _run_app()
+    comparison, volumes = at.dataframe[0].value, at.dataframe[1].value
+    assert comparison['RSC'].dtype == volumes['Ersparnis (€)'].dtype == 'float64'
+    assert volumes['Volumen'].tolist() == [1000, 10000, 100000, 1000000]
+    assert comparison['Differenz'].iloc[0] == 55.0
+
+
+def test_catalog_upload_sends_only_visible_page():
+    catalog = "length;width;height;flute\n" + "".join(f"{200 + i};{150 + i % 50};100;C\n" for i in range(120))
+    at = _run_app()
+    at.session_state['view'] = "📦 Katalog"
+    at.run()
+    at.file_uploader[0].set_value(('katalog.csv', catalog.encode('utf-8'), 'text/csv')).run()
+    assert not at.exception
+    assert len(at.dataframe[0].value) == 50
+
+    at.selectbox(key='catalog_sort').set_value('length')
+    at.toggle(key='catalog_descending').set_value(True)
+    at.number_input(key='catalog_page').set_value(3).run()
+    assert not at.exception
+    assert at.dataframe[0].value['length'].tolist() == list(range(219, 199, -1))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests für die vektorisierte Batch-Berechnung
+Prüft, dass Batch- und Einzelwert-Pfad dieselben Ergebnisse liefern
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from carton_cost import TAPE_PATTERN_H, TAPE_PATTERN_SIMPLE, calculate_quote
+from carton_cost import batch
+
+
+def _random_catalog(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'length': rng.integers(50, 2001, n),
+        'width': rng.integers(50, 2001, n),
+        'height': rng.integers(20, 1001, n),
+        'material_thickness': rng.choice([1.5, 2.5, 3.5, 6.0], n),
+        'rsc_price_per_1000': rng.uniform(100, 2000, n).round(2),
+        'wa_price_per_1000': rng.uniform(100, 2000, n).round(2),
+        'tape_pattern': rng.choice([TAPE_PATTERN_H, TAPE_PATTERN_SIMPLE], n),
+    })
+
+
+def test_documented_example():
+    result = batch.calculate_batch(400, 300, 200, 3.5, 610.0, 555.0, 2.5, 66,
+                                   TAPE_PATTERN_H, 3.0, 2.0)
+    assert result['rsc_blank_length'][()] == 1459
+    assert result['rsc_blank_width'][()] == 734
+    assert result['wa_blank_length'][()] == 1475
+    assert result['wa_blank_width'][()] == 700
+    assert abs(result['rsc_area_m2'][()] - 1.070906) < 1e-6
+    assert abs(result['wa_area_m2'][()] - 1.0325) < 1e-6
+
+
+def test_batch_matches_scalar_path():
+    df = _random_catalog(500)
+    result = batch.calculate_batch_frame(df, tape_price_per_roll=2.5, tape_length_per_roll=66,
+                                         hotmelt_price_per_kg=3.0, hotmelt_usage=2.0)
+
+    for row in result.itertuples(index=False):
+        quote = calculate_quote(row.length, row.width, row.height, row.material_thickness,
+                                row.rsc_price_per_1000, row.wa_price_per_1000,
+                                2.5, 66, row.tape_pattern, 3.0, 2.0)
+
+        assert row.rsc_area_m2 == quote['rsc_blank']['area_m2']
+        assert row.wa_area_m2 == quote['wa_blank']['area_m2']
+        assert row.rsc_tape_cost == quote['rsc_tape_cost']['cost_per_box']
+        assert row.wa_hotmelt_cost == quote['wa_hotmelt_cost']['cost_per_box']
+        assert row.rsc_hotmelt_cost == quote['rsc_hotmelt_cost']['cost_per_box']
+        assert row.cost_diff_per_box == quote['cost_diff_per_box']
+        assert row.area_savings_pct == quote['area_savings_pct']
+
+
+def test_missing_column_without_default():
+    df = _random_catalog(3)
+    with pytest.raises(KeyError, match='tape_price_per_roll'):
+        batch.calculate_batch_frame(df)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests für die Benchmark-Historie und die Regressionsprüfung
+"""
+
+import json
+
+import benchmark
+
+
+def _run(values, machine='m'):
+    return {'timestamp': '', 'machine': machine,
+            'results': [benchmark._result(name, value, 'x', name.endswith('throughput'))
+                        for name, value in values.items()]}
+
+
+def test_find_regressions_uses_median_per_machine():
+    history = [_run({'throughput': v, 'latency': 1.0}) for v in (100, 110, 90)]
+    history.append(_run({'throughput': 1000}, machine='other'))
+
+    ok = [benchmark._result('throughput', 80, 'x', True), benchmark._result('latency', 1.2, 'x', False)]
+    assert benchmark.find_regressions(history, ok, 'm', threshold=0.25) == []
+
+    slow = [benchmark._result('throughput', 70, 'x', True), benchmark._result('latency', 1.3, 'x', False)]
+    names = [r['name'] for r in benchmark.find_regressions(history, slow, 'm', threshold=0.25)]
+    assert names == ['throughput', 'latency']
+    # Unbekannte Messgrößen und fremde Maschinen haben keine Vergleichsbasis
+    assert benchmark.find_regressions(history, slow, 'neu') == []
+
+
+def test_main_records_history_and_fails_on_regression(tmp_path):
+    history = tmp_path / 'history.json'
+    args = ['--only', 'scalar', 'bulk', '--max-rows', '10000', '--repeat', '1', '--history', str(history)]
+    assert benchmark.main(args) == 0
+    runs = json.loads(history.read_text())
+    assert [r['name'] for r in runs[0]['results']] == [
+        'scalar.calculate_quote', 'bulk.calculate_batch.1000', 'bulk.calculate_batch.10000']
+
+    for result in runs[0]['results']:
+        result['value'] *= 100
+    history.write_text(json.dumps(runs))
+    assert benchmark.main(args) == 1
+    assert len(json.loads(history.read_text())) == 1
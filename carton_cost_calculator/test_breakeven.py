@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests für die Break-even-Rechnung mit Fixkosten
+"""
+
+import numpy as np
+import pytest
+
+from carton_cost import DEFAULT_INPUTS, calculate_quote, normalize_inputs
+from carton_cost.breakeven import FixedCosts, break_even, break_even_grid, net_savings
+
+INPUTS = normalize_inputs(**DEFAULT_INPUTS)
+
+
+def test_closed_form_break_even():
+    costs = FixedCosts(wa_machine_cost=100_000, rsc_machine_cost=20_000, tooling_cost=0,
+                       wa_changeover_cost=150, rsc_changeover_cost=50, run_size=10_000, annual_volume=400_000)
+    result = break_even(0.11, costs)
+    # 0,11 € − 100 € / 10.000 = 0,10 € je Box, 80.000 € / 0,10 € = 800.000 Boxen = 2 Jahre
+    assert result['net_savings_per_box'] == pytest.approx(0.10)
+    assert result['break_even_volume'] == pytest.approx(800_000)
+    assert result['payback_months'] == pytest.approx(24)
+    assert net_savings(0.11, result['break_even_volume'], costs) == pytest.approx(0, abs=1e-6)
+
+
+def test_no_savings_never_breaks_even():
+    result = break_even(np.array([-0.05, 0.0, 0.2]), FixedCosts())
+    assert np.isinf(result['break_even_volume'][:2]).all()
+    assert np.isfinite(result['payback_months'][2])
+    # Ohne Investition amortisiert sich jede Umstellung mit Ersparnis sofort
+    free = FixedCosts(wa_machine_cost=0, rsc_machine_cost=0, tooling_cost=0, wa_changeover_cost=0,
+                      rsc_changeover_cost=0)
+    np.testing.assert_array_equal(break_even(np.array([-0.05, 0.0, 0.2]), free)['break_even_volume'],
+                                  [np.inf, 0.0, 0.0])
+    with pytest.raises(ValueError, match="Losgröße"):
+        break_even(0.1, FixedCosts(run_size=0))
+
+
+def test_grid_matches_pointwise_quotes():
+    x_levels, y_levels, result = break_even_grid(INPUTS, x='length', y='width', points=21)
+    assert result['break_even_volume'].shape == (21, 21)
+    for i, j in ((0, 0), (5, 17), (20, 20)):
+        quote = calculate_quote(*INPUTS._replace(length=x_levels[j], width=y_levels[i]))
+        expected = break_even(quote['cost_diff_per_box'])
+        assert result['break_even_volume'][i, j] == pytest.approx(float(expected['break_even_volume']))
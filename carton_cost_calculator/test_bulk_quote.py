@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests für die Sammelkalkulation per CLI
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import bulk_quote
+from carton_cost import calculate_quote
+
+
+def _catalog(n):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        'length': rng.integers(50, 2001, n),
+        'width': rng.integers(50, 2001, n),
+        'height': rng.integers(20, 1001, n),
+        'flute': rng.choice(['B', 'C', 'E', 'BC'], n),
+        'hotmelt_bead_width': rng.choice([1.5, 3.0, 5.0], n),
+    })
+
+
+def test_csv_to_parquet_in_chunks_with_workers(tmp_path):
+    source = tmp_path / 'katalog.csv'
+    target = tmp_path / 'ergebnis.parquet'
+    _catalog(1000).to_csv(source, index=False)
+
+    rows = bulk_quote.run(source, target, chunk_rows=128, workers=2,
+                          defaults={'rsc_price_per_1000': 700.0})
+    result = pd.read_parquet(target)
+
+    assert rows == len(result) == 1000
+    row = result.iloc[-1]
+    quote = calculate_quote(row.length, row.width, row.height, row.material_thickness,
+                            700.0, 555.0, 2.5, 66, 'H-Muster (empfohlen)', 3.0, row.hotmelt_usage)
+    assert row.cost_diff_per_box == quote['cost_diff_per_box']
+
+
+def test_parquet_to_csv_matches_single_pass(tmp_path):
+    source = tmp_path / 'katalog.parquet'
+    _catalog(300).to_parquet(source)
+
+    bulk_quote.main([str(source), str(tmp_path / 'a.csv'), '--chunk-rows', '50'])
+    bulk_quote.main([str(source), str(tmp_path / 'b.csv'), '--chunk-rows', '1000'])
+
+    chunked = pd.read_csv(tmp_path / 'a.csv')
+    single = pd.read_csv(tmp_path / 'b.csv')
+    pd.testing.assert_frame_equal(chunked, single)
+    assert set(chunked['hotmelt_usage']) <= {0.5, 2.0, 6.67}
+
+
+def test_price_matrix_sets_material_prices_from_area(tmp_path):
+    source = tmp_path / 'katalog.csv'
+    catalog = _catalog(200).assign(grade=np.where(np.arange(200) % 2, 'TT125', 'KK180'), quantity=5000)
+    catalog.to_csv(source, index=False)
+    matrix_path = str(Path(__file__).with_name('board_prices.example.csv'))
+
+    bulk_quote.main([str(source), str(tmp_path / 'ergebnis.csv'), '--price-matrix', matrix_path])
+    result = pd.read_csv(tmp_path / 'ergebnis.csv')
+    matrix = bulk_quote.read_price_matrix(matrix_path)
+    for row in result.head(10).itertuples():
+        order_m2 = row.rsc_area_m2 * 5000
+        price = matrix.price_per_m2(row.grade, row.material_thickness, order_m2)
+        assert row.rsc_price_per_1000 == pytest.approx(row.rsc_area_m2 * price * 1000)
+        assert row.rsc_material_cost == pytest.approx(row.rsc_price_per_1000 / 1000)
@@ -4,28 +4,7 @@ Test-Skript für die Karton-Berechnungen
 Validiert die Formeln ohne Streamlit-UI
 """
 
-def calculate_rsc_blank_dimensions(L, B, H, t):
-    manufacturer_flap = 25
-    trim_allowance = 20
-    blank_length = 2 * L + 2 * B + 4 * t + manufacturer_flap + trim_allowance
-    blank_width = B + 2 * H + 4 * t + trim_allowance
-    area_m2 = (blank_length / 1000) * (blank_width / 1000)
-    return {
-        'blank_length': blank_length,
-        'blank_width': blank_width,
-        'area_m2': area_m2
-    }
-
-def calculate_wraparound_blank_dimensions(L, B, H, t):
-    overlap = 75
-    blank_length = 2 * L + 2 * B + overlap
-    blank_width = B + 2 * H
-    area_m2 = (blank_length / 1000) * (blank_width / 1000)
-    return {
-        'blank_length': blank_length,
-        'blank_width': blank_width,
-        'area_m2': area_m2
-    }
+from carton_cost import calculate_rsc_blank_dimensions, calculate_wraparound_blank_dimensions
 
 # Test mit Beispielwerten aus der Dokumentation
 print("=" * 60)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests für Katalog-Einlesen und den seitenweisen Ergebnispuffer
+"""
+
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from carton_cost import DEFAULT_INPUTS
+from carton_cost.catalog import ResultGrid, cost_catalog, read_catalog
+
+
+def _catalog(n):
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({
+        'sku': [f"ART-{i:05d}" for i in range(n)],
+        'length': rng.integers(50, 2001, n),
+        'width': rng.integers(50, 2001, n),
+        'height': rng.integers(20, 1001, n),
+        'flute': rng.choice(['B', 'C', 'E', 'BC'], n),
+    })
+
+
+def test_read_csv_and_excel():
+    df = _catalog(20).assign(height=lambda d: d['height'] + 0.5)
+    german = df.to_csv(sep=';', decimal=',', index=False).encode('utf-8')
+    pd.testing.assert_frame_equal(read_catalog(german, 'katalog.csv'), df)
+
+    excel = io.BytesIO()
+    df.to_excel(excel, index=False)
+    pd.testing.assert_frame_equal(read_catalog(excel.getvalue(), 'Katalog.XLSX'), df)
+
+
+def test_pages_match_pandas_filter_and_sort():
+    result = cost_catalog(_catalog(5000), DEFAULT_INPUTS)
+    grid = ResultGrid(result)
+    filters = (('cost_diff_per_box', '>=', 0.05), ('flute', 'enthält', 'b'))
+    expected = result[(result['cost_diff_per_box'] >= 0.05) & result['flute'].str.contains('B')]
+    expected = expected.sort_values('rsc_area_m2', ascending=False, kind='stable').reset_index(drop=True)
+
+    page, matches = grid.page(2, 100, filters, 'rsc_area_m2', descending=True)
+    assert matches == len(expected)
+    pd.testing.assert_frame_equal(page, expected.iloc[200:300].reset_index(drop=True))
+    # Alle Blöcke zusammen ergeben die ganze Ansicht
+    pd.testing.assert_frame_equal(pd.concat(grid.frames(filters, 'rsc_area_m2', True, chunk_rows=333),
+                                            ignore_index=True), expected)
+    assert 'sku' not in grid.numeric_columns and 'cost_diff_per_box' in grid.numeric_columns
+
+
+def test_invalid_view_rejected():
+    grid = ResultGrid(cost_catalog(_catalog(10), DEFAULT_INPUTS))
+    with pytest.raises(ValueError, match="Unbekannte Spalte"):
+        grid.view(sort_by='price')
+    with pytest.raises(ValueError, match="Unbekannter Filter"):
+        grid.view((('length', '<>', 1),))
+
+
+def test_view_cache_shared_between_threads():
+    grid = ResultGrid(cost_catalog(_catalog(2000), DEFAULT_INPUTS))
+    expected = {limit: len(grid.view((('length', '>=', limit),))) for limit in range(0, 2000, 100)}
+
+    def matches(i):
+        limit = (i * 100) % 2000
+        return limit, grid.page(0, 10, (('length', '>=', limit),), 'width')[1]
+
+    with ThreadPoolExecutor(8) as pool:
+        assert dict(pool.map(matches, range(400))) == expected
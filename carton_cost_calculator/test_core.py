@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Tests für den UI-freien Berechnungskern
+"""
+
+import subprocess
+import sys
+
+from carton_cost import TAPE_PATTERN_H, calculate_quote
+
+
+def test_import_without_ui_dependencies():
+    code = (
+        "import sys, carton_cost; "
+        "print(','.join(m for m in ('streamlit', 'pandas', 'plotly', 'numpy') if m in sys.modules))"
+    )
+    loaded = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert loaded.stdout.strip() == ''
+
+
+def test_calculate_quote_reference_values():
+    quote = calculate_quote(400, 300, 200, 3.5, 610.0, 555.0, 2.5, 66, TAPE_PATTERN_H, 3.0, 2.0)
+    assert quote['rsc_blank']['blank_length'] == 1459
+    assert quote['wa_blank']['blank_width'] == 700
+    assert round(quote['rsc_total_cost_tape'], 4) == 0.6971
+    assert round(quote['wa_total_cost'], 4) == 0.5646
+    assert quote['cost_diff_per_box'] > 0
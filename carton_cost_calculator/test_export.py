@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests für den blockweisen Export (CSV, Parquet, Arrow IPC, Excel)
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from carton_cost import export
+from carton_cost.export import FrameWriter, export_format, write_frames
+
+
+def _blocks(n, size):
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({'length': rng.integers(50, 2001, n), 'flute': rng.choice(['B', 'C'], n),
+                       'cost_diff_per_box': rng.normal(0.1, 0.05, n)})
+    df.loc[5, 'cost_diff_per_box'] = np.nan
+    return df, [df.iloc[start:start + size] for start in range(0, n, size)]
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet', 'arrow', 'xlsx'])
+def test_blocks_round_trip(tmp_path, fmt):
+    df, blocks = _blocks(500, 64)
+    path = tmp_path / f'ergebnis.{fmt}'
+    assert write_frames(blocks, path, fmt) == 500
+
+    if fmt == 'csv':
+        result = pd.read_csv(path)
+    elif fmt == 'parquet':
+        result = pd.read_parquet(path)
+    elif fmt == 'arrow':
+        with pa.memory_map(str(path)) as source:
+            result = pa.ipc.open_file(source).read_all().to_pandas()
+    else:
+        result = pd.read_excel(path)
+        # xlsxwriter schreibt NaN als Excel-Fehlerwert #NUM!
+        result['cost_diff_per_box'] = pd.to_numeric(result['cost_diff_per_box'], errors='coerce')
+    pd.testing.assert_frame_equal(result, df.reset_index(drop=True), check_dtype=fmt != 'xlsx')
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet', 'arrow', 'xlsx'])
+def test_no_frames_writes_empty_file_with_header(tmp_path, fmt):
+    path = tmp_path / f'leer.{fmt}'
+    assert write_frames([], path, fmt, columns=['sku', 'length']) == 0
+
+    if fmt == 'csv':
+        result = pd.read_csv(path)
+    elif fmt == 'parquet':
+        result = pd.read_parquet(path)
+    elif fmt == 'arrow':
+        with pa.memory_map(str(path)) as source:
+            result = pa.ipc.open_file(source).read_all().to_pandas()
+    else:
+        result = pd.read_excel(path)
+    assert list(result.columns) == ['sku', 'length'] and result.empty
+
+    # Ohne Spaltennamen: trotzdem eine (leere) Datei
+    assert write_frames([], tmp_path / f'ohne.{fmt}', fmt) == 0
+    assert (tmp_path / f'ohne.{fmt}').exists()
+
+
+def test_xlsx_wraps_to_next_sheet(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, 'XLSX_MAX_ROWS', 101)
+    df, blocks = _blocks(250, 30)
+    write_frames(blocks, tmp_path / 'ergebnis.xlsx', 'xlsx')
+    sheets = pd.read_excel(tmp_path / 'ergebnis.xlsx', sheet_name=None)
+    assert list(sheets) == ['Ergebnis', 'Ergebnis 2', 'Ergebnis 3']
+    assert [len(sheet) for sheet in sheets.values()] == [100, 100, 50]
+    pd.testing.assert_frame_equal(pd.concat(sheets.values(), ignore_index=True)[['length', 'flute']],
+                                  df[['length', 'flute']])
+
+
+def test_format_detection():
+    assert export_format('a.feather') == 'arrow'
+    assert export_format('a.bin', 'xlsx') == 'xlsx'
+    with pytest.raises(ValueError, match="Unbekanntes Dateiformat"):
+        FrameWriter('a.txt', 'txt')
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Tests für den Lasttest mit gleichzeitigen Sitzungen
+"""
+
+import pytest
+
+import loadtest
+
+
+def _level(sessions, p90, throughput):
+    return {'sessions': sessions, 'p90_s': p90, 'throughput_per_s': throughput}
+
+
+def test_saturation_point():
+    levels = [_level(1, 0.1, 10), _level(2, 0.1, 19), _level(4, 0.15, 30), _level(8, 0.3, 31)]
+    assert loadtest.find_saturation(levels) == 8
+    assert loadtest.find_saturation(levels[:3]) is None
+    # Latenz staut sich, obwohl der Durchsatz noch steigt
+    assert loadtest.find_saturation([_level(1, 0.1, 10), _level(2, 0.25, 19)]) == 2
+
+
+def test_percentiles_and_session_steps():
+    assert loadtest.percentile([4, 1, 3, 2], 50) == 2.5
+    assert loadtest.percentile([1.0], 99) == 1.0
+    steps = loadtest.session_steps(2)
+    assert steps[0] == ('Länge (mm)', 520.0)
+    assert [label for label, _ in steps] == [label for label, _ in loadtest.SCENARIO]
+
+
+def test_sessions_against_local_server():
+    levels = loadtest.run(sessions=[1, 2], steps=loadtest.SCENARIO[:4])
+    assert [level['sessions'] for level in levels] == [1, 2]
+    for level in levels:
+        assert level['reruns'] == level['sessions'] * 5
+        assert level['errors'] == 0
+        assert level['p50_s'] <= level['p90_s'] <= level['p99_s'] <= level['max_s']
+        assert level['cpu_per_session_s'] > 0
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests für die Ladeplanung
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from carton_cost import DEFAULT_INPUTS, calculate_quote
+from carton_cost.logistics import LoadSpec, layer_pattern, plan_load, plan_loads, truck_pattern
+
+
+def test_known_layer_and_truck_patterns():
+    assert layer_pattern(400, 300, 1200, 800) == 8
+    assert layer_pattern(120, 80, 1200, 800) == 100
+    assert layer_pattern(250, 150, 1200, 1000) == 32
+    # Guillotine-Lagenbild mit gemischter Ausrichtung schlägt jede Einzelausrichtung (9 bzw. 10)
+    assert layer_pattern(300, 200, 1000, 700) > max((1000 // 300) * (700 // 200), (1000 // 200) * (700 // 300))
+    assert truck_pattern(1200, 800, 13600, 2450) == 34
+    assert truck_pattern(1200, 1000, 13600, 2450) == 26
+
+
+def test_folded_rsc_vs_flat_wa():
+    quote = calculate_quote(**DEFAULT_INPUTS)
+    rsc_blank, wa_blank = quote['rsc_blank'], quote['wa_blank']
+    rsc = plan_load(rsc_blank['blank_length'], rsc_blank['blank_width'], 3.5, 10000, 'rsc')
+    wa = plan_load(wa_blank['blank_length'], wa_blank['blank_width'], 3.5, 10000, 'wa')
+
+    assert rsc.piece_length == rsc_blank['blank_length'] / 2
+    assert rsc.piece_thickness == 2 * wa.piece_thickness
+    assert not rsc.custom_pallet and wa.custom_pallet
+    assert rsc.per_pallet == rsc.per_layer * rsc.layers
+    assert rsc.pallets == -(-10000 // rsc.per_pallet)
+    assert rsc.freight_per_box == pytest.approx(rsc.pallets * 1200.0 / rsc.pallets_per_truck / 10000)
+
+    # Gewichtsgrenze begrenzt die Lagenzahl
+    heavy = plan_load(rsc_blank['blank_length'], rsc_blank['blank_width'], 3.5, 10000, 'rsc',
+                      LoadSpec(max_pallet_weight=100))
+    assert heavy.layers < rsc.layers
+
+    with pytest.raises(ValueError):
+        plan_load(1000, 500, 3.5, 100, 'fefco')
+
+
+def test_catalog_reuses_patterns():
+    rng = np.random.default_rng(0)
+    n = 5000
+    lengths, widths = rng.integers(50, 200, n) * 10, rng.integers(20, 100, n) * 10
+    start = time.perf_counter()
+    result = plan_loads(lengths, widths, [3.5] * n, [10000] * n, 'wa')
+    assert time.perf_counter() - start < 5
+    assert len(result['per_pallet']) == n
+    assert layer_pattern.cache_info().hits > 0
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests für die vorberechneten Kostentabellen
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from carton_cost import DEFAULT_INPUTS, INPUT_LIMITS, normalize_inputs
+from carton_cost.batch import calculate_batch
+from carton_cost.lookup import LOOKUP_METRICS, CostLookup, LookupGrid
+
+GRID = LookupGrid(length=(100, 1000, 50), width=(100, 800, 50), height=(50, 600, 25))
+
+
+def test_interpolation_stays_within_error_bound(tmp_path):
+    lookup = CostLookup(tmp_path, GRID)
+    inputs = normalize_inputs(**DEFAULT_INPUTS)._replace(tape_price_per_roll=7.5, tape_pattern=False)
+
+    rng = np.random.default_rng(3)
+    L, B, H = rng.uniform(100, 1000, 2000), rng.uniform(100, 800, 2000), rng.uniform(50, 600, 2000)
+    t = rng.choice(GRID.flutes, 2000)
+    prices = {name: getattr(inputs, name) for name in inputs._fields[4:]}
+    approx = lookup.quote(L, B, H, t, prices)
+    exact = calculate_batch(L, B, H, t, **prices)
+    for name in LOOKUP_METRICS:
+        if name != 'area_savings_pct':
+            assert np.max(np.abs(approx[name] - exact[name])) <= lookup.error_bound[name] + 1e-12
+    # Quotient: die Mittelpunktprüfung ist nur ein Richtwert, keine Schranke
+    deviation = np.max(np.abs(approx['area_savings_pct'] - exact['area_savings_pct']))
+    assert deviation <= 2 * lookup.error_bound['area_savings_pct']
+    # Kosten sind linear in den Maßen: die Interpolation ist exakt
+    assert lookup.error_bound['cost_diff_per_box'] < 1e-12
+
+
+def test_price_change_rebuilds_only_cost_tables(tmp_path):
+    lookup = CostLookup(tmp_path, GRID)
+    inputs = normalize_inputs(**DEFAULT_INPUTS)
+    prices = {name: getattr(inputs, name) for name in inputs._fields[4:]}
+    assert lookup.set_prices(**prices)
+    assert not lookup.set_prices(**prices)
+    mtimes = {path.name: path.stat().st_mtime_ns for path in tmp_path.glob('*.npy')}
+
+    # Abfragen mit anderen Preisen rechnen nur im Speicher, die Tabellen bleiben unverändert
+    cheaper = lookup.lookup(inputs._replace(hotmelt_price_per_kg=1.5))
+    assert cheaper['wa_total_cost'] < lookup.lookup(inputs)['wa_total_cost']
+    assert {path.name: path.stat().st_mtime_ns for path in tmp_path.glob('*.npy')} == mtimes
+    assert lookup.prices == prices
+    assert lookup.lookup(inputs) == pytest.approx(
+        {name: float(value) for name, value in lookup.quote(400, 300, 200, 3.5).items()})
+
+    # Neu geöffnet: Raster und Preise aus dem Manifest, keine Neuberechnung nötig
+    reopened = CostLookup(tmp_path, GRID)
+    assert reopened.prices == lookup.prices
+    assert reopened.quote(400, 300, 200, 3.5) == lookup.quote(400, 300, 200, 3.5)
+
+
+def test_outside_grid_is_rejected(tmp_path):
+    lookup = CostLookup(tmp_path, GRID)
+    with pytest.raises(ValueError, match="set_prices"):
+        lookup.quote(400, 300, 200, 3.5)
+    lookup.set_prices(**{name: DEFAULT_INPUTS[name] for name in normalize_inputs(**DEFAULT_INPUTS)._fields[4:]})
+    with pytest.raises(ValueError, match="außerhalb"):
+        lookup.quote(1500, 300, 200, 3.5)
+    with pytest.raises(ValueError, match="Wellpappe"):
+        lookup.quote(400, 300, 200, 4.0)
+
+
+def test_default_grid_covers_input_limits(tmp_path):
+    lookup = CostLookup(tmp_path)
+    inputs = normalize_inputs(**DEFAULT_INPUTS)
+    prices = {name: getattr(inputs, name) for name in inputs._fields[4:]}
+    corners = np.array([(INPUT_LIMITS[name][0], INPUT_LIMITS[name][1]) for name in ('length', 'width', 'height')])
+    L, B, H = (values.ravel() for values in np.meshgrid(*corners, indexing='ij'))
+    L, B, H = np.append(L, 400), np.append(B, 300), np.append(H, 996)
+    approx = lookup.quote(L, B, H, 3.5, prices)
+    exact = calculate_batch(L, B, H, 3.5, **prices)
+    np.testing.assert_allclose(approx['cost_diff_per_box'], exact['cost_diff_per_box'], atol=1e-12)
+    np.testing.assert_allclose(approx['rsc_area_m2'], exact['rsc_area_m2'], atol=lookup.error_bound['rsc_area_m2'])
+
+
+def test_tables_with_other_shape_are_rebuilt(tmp_path):
+    CostLookup(tmp_path, GRID)
+    manifest = json.loads((tmp_path / 'manifest.json').read_text(encoding='utf-8'))
+    manifest['shape'][-1] -= 1
+    (tmp_path / 'manifest.json').write_text(json.dumps(manifest), encoding='utf-8')
+    lookup = CostLookup(tmp_path, GRID)
+    assert list(lookup._tables['rsc_area_m2'].shape) == lookup._shape()
+    assert json.loads((tmp_path / 'manifest.json').read_text(encoding='utf-8'))['shape'] == lookup._shape()
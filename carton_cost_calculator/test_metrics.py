@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests für das Metrik-Register
+"""
+
+import urllib.request
+
+from carton_cost.metrics import MetricsRegistry, start_metrics_server
+
+
+def test_counters_histograms_and_prometheus_text():
+    metrics = MetricsRegistry(buckets=(0.1, 1.0))
+    metrics.inc('exports_total', format='xlsx')
+    metrics.inc('exports_total', 2, format='xlsx')
+    metrics.observe('stage_seconds', 0.5, stage='tables')
+    records = metrics.start_collecting()
+    with metrics.timer('figures'):
+        pass
+
+    text = metrics.render_prometheus()
+    assert '# TYPE carton_exports_total counter' in text
+    assert 'carton_exports_total{format="xlsx"} 3' in text
+    assert 'carton_stage_seconds_bucket{stage="tables",le="0.1"} 0' in text
+    assert 'carton_stage_seconds_bucket{stage="tables",le="1.0"} 1' in text
+    assert 'carton_stage_seconds_bucket{stage="tables",le="+Inf"} 1' in text
+    assert 'carton_stage_seconds_count{stage="figures"} 1' in text
+    assert [stage for stage, _ in records] == ['figures']
+
+
+def test_large_and_fractional_values_render_exactly():
+    metrics = MetricsRegistry()
+    metrics.inc('requests_total', 12_345_678)
+    metrics.set('store_size', 1234567.25)
+    metrics.set('ratio', float('inf'))
+    text = metrics.render_prometheus()
+    assert 'carton_requests_total 12345678\n' in text
+    assert 'carton_store_size 1234567.25\n' in text
+    assert 'carton_ratio +Inf\n' in text
+
+
+def test_cached_counts_calls_and_misses():
+    metrics = MetricsRegistry()
+    store = {}
+
+    def memo(fn):
+        return lambda *args: store[args] if args in store else store.setdefault(args, fn(*args))
+
+    @metrics.cached('square', memo)
+    def square(x):
+        """Quadrat"""
+        return x * x
+
+    assert [square(3), square(3), square(4), square(3)] == [9, 9, 16, 9]
+    assert square.__doc__ == "Quadrat"
+    assert metrics.cache_hit_ratios() == {'square': 0.5}
+
+
+def test_metrics_server():
+    metrics = MetricsRegistry()
+    metrics.inc('reruns_total')
+    server = start_metrics_server(0, host='127.0.0.1', registry=metrics)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=10) as response:
+            assert 'carton_reruns_total 1' in response.read().decode('utf-8')
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests für die Bahnbelegung der Wellpappenanlage
+"""
+
+import numpy as np
+import pytest
+
+from carton_cost.nesting import enumerate_patterns, plan_corrugator_run
+
+
+def _produced(plan, n_skus):
+    produced = np.zeros(n_skus)
+    for pattern in plan.patterns:
+        for lane in pattern['lanes']:
+            produced[lane['sku']] += lane['blanks']
+    return produced
+
+
+def test_single_sku_ups_and_trim():
+    plan = plan_corrugator_run([1110], [560], [1000], deckle_width=2500, edge_trim=30)
+    assert len(plan.patterns) == 1
+    assert plan.patterns[0]['lanes'][0]['ups'] == 4
+    assert plan.patterns[0]['run_m'] == pytest.approx(277.5)
+    assert plan.board_m2 == pytest.approx(2.5 * 277.5)
+    assert plan.waste_pct == pytest.approx(10.4)
+
+
+def test_mixed_order_meets_demand_and_balances_area():
+    rng = np.random.default_rng(0)
+    lengths, widths = rng.integers(300, 1800, 200), rng.integers(200, 1200, 200)
+    quantities = rng.integers(500, 50000, 200)
+    for allow_rotation in (False, True):
+        plan = plan_corrugator_run(lengths, widths, quantities, allow_rotation=allow_rotation)
+        assert (_produced(plan, 200) >= quantities * (1 - 1e-9)).all()
+        assert plan.board_m2 == pytest.approx(plan.blank_m2 + plan.trim_m2 + plan.overrun_m2)
+    # Mischbelegung schlägt sortenreine Muster
+    single = plan_corrugator_run(lengths, widths, quantities, max_skus_per_pattern=1)
+    assert plan.board_m2 < single.board_m2
+
+
+def test_pattern_enumeration_is_cached():
+    enumerate_patterns.cache_clear()
+    for _ in range(2):
+        plan_corrugator_run([800, 900], [500, 700], [100, 100])
+    assert enumerate_patterns.cache_info().hits == 1
+
+
+def test_blank_wider_than_deckle_is_rejected():
+    with pytest.raises(ValueError):
+        plan_corrugator_run([800], [2600], [10])
+    with pytest.raises(ValueError):
+        plan_corrugator_run([800], [500], [10], max_skus_per_pattern=3)
+
+
+def test_skus_without_demand_are_skipped():
+    for max_skus in (1, 2):
+        plan = plan_corrugator_run([800, 900], [1235, 1000], [0, 100], max_skus_per_pattern=max_skus)
+        produced = _produced(plan, 2)
+        assert produced[0] == 0 and produced[1] >= 100
+    assert plan_corrugator_run([800], [500], [0]).patterns == []
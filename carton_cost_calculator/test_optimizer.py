@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests für die Maßoptimierung
+"""
+
+import numpy as np
+
+from carton_cost.batch import calculate_batch
+from carton_cost.optimizer import optimize_dimensions, pareto_mask
+from carton_cost.options import DEFAULT_INPUTS
+
+
+def _brute_force_mask(points):
+    return np.array([not np.any(np.all(points <= p, axis=1) & np.any(points < p, axis=1)) for p in points])
+
+
+def test_pareto_mask_matches_brute_force():
+    rng = np.random.default_rng(3)
+    for points in (rng.random((800, 3)), rng.integers(0, 4, (800, 3)).astype(float)):
+        assert (pareto_mask(points) == _brute_force_mask(points)).all()
+
+
+def test_pruned_search_matches_full_grid():
+    result = optimize_dimensions(200, 150, 100, clearance_min=(0, 0, 0), clearance_max=(30, 30, 30),
+                                 target_volume_l=4.0, step=2, style='wa')
+
+    axis = np.arange(0, 31, 2)
+    L, B, H = (g.ravel() for g in np.meshgrid(200 + axis, 150 + axis, 100 + axis, indexing='ij'))
+    feasible = L * B * H >= 4.0e6
+    L, B, H = L[feasible], B[feasible], H[feasible]
+    params = {k: v for k, v in DEFAULT_INPUTS.items() if k not in ('length', 'width', 'height')}
+    full = calculate_batch(L, B, H, **params)
+    objectives = np.column_stack([full['wa_area_m2'], full['wa_total_cost'], full['wa_seam_length_m']])
+    expected = {tuple(p) for p in objectives[_brute_force_mask(objectives)].round(9)}
+
+    found = np.column_stack([result.front['wa_area_m2'], result.front['wa_total_cost'],
+                             result.front['wa_seam_length_m']])
+    assert {tuple(p) for p in found.round(9)} == expected
+    assert result.candidates == 16 ** 3
+    assert result.evaluated < result.candidates
+    assert (result.front['volume_l'] >= 4.0).all()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests für die flächenbasierte Bogenpreisberechnung
+"""
+
+import numpy as np
+import pytest
+
+from carton_cost import calculate_rsc_blank_dimensions
+from carton_cost.pricing import PriceMatrix, read_price_matrix
+
+CSV = """grade;flute;min_m2;price_per_m2
+TT125;C;0;0,60
+TT125;C;5000;0,55
+TT125;C-Welle (3.5mm);20000;0,50
+TT125;2.5;0;0,58
+KK180;C;0;0,80
+"""
+
+
+def test_volume_breaks_and_flute_formats():
+    matrix = read_price_matrix(CSV.encode('utf-8'))
+    assert len(matrix) == 5
+    assert matrix.grades() == ['KK180', 'TT125']
+    assert matrix.flutes('TT125') == [2.5, 3.5]
+    assert matrix.price_per_m2('TT125', 3.5, 4999.9) == 0.60
+    assert matrix.price_per_m2('TT125', 3.5, 5000) == 0.55
+    assert matrix.price_per_m2('TT125', 3.5, 1e9) == 0.50
+    with pytest.raises(ValueError, match="Kein Preis"):
+        matrix.price_per_m2('KK180', 2.5, 100)
+
+
+def test_material_cost_scales_with_blank_area():
+    matrix = read_price_matrix(CSV.encode('utf-8'))
+    small = matrix.box_prices_per_1000('TT125', 200, 150, 100, 3.5, 1000)
+    large = matrix.box_prices_per_1000('TT125', 400, 300, 200, 3.5, 1000)
+    area = calculate_rsc_blank_dimensions(400, 300, 200, 3.5)['area_m2']
+    # 1000 Stück × 1,07 m² liegen unter der ersten Staffelgrenze
+    assert large['rsc_price_per_1000'] == pytest.approx(area * 0.60 * 1000)
+    assert small['rsc_price_per_1000'] < large['rsc_price_per_1000']
+    assert large['wa_price_per_1000'] < large['rsc_price_per_1000']
+
+
+def test_vectorized_lookup_matches_scalar():
+    rows = [(f"G{g}", flute, m2, 1.0 - g / 1000 - m2 / 1e6)
+            for g in range(50) for flute in ('B', 'C', 'E', 'BC') for m2 in (0, 1000, 10000, 50000)]
+    matrix = PriceMatrix(rows)
+    assert len(matrix) == 800
+
+    rng = np.random.default_rng(2)
+    grades = rng.choice([f"G{g}" for g in range(50)], 500)
+    thickness = rng.choice([2.5, 3.5, 1.5, 6.0], 500)
+    order_m2 = rng.uniform(0, 100_000, 500)
+    prices = matrix.prices_per_m2(grades, thickness, order_m2)
+    expected = [matrix.price_per_m2(g, t, m2) for g, t, m2 in zip(grades, thickness, order_m2)]
+    np.testing.assert_array_equal(prices, expected)
+    # Eine Qualität für alle Zeilen (skalar) ergibt dasselbe wie die Spalte
+    np.testing.assert_array_equal(matrix.prices_per_m2('G7', thickness, order_m2),
+                                  matrix.prices_per_m2(np.full(500, 'G7'), thickness, order_m2))
+
+
+def test_fingerprint_depends_on_content_only():
+    matrix = read_price_matrix(CSV)
+    assert read_price_matrix(CSV.encode('utf-8')).fingerprint == matrix.fingerprint
+    assert read_price_matrix(CSV.replace('0,80', '0,81')).fingerprint != matrix.fingerprint
+
+
+def test_invalid_matrix_rejected():
+    with pytest.raises(ValueError, match="Spalten fehlen"):
+        read_price_matrix(b"grade,flute,price\nTT125,C,0.6\n")
+    with pytest.raises(ValueError, match="Spalten fehlen"):
+        read_price_matrix(b"hello\n")
+    with pytest.raises(ValueError, match="Spalten fehlen"):
+        read_price_matrix(b"hello")
+    with pytest.raises(ValueError, match="bei 0 m"):
+        PriceMatrix([('TT125', 'C', 1000, 0.6)])
+    for min_m2, price in ((0, float('nan')), (0, float('inf')), (float('nan'), 0.6), (-1, 0.6), (0, -0.6)):
+        with pytest.raises(ValueError, match="Ungültige Staffel"):
+            PriceMatrix([('TT125', 'C', 0, 0.6), ('TT125', 'C', min_m2, price)])
+    with pytest.raises(ValueError, match="Ungültige Staffel"):
+        read_price_matrix(b"grade,flute,min_m2,price_per_m2\nTT125,C,0,nan\n")
+    with pytest.raises(ValueError, match="Unbekannte Welle"):
+        PriceMatrix([('TT125', 'X', 0, 0.6)])
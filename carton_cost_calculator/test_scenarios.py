@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests für den Szenario-Arbeitsbereich
+"""
+
+import numpy as np
+import pytest
+
+from carton_cost import DEFAULT_INPUTS, calculate_quote
+from carton_cost.scenarios import ScenarioWorkspace, affected_nodes
+
+
+def test_results_match_calculate_quote_after_updates():
+    rng = np.random.default_rng(5)
+    workspace = ScenarioWorkspace()
+    for i in range(20):
+        workspace.add(f"S{i}", {**DEFAULT_INPUTS, 'length': float(rng.integers(50, 2000))})
+    for name in workspace.names():
+        workspace.update(name, height=float(rng.integers(20, 1000)), hotmelt_price_per_kg=4.5)
+        workspace.update(name, tape_pattern=False)
+        expected = calculate_quote(*workspace.inputs(name))
+        assert workspace.result(name) == expected
+
+
+def test_only_dependent_nodes_are_recomputed():
+    assert affected_nodes(['hotmelt_price_per_kg']) == ['hotmelt', 'totals']
+    assert affected_nodes(['material_thickness']) == ['blanks', 'area_savings']
+    assert affected_nodes(['rsc_price_per_1000']) == ['material', 'totals']
+
+    workspace = ScenarioWorkspace()
+    workspace.add('a', DEFAULT_INPUTS)
+    workspace.add('b', {**DEFAULT_INPUTS, 'hotmelt_price_per_kg': 5.0})
+    before = workspace.node_evaluations
+    assert workspace.update('a', length=400) == []
+    # Nur Szenario a ändert sich tatsächlich
+    assert workspace.update_all(hotmelt_price_per_kg=5.0) == {'a': ['hotmelt', 'totals']}
+    assert workspace.node_evaluations - before == 2
+
+
+def test_unknown_parameter_rejected():
+    workspace = ScenarioWorkspace()
+    workspace.add('a', DEFAULT_INPUTS)
+    with pytest.raises(ValueError):
+        workspace.update('a', colour='braun')
+
+
+def test_values_outside_input_limits_rejected():
+    workspace = ScenarioWorkspace()
+    workspace.add('a', DEFAULT_INPUTS)
+    for changes in ({'tape_length_per_roll': 0}, {'length': 5000}, {'hotmelt_price_per_kg': float('nan')}):
+        with pytest.raises(ValueError, match="zwischen"):
+            workspace.update_all(**changes)
+    assert workspace.result('a') == calculate_quote(**DEFAULT_INPUTS)
+    workspace.update('a', tape_length_per_roll=10)
+    assert workspace.inputs('a').tape_length_per_roll == 10.0
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests für die Sensitivitätsanalyse
+"""
+
+import numpy as np
+import pytest
+
+from carton_cost import DEFAULT_INPUTS, normalize_inputs
+from carton_cost.batch import calculate_batch
+from carton_cost.sensitivity import full_factorial, heatmap, tornado
+
+INPUTS = normalize_inputs(**DEFAULT_INPUTS)
+
+
+@pytest.mark.parametrize('metric', ['cost_diff_per_box', 'area_savings_pct'])
+def test_full_factorial_matches_batch(metric):
+    result = full_factorial(INPUTS, metric=metric, points=3)
+    assert result.values.size == 3 ** 8 * 4 * 3 * 2
+
+    rng = np.random.default_rng(4)
+    for _ in range(50):
+        index = tuple(rng.integers(0, len(levels)) for levels in result.levels.values())
+        params = {name: levels[i] for (name, levels), i in zip(result.levels.items(), index)}
+        assert result.values[index] == calculate_batch(**params)[metric]
+
+    for name, effects in result.main_effects.items():
+        assert effects.shape == result.levels[name].shape
+
+
+def test_tornado_sorted_by_span():
+    bars = tornado(INPUTS)
+    spans = [bar['high'] - bar['low'] for bar in bars]
+    assert spans == sorted(spans, reverse=True)
+    # Materialstärke wirkt nur auf die Fläche, nicht auf die Kosten pro Box
+    thickness = next(bar for bar in bars if bar['parameter'] == 'material_thickness')
+    assert thickness['low'] == thickness['high'] == thickness['base']
+
+
+def test_heatmap_shape():
+    x, y, values = heatmap(INPUTS, 'length', 'height', points=11)
+    assert values.shape == (len(y), len(x))
+    with pytest.raises(ValueError):
+        heatmap(INPUTS, 'length', 'length')
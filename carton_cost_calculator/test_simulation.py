@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests für die Monte-Carlo-Preissimulation
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from carton_cost import DEFAULT_INPUTS, calculate_quote, normalize_inputs
+from carton_cost.simulation import simulate_cost_diff
+
+INPUTS = normalize_inputs(**DEFAULT_INPUTS)
+
+
+def test_without_volatility_matches_quote():
+    zero = dict.fromkeys(('rsc_price_per_1000', 'wa_price_per_1000', 'tape_price_per_roll', 'hotmelt_price_per_kg'), 0.0)
+    result = simulate_cost_diff(INPUTS, draws=1000, volatility=zero, seed=1)
+    expected = calculate_quote(*INPUTS)['cost_diff_per_box']
+    np.testing.assert_allclose(result.cost_diff_per_box, expected)
+    assert result.wa_cheaper_prob == 1.0
+    np.testing.assert_allclose(result.break_even_wa_price, INPUTS.wa_price_per_1000 + expected * 1000)
+
+
+def test_million_draws_are_fast_and_centered():
+    start = time.perf_counter()
+    result = simulate_cost_diff(INPUTS, draws=1_000_000, volatility={'wa_price_per_1000': 0.3}, seed=2)
+    assert time.perf_counter() - start < 1.0
+    assert result.mean == pytest.approx(calculate_quote(*INPUTS)['cost_diff_per_box'], abs=1e-3)
+    assert 0.5 < result.wa_cheaper_prob < 1.0
+    assert result.percentiles[5] < result.percentiles[50] < result.percentiles[95]
+
+
+def test_rejects_unknown_price():
+    with pytest.raises(ValueError):
+        simulate_cost_diff(INPUTS, draws=10, volatility={'length': 0.1})
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests für die Startzeit: keine schweren Module beim Import von app.py
+"""
+
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+APP = Path(__file__).with_name('app.py')
+# Werden erst in den Tabs bzw. beim Export geladen
+LAZY_MODULES = ('plotly.express', 'xlsxwriter', 'openpyxl')
+# Import aller Module der obersten Ebene von app.py (Sekunden, großzügig für CI)
+IMPORT_BUDGET_S = 5.0
+
+
+def module_level_imports():
+    names = []
+    for node in ast.parse(APP.read_text(encoding='utf-8')).body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            names.append(node.module)
+    return names
+
+
+def test_no_heavy_imports_at_module_level():
+    names = module_level_imports()
+    assert not [name for name in names if name.split('.')[0] in ('plotly', 'xlsxwriter', 'openpyxl')]
+
+
+def test_default_view_imports_no_plotly_at_script_level():
+    # Diagramme der Startansicht entstehen in gecachten Funktionen, nicht im Skript selbst
+    default_view = next(node for node in ast.parse(APP.read_text(encoding='utf-8')).body
+                        if isinstance(node, ast.If) and ast.unparse(node.test) == 'view == VIEWS[0]')
+    names = [alias.name for node in ast.walk(default_view) if isinstance(node, ast.Import) for alias in node.names]
+    names += [node.module for node in ast.walk(default_view) if isinstance(node, ast.ImportFrom)]
+    assert not [name for name in names if name.split('.')[0] == 'plotly']
+
+
+def test_import_time_budget():
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        + "".join(f"import {name}\n" for name in module_level_imports())
+        + "print(time.perf_counter() - start)\n"
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], cwd=APP.parent,
+                            capture_output=True, text=True, check=True)
+    elapsed, loaded = result.stdout.splitlines()
+    assert not loaded, f"beim Start geladen: {loaded}"
+    assert float(elapsed) < IMPORT_BUDGET_S
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests für den persistenten Angebotsspeicher
+"""
+
+from carton_cost import DEFAULT_INPUTS, calculate_quote, normalize_inputs
+from carton_cost import store as store_module
+from carton_cost.store import QuoteStore, input_key
+
+
+def test_key_is_canonical():
+    assert input_key({**DEFAULT_INPUTS, 'length': 400}) == input_key({**DEFAULT_INPUTS, 'length': 400.0})
+    assert input_key(DEFAULT_INPUTS) == input_key(normalize_inputs(**DEFAULT_INPUTS))
+    assert input_key({**DEFAULT_INPUTS, 'length': 401}) != input_key({**DEFAULT_INPUTS, 'length': 400})
+
+
+def test_results_survive_reopening(tmp_path):
+    path = tmp_path / 'quotes.sqlite3'
+    store = QuoteStore(path)
+    calls = []
+
+    def compute(*inputs):
+        calls.append(inputs)
+        return calculate_quote(*inputs)
+
+    first = store.get_or_compute(DEFAULT_INPUTS, compute)
+    assert store.get_or_compute(DEFAULT_INPUTS, compute) == first
+    store.close()
+
+    reopened = QuoteStore(path)
+    assert len(reopened) == 1
+    assert reopened.get_or_compute(DEFAULT_INPUTS, compute) == first == calculate_quote(**DEFAULT_INPUTS)
+    assert len(calls) == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    store = QuoteStore(tmp_path / 'quotes.sqlite3', max_entries=10)
+    for length in range(100, 112):
+        store.get_or_compute({**DEFAULT_INPUTS, 'length': length})
+    assert len(store) == 10
+    assert store.get({**DEFAULT_INPUTS, 'length': 100}) is None
+    assert store.get({**DEFAULT_INPUTS, 'length': 102}) is not None
+
+    # 102 wurde eben abgerufen und bleibt, 103 ist nun der älteste Eintrag
+    store.get_or_compute({**DEFAULT_INPUTS, 'length': 200})
+    assert store.get({**DEFAULT_INPUTS, 'length': 102}) is not None
+    assert store.get({**DEFAULT_INPUTS, 'length': 103}) is None
+
+
+def test_search_by_dimensions_flute_and_date(tmp_path):
+    store = QuoteStore(tmp_path / 'quotes.sqlite3')
+    for length in (300, 400, 500):
+        for thickness in (3.0, 4.0):
+            store.get_or_compute({**DEFAULT_INPUTS, 'length': length, 'material_thickness': thickness})
+
+    found = store.search(length=(350, 450), material_thickness=3.0)
+    assert [(entry['length'], entry['material_thickness']) for entry in found] == [(400.0, 3.0)]
+    assert found[0]['result'] == calculate_quote(**{**DEFAULT_INPUTS, 'length': 400, 'material_thickness': 3.0})
+    assert len(store.search(length=(0, 10_000))) == 6
+    assert store.search(since=found[0]['created_at'] + 3600) == []
+
+    plan = store._db.execute('EXPLAIN QUERY PLAN SELECT key FROM quotes WHERE length BETWEEN 1 AND 2').fetchall()
+    assert 'idx_quotes_dims' in str(plan)
+
+
+def test_size_and_eviction_shared_between_instances(tmp_path):
+    path = tmp_path / 'quotes.sqlite3'
+    app_store, api_store = QuoteStore(path, max_entries=5), QuoteStore(path, max_entries=5)
+    for length in range(100, 104):
+        app_store.get_or_compute({**DEFAULT_INPUTS, 'length': length})
+    for length in range(200, 204):
+        api_store.get_or_compute({**DEFAULT_INPUTS, 'length': length})
+    assert len(app_store) == len(api_store) == 5
+
+
+def test_other_formula_version_is_discarded(tmp_path, monkeypatch):
+    path = tmp_path / 'quotes.sqlite3'
+    store = QuoteStore(path)
+    store.get_or_compute(DEFAULT_INPUTS)
+    store.close()
+
+    assert len(QuoteStore(path)) == 1
+    monkeypatch.setattr(store_module, 'STORE_VERSION', store_module.STORE_VERSION + '-neu')
+    assert len(QuoteStore(path)) == 0
+    assert QuoteStore(path).get(DEFAULT_INPUTS) is None
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests für das FEFCO-Bauartenregister
+"""
+
+import numpy as np
+import pytest
+
+from carton_cost import DEFAULT_INPUTS, calculate_quote, normalize_inputs
+from carton_cost.styles import STYLES, blank_dimensions, compare_styles, rank_styles, register_style
+
+
+def test_registry_reproduces_rsc_and_wraparound():
+    quote = calculate_quote(**DEFAULT_INPUTS)
+    # 400×300×200 mm, C-Welle: 2·400 + 2·300 + 4·3.5 + 25 + 20 bzw. 300 + 2·200 + 4·3.5 + 20
+    assert quote['rsc_blank']['blank_length'] == 1459.0
+    assert quote['rsc_blank']['blank_width'] == 734.0
+    # formulas.py rechnet ohne das Register; beide müssen übereinstimmen
+    assert quote['rsc_blank'] == blank_dimensions('0201', 400.0, 300.0, 200.0, 3.5)
+    assert quote['wa_blank'] == blank_dimensions('0409', 400.0, 300.0, 200.0, 3.5)
+    assert {'0200', '0201', '0203', '0409', '0427', '0711'} <= set(STYLES)
+
+
+def test_comparison_is_vectorized_over_styles_and_inputs():
+    lengths = np.array([200.0, 400.0, 800.0])
+    result = compare_styles(lengths, 300.0, 200.0, 3.5, 0.5, 0.05, 3.0, 2.0)
+    assert result['total_cost'].shape == (len(STYLES), 3)
+
+    for i, length in enumerate(lengths):
+        single = compare_styles(float(length), 300.0, 200.0, 3.5, 0.5, 0.05, 3.0, 2.0)
+        np.testing.assert_allclose(result['total_cost'][:, i], single['total_cost'])
+
+    rsc = result['codes'].index('0201')
+    np.testing.assert_allclose(result['area_m2'][rsc], blank_dimensions('0201', lengths, 300.0, 200.0, 3.5)['area_m2'])
+
+
+def test_ranking_matches_quote_for_rsc_and_wraparound():
+    inputs = normalize_inputs(**{**DEFAULT_INPUTS, 'wa_price_per_1000': 900.0})
+    ranking = rank_styles(inputs)
+    costs = [row['total_cost'] for row in ranking]
+    assert costs == sorted(costs)
+
+    # Jede Bauart auf ihrer eigenen Preisbasis: RSC und Wrap-Around kosten wie im Angebot
+    quote = calculate_quote(*inputs)
+    by_code = {row['code']: row for row in ranking}
+    assert by_code['0201']['total_cost'] == pytest.approx(quote['rsc_total_cost_tape'])
+    assert by_code['0409']['total_cost'] == pytest.approx(quote['wa_total_cost'])
+    assert by_code['0409']['material_cost'] == pytest.approx(0.9)
+
+    # Einheitlicher Bogenpreis gilt für alle Bauarten
+    uniform = {row['code']: row for row in rank_styles(inputs, board_price_per_m2=0.5)}
+    assert uniform['0409']['material_cost'] == pytest.approx(uniform['0409']['area_m2'] * 0.5)
+
+
+def test_custom_style_and_formula_validation():
+    try:
+        register_style('9999', "Testbauart", "L + B", "H + trim_allowance", tape_length="L")
+        assert blank_dimensions('9999', 100, 50, 30, 3)['blank_width'] == 50
+        assert '9999' in [row['code'] for row in rank_styles(normalize_inputs(**DEFAULT_INPUTS))]
+    finally:
+        STYLES.pop('9999', None)
+
+    with pytest.raises(ValueError, match="unbekannte Namen"):
+        register_style('9998', "Ungültig", "L + __import__('os')", "B")
+    with pytest.raises(ValueError, match="ungültige Formel"):
+        register_style('9998', "Ungültig", "L +", "B")
+    with pytest.raises(ValueError, match="Preisbasis"):
+        register_style('9998', "Ungültig", "L", "B", price_basis='m2')
+    assert '9998' not in STYLES